@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+
+from pyabm.common.conf import Conf
+from pyabm.common.constants import *
+from pyabm.common.logger_configuration import LoggerManager
+from pyabm.common.workspace import Workspace
+
+
+def parse_parameter(parameter):
+    """Parses a parameter override given as name=value, where the value is read as JSON if possible and as a string
+    otherwise.
+
+    :param parameter: string, holding the override.
+    :return: tuple, holding the name and the value of the parameter.
+    """
+    name, _, value = parameter.partition("=")
+    try:
+        return name, json.loads(value)
+    except ValueError:
+        return name, value
+
+
+def get_parser():
+    """Returns the parser of the command line.
+
+    :return: argparse.ArgumentParser instance.
+    """
+    parser = argparse.ArgumentParser(prog="pyabm", description="Agent based model of the Best Experienced Payoff "
+                                                               "protocol in population games.")
+    parser.add_argument("-c", "--conf", default=os.path.join(RESOURCES, CONF, PYABM_JSON),
+                        help="path of the configuration file")
+    parser.add_argument("-s", "--set", action="append", default=[], type=parse_parameter, metavar="NAME=VALUE",
+                        help="overrides a parameter of the configuration, the network attributes included")
+    commands = parser.add_subparsers(dest="command", required=True)
+    play = commands.add_parser("play", help="runs one simulation")
+    play.add_argument("--resume", action="store_true", help="continues the simulation from its checkpoint")
+    batch = commands.add_parser("batch", help="runs number_of_simulations simulations")
+    batch.add_argument("--resume", action="store_true", help="continues the batch from its checkpoint")
+    batch.add_argument("--no-plot", action="store_true", help="does not show the mean distribution evolution")
+    commands.add_parser("sweep", help="runs the simulations of every point of the parameter_sweep")
+    solve = commands.add_parser("solve", help="solves exactly the population game as a Markov chain, for small "
+                                              "populations without network")
+    solve.add_argument("--no-plot", action="store_true", help="does not show the expected distribution evolution")
+    commands.add_parser("clear-cache", help="invalidates the result cache")
+    benchmark = commands.add_parser("benchmark", help="times the engines and flags regressions against the baseline")
+    benchmark.add_argument("--suite", choices=[QUICK, FULL], default=QUICK,
+                           help="quick moves one axis at a time away from the base case, full takes every combination")
+    benchmark.add_argument("--ticks", type=int, default=20, help="number of ticks of each simulation")
+    benchmark.add_argument("--repeat", type=int, default=3, help="number of runs of each case, keeping the best")
+    benchmark.add_argument("--baseline", help="path of the baseline file")
+    benchmark.add_argument("--save-baseline", action="store_true", help="stores the results as the new baseline")
+    benchmark.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown")
+    return parser
+
+
+def main(args=None):
+    """Entry point of the command line. The simulation modules are only imported once the command is known, so the
+    heavy dependencies are loaded just when the command needs them.
+
+    :param args: list, holding the command line arguments, or None to read them from sys.argv.
+    """
+    arguments = get_parser().parse_args(args)
+    workspace = Workspace(Conf(arguments.conf).with_parameters(dict(arguments.set)))
+    LoggerManager()
+
+    if arguments.command == "play":
+        from pyabm.process.run_population_game import play_single_population_game
+        play_single_population_game(arguments.resume)
+    elif arguments.command == "batch":
+        from pyabm.process.run_n_population_games import play_n_population_game
+        play_n_population_game(arguments.resume, not arguments.no_plot)
+    elif arguments.command == "sweep":
+        from pyabm.process.run_parameter_sweep import play_parameter_sweep
+        for point, mean_distribution in play_parameter_sweep().items():
+            print("The final average distribution for {} is: {}".format(dict(point), mean_distribution[-1]))
+    elif arguments.command == "solve":
+        from pyabm.process.run_markov_chain import solve_markov_chain
+        solve_markov_chain(not arguments.no_plot)
+    elif arguments.command == "benchmark":
+        from pyabm.process.run_benchmarks import run_benchmarks
+        regressions = run_benchmarks(arguments.suite, arguments.ticks, arguments.repeat, arguments.baseline,
+                                     arguments.save_baseline, arguments.tolerance)
+        sys.exit(1 if regressions else 0)
+    elif arguments.command == "clear-cache":
+        from pyabm.common.utils.cache import ResultCache
+        ResultCache(os.path.join(workspace.root, OUTPUTS), workspace.conf.get_result_cache_size()).clear()
@@ -1,22 +1,25 @@
-import random
 import numpy as np
 
+from pyabm.common.constants import OPPONENT_SAMPLING, PAYOFF_EVALUATION, TIE_BREAKING, OPPONENT_DRAWS
+
 
 class Agent(object):
     """Class which implements the individual actors in the game."""
 
-    def __init__(self, player_id, num_of_channels, strategy=None):
+    def __init__(self, player_id, num_of_channels, strategy=None, rng=None):
         """Agent initialization.
 
         :param player_id: integer, between zero and the number of players minus one, which holds the id.
         :param num_of_channels: integer, holding the number of available strategies.
         :param strategy: integer, representing the initial strategy followed by the agent.
+        :param rng: numpy random Generator, shared by the whole simulation.
         """
         self.player_id = player_id
         self.num_of_channels = num_of_channels
         self.avg_payoff = 0
+        self.rng = rng if rng is not None else np.random.default_rng()
         if strategy is None:
-            self.strategy = random.randint(0, num_of_channels - 1)
+            self.strategy = int(self.rng.integers(num_of_channels))
         else:
             self.strategy = strategy
 
@@ -32,41 +35,68 @@ class Agent(object):
         return player
 
     @staticmethod
-    def __get_test_strategies_for_bep(num_of_channels):
-        """Returns the set of strategies that will be tested by the agent who is reviewing.
+    def __get_test_strategies_for_bep(game):
+        """Returns the set of strategies that will be tested by the agent who is reviewing, in the order in which they
+        are tested.
 
-        :param num_of_channels: integer, holding the number of available strategies.
+        :param game: an instance of the current game.
         :return: list with the set of strategy's index to be tested.
         """
-        strategies = list(range(num_of_channels))
+        strategies = game.bep_candidates.tolist()
         return strategies
 
     def update_strategy_under_bep_protocol(self, game):
         """Under the best experienced payoff protocol, a revising agent tests each of the strategies against a  new
         randomly drawn opponent. The revising agent then selects the strategy that obtained the greatest payoff. In
-        case of ties, they are resolved randomly.
+        case of ties, they are resolved randomly. The candidates whose payoff bound is below the best payoff found so
+        far are not tested, nor is a candidate tested again once it reaches its bound. The phases are timed if the game
+        is instrumented.
 
         :param game: an instance of the current game.
         """
+        instrumentation = game.instrumentation
         games = []
-        n_of_candidates = self.__get_test_strategies_for_bep(game.num_of_channels)
-        for strategy in n_of_candidates:
+        best_payoff = -np.inf
+        n_of_draws = 0
+        n_of_candidates = self.__get_test_strategies_for_bep(game)
+        for strategy, payoff_bound in zip(n_of_candidates, game.payoff_bounds.tolist()):
+            if payoff_bound < best_payoff:
+                break
             trials = []
             self.strategy = strategy
             for trial in range(game.number_of_trials):
-                player_2 = game.agents.get_opponent(self.player_id)
-                trials.append(game.play_agent_game(self.set_strategy(strategy),
-                                                   player_2.set_strategy(player_2.strategy)))
+                if instrumentation is None:
+                    player_2 = game.agents.get_opponent(self.player_id)
+                    trials.append(game.play_agent_game(self.set_strategy(strategy),
+                                                       player_2.set_strategy(player_2.strategy)))
+                else:
+                    start_time = instrumentation.start()
+                    player_2 = game.agents.get_opponent(self.player_id)
+                    instrumentation.stop(OPPONENT_SAMPLING, start_time)
+                    start_time = instrumentation.start()
+                    trials.append(game.play_agent_game(self.set_strategy(strategy),
+                                                       player_2.set_strategy(player_2.strategy)))
+                    instrumentation.stop(PAYOFF_EVALUATION, start_time)
+                if trials[-1] >= payoff_bound:
+                    break
+            n_of_draws += len(trials)
             games.append(max(trials))
+            best_payoff = max(best_payoff, games[-1])
+        if instrumentation is not None:
+            instrumentation.count(OPPONENT_DRAWS, n_of_draws)
+            start_time = instrumentation.start()
         games = np.array(games)
-        self.strategy = n_of_candidates[random.choice(np.where(games == np.max(games))[0])]
+        best_candidates = np.flatnonzero(games == best_payoff)
+        self.strategy = n_of_candidates[best_candidates[self.rng.integers(len(best_candidates))]]
+        if instrumentation is not None:
+            instrumentation.stop(TIE_BREAKING, start_time)
 
     def update_strategy(self, game):
         """Updates the strategy following the BEP protocol.
 
         :param game: an instance of the current game.
         """
-        if random.random() > game.noise:
+        if self.rng.random() > game.noise:
             self.update_strategy_under_bep_protocol(game)
         else:
-            self.strategy = random.randint(0, game.num_of_channels - 1)
+            self.strategy = int(self.rng.integers(game.num_of_channels))
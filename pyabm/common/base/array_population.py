@@ -0,0 +1,184 @@
+import numpy as np
+
+from pyabm.common.base.network import get_fixed_population_network, get_population_network
+from pyabm.common.base.revision import revise_strategies
+from pyabm.common.constants import *
+from pyabm.common.utils.validation import check_initial_condition
+from pyabm.common.workspace import Workspace
+
+
+class ArrayAgentPopulation(object):
+    """Class which implements the population of players keeping their state in contiguous numpy arrays instead of one
+    Agent instance per player. The agent placed at the index i of the arrays has the id i.
+    """
+
+    def __init__(self, rng=None, conf=None):
+        """ArrayAgentPopulation initialization.
+
+        :param rng: numpy random Generator, shared by the whole simulation.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
+        """
+        conf = conf if conf is not None else Workspace().conf
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.initial_distribution_of_strategies = conf.get_initial_distribution_of_strategies()
+        self.use_population_network = conf.get_use_population_network()
+        self.player_ids = np.arange(self.n_of_agents, dtype=np.int64)
+        self.strategies = self.__populate_group()
+        self.strategy_counts = np.bincount(self.strategies, minlength=self.num_of_channels)
+        self.avg_payoffs = np.zeros(self.n_of_agents)
+        if self.use_population_network:
+            self.probability_of_edge = conf.get_probability_of_edge()
+            self.network_algorithm = conf.get_random_network_algorithm()
+            self.nearest_neighbors = conf.get_nearest_neighbors()
+            self.probability_of_rewiring = conf.get_probability_of_rewiring()
+            self.network_generator = conf.get_network_generator()
+            if conf.get_fixed_network():
+                self.population_network = get_fixed_population_network(conf)
+            else:
+                self.population_network = get_population_network(self.n_of_agents, self.network_algorithm,
+                                                                 self.nearest_neighbors, self.probability_of_rewiring,
+                                                                 self.probability_of_edge, self.rng,
+                                                                 self.network_generator)
+
+    def __get_strategy_dtype(self):
+        """Returns the smallest integer type able to hold the index of every strategy.
+
+        :return: numpy integer type.
+        """
+        return np.int8 if self.num_of_channels <= np.iinfo(np.int8).max + 1 else np.int16
+
+    def __populate_group(self):
+        """It settles the strategies of the crowd of agents following the initial condition in case it were required
+        or randomly otherwise. It ensures that the strategies are randomly spread.
+
+        :return: numpy array, holding the strategy followed by each agent.
+        """
+        if not self.initial_distribution_of_strategies:
+            strategies = self.rng.integers(0, self.num_of_channels, size=self.n_of_agents)
+        else:
+            check_initial_condition(self.initial_distribution_of_strategies, self.n_of_agents, self.num_of_channels)
+            strategies = np.repeat(np.arange(self.num_of_channels), self.initial_distribution_of_strategies)
+            self.rng.shuffle(strategies)
+        return strategies.astype(self.__get_strategy_dtype())
+
+    def get_opponent(self, player_id):
+        """Returns a random opponent avoiding the play of an agent with himself.
+
+        :param player_id: integer, holding the id of the player who is looking for an opponent.
+        :return: integer, holding the id of the opponent.
+        """
+        if self.use_population_network:
+            return self.population_network.get_neighbor(player_id, self.rng)
+        else:
+            player_2 = self.rng.integers(self.n_of_agents - 1)
+            return player_2 + 1 if player_2 >= player_id else player_2
+
+    def get_opponents(self, player_ids, number_of_opponents):
+        """Returns a block of random opponents for each of the given players, avoiding the play of an agent with
+        himself.
+
+        :param player_ids: numpy array, holding the ids of the players who are looking for opponents.
+        :param number_of_opponents: integer, holding the number of opponents drawn for each player.
+        :return: numpy array of shape (players, number of opponents), holding the ids of the opponents.
+        """
+        if self.use_population_network:
+            return self.population_network.get_neighbors(player_ids, number_of_opponents, self.rng)
+        else:
+            opponents = self.rng.integers(0, self.n_of_agents - 1, size=(len(player_ids), number_of_opponents))
+            opponents += opponents >= player_ids[:, np.newaxis]
+            return opponents
+
+    def __get_bep_strategy(self, player_id, game):
+        """Under the best experienced payoff protocol, the revising agent tests each of the strategies against a new
+        randomly drawn opponent and keeps the best payoff of the trials. It returns the strategy that obtained the
+        greatest payoff, resolving ties randomly. The candidates whose payoff bound is below the best payoff found so
+        far are not tested, nor is a candidate tested again once it reaches its bound.
+
+        :param player_id: integer, holding the id of the revising agent.
+        :param game: an instance of the current game.
+        :return: integer, holding the selected strategy.
+        """
+        payoffs = []
+        best_payoff = -np.inf
+        n_of_draws = 0
+        for strategy, payoff_bound in zip(game.bep_candidates.tolist(), game.payoff_bounds.tolist()):
+            if payoff_bound < best_payoff:
+                break
+            payoff = -np.inf
+            for trial in range(game.number_of_trials):
+                payoff = max(payoff, game.payoff_matrix[strategy, self.strategies[self.get_opponent(player_id)]])
+                n_of_draws += 1
+                if payoff >= payoff_bound:
+                    break
+            payoffs.append(payoff)
+            best_payoff = max(best_payoff, payoff)
+        if game.instrumentation is not None:
+            game.instrumentation.count(OPPONENT_DRAWS, n_of_draws)
+        best_strategies = np.flatnonzero(np.array(payoffs) == best_payoff)
+        return game.bep_candidates[best_strategies[self.rng.integers(len(best_strategies))]]
+
+    def update_strategy(self, index, game):
+        """Lets the agent placed at the given index of the population review her strategy following the BEP protocol.
+
+        :param index: integer, holding the index of the revising agent within the population.
+        :param game: an instance of the current game.
+        """
+        self.strategy_counts[self.strategies[index]] -= 1
+        if self.rng.random() > game.noise:
+            self.strategies[index] = self.__get_bep_strategy(index, game)
+        else:
+            self.strategies[index] = self.rng.integers(self.num_of_channels)
+        self.strategy_counts[self.strategies[index]] += 1
+
+    def update_strategies(self, indexes, game):
+        """Lets a block of agents review their strategies in one pass using the batched BEP revision kernel. All of
+        them observe the strategies as they were at the beginning of the block.
+
+        :param indexes: numpy array, holding the indexes of the revising agents within the population.
+        :param game: an instance of the current game.
+        """
+        if game.instrumentation is None:
+            opponents = self.get_opponents(indexes, self.num_of_channels * game.number_of_trials)
+        else:
+            start_time = game.instrumentation.start()
+            opponents = self.get_opponents(indexes, self.num_of_channels * game.number_of_trials)
+            game.instrumentation.stop(OPPONENT_SAMPLING, start_time)
+            game.instrumentation.count(OPPONENT_DRAWS, opponents.size)
+        opponents = opponents.reshape(len(indexes), self.num_of_channels, game.number_of_trials)
+        revise_strategies(self.strategies, indexes, opponents, game.payoff_matrix, game.noise, self.rng,
+                          self.strategy_counts)
+
+    def run_compiled_ticks(self, number_of_ticks, game):
+        """Lets the whole population review their strategies along the given number of ticks within the compiled
+        simulation loop.
+
+        :param number_of_ticks: integer, holding the number of ticks to run.
+        :param game: an instance of the current game.
+        """
+        if self.use_population_network:
+            indptr, indices = self.population_network.indptr, self.population_network.indices
+        else:
+            indptr, indices = np.zeros(1, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        from pyabm.common.base.compiled import run_compiled_ticks
+
+        run_compiled_ticks(self.rng, self.strategies, self.strategy_counts, game.payoff_matrix, game.bep_candidates,
+                           game.payoff_bounds, indptr, indices, self.use_population_network, number_of_ticks,
+                           game.number_of_trials, game.noise, game.update_strategies_mode == ALL_IN_ONE_TICK)
+
+    def get_strategies(self):
+        """Returns the strategy of every agent, ordered by its index within the population, which is its node of the
+        network. It is the array of the population itself, so it must not be modified.
+
+        :return: numpy array, holding the strategy of every agent.
+        """
+        return self.strategies
+
+    def get_strategy_distribution(self):
+        """Returns the histogram of strategies which are being used by the players of the population. It is kept up to
+        date along the revisions, so it does not depend on the number of agents.
+
+        :return: numpy array, holding the distribution of strategies.
+        """
+        return self.strategy_counts.copy()
@@ -0,0 +1,98 @@
+import logging
+import numpy as np
+
+from pyabm.common.constants import *
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning(COMPILED_LOOP_INTERPRETED)
+
+    def njit(*args, **kwargs):
+        """Pure Python fallback of the numba decorator used when numba is not installed: it returns the very same
+        function, which will be interpreted.
+        """
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def run_compiled_ticks(rng, strategies, strategy_counts, payoff_matrix, candidates, payoff_bounds, indptr, indices,
+                       use_population_network, number_of_ticks, number_of_trials, noise, all_in_one_tick):
+    """Compiled loop which lets the agents update their strategies along the given number of ticks under the best
+    experienced payoff protocol. It keeps exactly the semantics of AgentGame.let_players_update_strategies: within a
+    tick, either every agent revises once in random order or number of agents revisers are drawn with replacement;
+    each reviser takes a random strategy with probability noise or otherwise tests every strategy number_of_trials
+    times against newly drawn opponents and selects the best one, resolving ties randomly. The candidates whose payoff
+    bound is below the best payoff found so far are not tested, nor is a candidate tested again once it reaches its
+    bound. Every draw comes from the given generator, whose state is shared with the interpreter.
+
+    :param rng: numpy Generator, holding the random stream of the simulation.
+    :param strategies: numpy array, holding the strategy of every agent. It is updated in place.
+    :param strategy_counts: numpy array, holding the number of agents following each strategy. It is updated in place.
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param candidates: numpy array, holding the strategies in the order in which they are tested.
+    :param payoff_bounds: numpy array, holding the greatest payoff that each candidate can get.
+    :param indptr: numpy array, holding the CSR index pointer of the population network.
+    :param indices: numpy array, holding the CSR neighbors of the population network.
+    :param use_population_network: bool, true if the opponents are drawn among the neighbors.
+    :param number_of_ticks: integer, holding the number of ticks to run.
+    :param number_of_trials: integer, holding the number of times that each strategy is tested.
+    :param noise: float, holding the probability of choosing a strategy at random.
+    :param all_in_one_tick: bool, true if every agent revises once per tick and false if the revisers are drawn at
+        random.
+    """
+    n_of_agents = strategies.shape[0]
+    num_of_channels = payoff_matrix.shape[0]
+    payoffs = np.empty(num_of_channels)
+    best_strategies = np.empty(num_of_channels, dtype=np.int64)
+    order = np.arange(n_of_agents)
+    for tick in range(number_of_ticks):
+        if all_in_one_tick:
+            rng.shuffle(order)
+        for k in range(n_of_agents):
+            if all_in_one_tick:
+                player_id = order[k]
+            else:
+                player_id = rng.integers(0, n_of_agents)
+            strategy_counts[strategies[player_id]] -= 1
+            if rng.random() > noise:
+                max_payoff = -np.inf
+                n_of_tested = 0
+                for candidate in range(num_of_channels):
+                    if payoff_bounds[candidate] < max_payoff:
+                        break
+                    strategy = candidates[candidate]
+                    best_payoff = -np.inf
+                    for trial in range(number_of_trials):
+                        if use_population_network:
+                            start = indptr[player_id]
+                            opponent = indices[start + rng.integers(0, indptr[player_id + 1] - start)]
+                        else:
+                            opponent = rng.integers(0, n_of_agents - 1)
+                            if opponent >= player_id:
+                                opponent += 1
+                        payoff = payoff_matrix[strategy, strategies[opponent]]
+                        if payoff > best_payoff:
+                            best_payoff = payoff
+                            if best_payoff >= payoff_bounds[candidate]:
+                                break
+                    payoffs[candidate] = best_payoff
+                    n_of_tested += 1
+                    if best_payoff > max_payoff:
+                        max_payoff = best_payoff
+                n_of_best = 0
+                for candidate in range(n_of_tested):
+                    if payoffs[candidate] == max_payoff:
+                        best_strategies[n_of_best] = candidates[candidate]
+                        n_of_best += 1
+                strategies[player_id] = best_strategies[rng.integers(0, n_of_best)]
+            else:
+                strategies[player_id] = rng.integers(0, num_of_channels)
+            strategy_counts[strategies[player_id]] += 1
+
@@ -0,0 +1,119 @@
+import numpy as np
+
+from pyabm.common.base.ensemble_population import EnsembleAgentPopulation
+from pyabm.common.base.game import get_absorbing_strategies, get_payoff_matrix
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.instrumentation import Instrumentation
+
+
+class EnsembleGame(object):
+    """Class which implements an ensemble of independent population games, one per simulation, which are advanced
+    together tick by tick. At each step every replica revises the same number of agents, so the revisions of all the
+    replicas are vectorized at once and the cost of the interpreter is shared by the whole ensemble.
+    """
+
+    def __init__(self, rngs, rng, conf):
+        """EnsembleGame initialization.
+
+        :param rngs: list, holding the numpy random Generator which sets up the initial state of each replica.
+        :param rng: numpy random Generator, shared by the revisions of the whole ensemble.
+        :param conf: configuration of the simulations.
+        """
+        simulation_engine = conf.get_simulation_engine()
+        if simulation_engine not in [AGENTS, ARRAY]:
+            raise PyABMException(ENSEMBLE_REQUIRES_ARRAY_STATE.format(simulation_engine))
+        if conf.get_snapshot_interval():
+            raise PyABMException(SNAPSHOTS_NOT_AVAILABLE_WITHIN_ENSEMBLES)
+        self.rng = rng
+        self.game_rounds = conf.get_number_of_game_rounds()
+        self.tick = None
+        self.num_of_channels = conf.get_number_of_channels()
+        self.n_of_agents = conf.get_number_of_agents()
+        self.number_of_trials = conf.get_number_of_trials()
+        self.update_strategies_mode = conf.get_update_strategies_mode()
+        self.payoff_matrix = get_payoff_matrix(conf.get_matrix_payoffs(), self.num_of_channels)
+        self.noise = conf.get_noise()
+        self.revision_block_size = max(1, conf.get_revision_block_size())
+        self.agents = EnsembleAgentPopulation(rngs, rng, conf)
+        self.n_of_replicas = self.agents.n_of_replicas
+        self.ticks_per_second = conf.get_number_of_ticks_per_second()
+        self.stop_at_absorbing_state = conf.get_stop_at_absorbing_state()
+        self.convergence_tolerance = conf.get_convergence_tolerance()
+        self.convergence_window = conf.get_convergence_window()
+        self.absorbing_strategies = get_absorbing_strategies(self.payoff_matrix, self.noise)
+        self.instrumentation = Instrumentation() if conf.get_instrumentation() else None
+        self.plot_dist = None
+
+    def __get_stopped(self):
+        """Checks the stopping rules against the logged distributions of every replica: the replica stands at an
+        absorbing monomorphic state, or none of its shares has changed more than the convergence tolerance along the
+        convergence window.
+
+        :return: numpy array, holding True for the replicas which may stop and False otherwise.
+        """
+        distributions = self.plot_dist[-1]
+        stopped = np.zeros(self.n_of_replicas, dtype=bool)
+        if self.stop_at_absorbing_state and self.absorbing_strategies:
+            stopped |= (distributions[:, self.absorbing_strategies] == 1).any(axis=1)
+        if self.convergence_tolerance:
+            window = self.plot_dist[-(self.convergence_window // self.ticks_per_second + 1):]
+            if len(window) * self.ticks_per_second > self.convergence_window:
+                stopped |= np.ptp(np.array(window), axis=0).max(axis=1) <= self.convergence_tolerance
+        return stopped
+
+    def let_players_update_strategies(self):
+        """Gives every agent of every replica the chance of reviewing her strategy under the best experienced payoff
+        protocol. The revising agents of each replica are split into blocks of revision_block_size agents, and the
+        blocks of all the replicas are revised together.
+        """
+        start_time = self.instrumentation.start() if self.instrumentation is not None else None
+        if self.update_strategies_mode == ALL_IN_ONE_TICK:
+            revisers = self.rng.permuted(np.tile(np.arange(self.n_of_agents), (self.n_of_replicas, 1)), axis=1)
+        elif self.update_strategies_mode == ASYNCHRONOUS_RANDOM_INDEPENDENT:
+            revisers = self.rng.integers(0, self.n_of_agents, size=(self.n_of_replicas, self.n_of_agents))
+        else:
+            raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+        for start in range(0, self.n_of_agents, self.revision_block_size):
+            self.agents.update_strategies(revisers[:, start:start + self.revision_block_size], self)
+        if self.instrumentation is not None:
+            self.instrumentation.stop(REVISION, start_time)
+            self.instrumentation.count(REVISIONS, self.n_of_replicas * self.n_of_agents)
+
+    def logging_distributions(self):
+        """Logs the distributions of every replica along the rounds of the game."""
+        start_time = self.instrumentation.start() if self.instrumentation is not None else None
+        self.plot_dist.append(self.agents.get_strategy_distributions() / self.n_of_agents)
+        if self.instrumentation is not None:
+            self.instrumentation.stop(DISTRIBUTION_LOGGING, start_time)
+
+    def run_population_game(self):
+        """Starts up the clock and runs the population games of the ensemble allowing the agents to review their
+        strategies, at each tick of time, until the last round or until every replica meets a stopping rule. The
+        trajectory of a replica which met a stopping rule repeats the distribution it stopped at along the rest of the
+        trajectory, as a single simulation does.
+
+        :return: list, holding the share of agents following each strategy at each logged tick for each replica.
+        """
+        self.plot_dist = []
+        self.tick = 0
+        self.logging_distributions()
+        stopping_logs = np.full(self.n_of_replicas, -1)
+        for tick in range(1, self.game_rounds + 1):
+            self.tick = tick
+            self.let_players_update_strategies()
+            if tick % self.ticks_per_second == 0:
+                self.logging_distributions()
+                stopping_logs[(stopping_logs < 0) & self.__get_stopped()] = len(self.plot_dist) - 1
+                if (stopping_logs >= 0).all():
+                    break
+
+        number_of_logs = self.game_rounds // self.ticks_per_second + 1
+        plot_dist = np.array(self.plot_dist)
+        trajectories = []
+        for replica, stopping_log in enumerate(stopping_logs):
+            trajectory = plot_dist[:, replica]
+            if stopping_log >= 0:
+                trajectory = trajectory[np.minimum(np.arange(number_of_logs), stopping_log)]
+            trajectories.append(trajectory)
+        return trajectories
@@ -0,0 +1,102 @@
+import numpy as np
+
+from pyabm.common.base.array_population import ArrayAgentPopulation
+from pyabm.common.base.network import CSRNetwork
+from pyabm.common.base.revision import get_bep_strategies
+from pyabm.common.constants import *
+
+
+class EnsembleAgentPopulation(object):
+    """Class which implements an ensemble of independent populations of players, one per simulation, which are
+    advanced together. Their strategies are kept in one 2-D numpy array of shape (replicas, agents), so every step of
+    the revisions draws the noise and the opponents of all the replicas at once. The networks of the replicas are
+    stacked into one network whose components are the networks of the replicas, unless all of them share the fixed
+    network.
+    """
+
+    def __init__(self, rngs, rng, conf):
+        """EnsembleAgentPopulation initialization. The initial state of each replica is set up from its own random
+        generator exactly as the array engine does, while the revisions draw from the generator of the ensemble.
+
+        :param rngs: list, holding the numpy random Generator of each replica.
+        :param rng: numpy random Generator, shared by the revisions of the whole ensemble.
+        :param conf: configuration of the simulations.
+        """
+        replicas = [ArrayAgentPopulation(replica_rng, conf) for replica_rng in rngs]
+        self.rng = rng
+        self.n_of_replicas = len(replicas)
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.use_population_network = conf.get_use_population_network()
+        self.strategies = np.stack([replica.strategies for replica in replicas])
+        self.strategy_counts = np.stack([replica.strategy_counts for replica in replicas])
+        self.offsets = np.arange(self.n_of_replicas, dtype=np.int64) * self.n_of_agents
+        self.fixed_network = self.use_population_network and conf.get_fixed_network()
+        if self.fixed_network:
+            self.population_network = replicas[0].population_network
+        elif self.use_population_network:
+            self.population_network = CSRNetwork.stack([replica.population_network for replica in replicas])
+
+    def get_opponents(self, revisers, number_of_opponents):
+        """Returns a block of random opponents for each of the given players of each replica, avoiding the play of an
+        agent with himself.
+
+        :param revisers: numpy array of shape (replicas, players), holding the ids of the players within their
+            replicas.
+        :param number_of_opponents: integer, holding the number of opponents drawn for each player.
+        :return: numpy array of shape (replicas * players, number of opponents), holding the ids of the opponents
+            within the flattened strategies of the ensemble.
+        """
+        if self.fixed_network:
+            opponents = self.population_network.get_neighbors(revisers.ravel(), number_of_opponents, self.rng)
+            opponents = opponents.reshape(revisers.shape + (number_of_opponents,)) + \
+                self.offsets[:, np.newaxis, np.newaxis]
+            return opponents.reshape(-1, number_of_opponents)
+        elif self.use_population_network:
+            return self.population_network.get_neighbors((revisers + self.offsets[:, np.newaxis]).ravel(),
+                                                         number_of_opponents, self.rng)
+        else:
+            opponents = self.rng.integers(0, self.n_of_agents - 1, size=revisers.shape + (number_of_opponents,))
+            opponents += opponents >= revisers[:, :, np.newaxis]
+            opponents += self.offsets[:, np.newaxis, np.newaxis]
+            return opponents.reshape(-1, number_of_opponents)
+
+    def update_strategies(self, revisers, game):
+        """Lets a block of agents of every replica review their strategies in one pass following the BEP protocol.
+        All of them observe the strategies as they were at the beginning of the block.
+
+        :param revisers: numpy array of shape (replicas, players), holding the ids of the revising agents within their
+            replicas.
+        :param game: an instance of the current ensemble game.
+        """
+        if game.instrumentation is None:
+            opponents = self.get_opponents(revisers, self.num_of_channels * game.number_of_trials)
+        else:
+            start_time = game.instrumentation.start()
+            opponents = self.get_opponents(revisers, self.num_of_channels * game.number_of_trials)
+            game.instrumentation.stop(OPPONENT_SAMPLING, start_time)
+            game.instrumentation.count(OPPONENT_DRAWS, opponents.size)
+        strategies = self.strategies.reshape(-1)
+        flat_revisers = (revisers + self.offsets[:, np.newaxis]).ravel()
+        opponents = opponents.reshape(len(flat_revisers), self.num_of_channels, game.number_of_trials)
+        new_strategies = get_bep_strategies(game.payoff_matrix, strategies[opponents], self.rng)
+        noisy = self.rng.random(len(flat_revisers)) <= game.noise
+        new_strategies[noisy] = self.rng.integers(0, self.num_of_channels, size=np.count_nonzero(noisy))
+        if revisers.shape[1] > 1:
+            # Revisers drawn with replacement may appear several times within the block; the last revision is the one
+            # kept.
+            flat_revisers, last = np.unique(flat_revisers[::-1], return_index=True)
+            new_strategies = new_strategies[::-1][last]
+        channel_offsets = flat_revisers // self.n_of_agents * self.num_of_channels
+        size = self.n_of_replicas * self.num_of_channels
+        counts = self.strategy_counts.reshape(-1)
+        counts -= np.bincount(channel_offsets + strategies[flat_revisers], minlength=size)
+        counts += np.bincount(channel_offsets + new_strategies, minlength=size)
+        strategies[flat_revisers] = new_strategies
+
+    def get_strategy_distributions(self):
+        """Returns the histogram of strategies which are being used by the players of each replica.
+
+        :return: numpy array of shape (replicas, channels), holding the distribution of strategies of each replica.
+        """
+        return self.strategy_counts.copy()
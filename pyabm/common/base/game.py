@@ -1,47 +1,139 @@
-import random
+import os
 import numpy as np
 
+from pyabm.common.base.array_population import ArrayAgentPopulation
+from pyabm.common.base.mean_dynamics_population import MeanDynamicsAgentPopulation
+from pyabm.common.base.mean_field_population import MeanFieldAgentPopulation
+from pyabm.common.base.parallel_population import ParallelAgentPopulation
 from pyabm.common.base.population import AgentPopulation
+from pyabm.common.base.revision import get_bep_candidates
 from pyabm.common.constants import *
 from pyabm.common.exceptions import PyABMException
-from pyabm.common.utils.plot import prepare_plot, plot_distribution
+from pyabm.common.utils.instrumentation import Instrumentation
+from pyabm.common.utils.plot import DistributionPlotter
+from pyabm.common.utils.results import get_results_filename
+from pyabm.common.utils.rng import get_simulation_rng
 from pyabm.common.workspace import Workspace
 
 
+def get_payoff_matrix(payoff_matrix, num_of_channels):
+    """Returns the matrix of payoffs as numpy array. If the user does not provide any definition of it, returns the
+    coordination matrix.
+
+    :param payoff_matrix: list of lists, holding the definition of the payoff matrix.
+    :param num_of_channels: integer, holding the number of strategies.
+    :return: numpy array, holding the definition of the payoff matrix.
+    """
+    n = num_of_channels
+    if not payoff_matrix:
+        payoff_matrix = np.zeros((n, n))
+        for i in range(n):
+            payoff_matrix[i, i] = i + 1
+        return payoff_matrix
+    else:
+        payoff_matrix = np.array(payoff_matrix)
+        assert payoff_matrix.shape == (n, n)
+        return payoff_matrix
+
+
+def get_absorbing_strategies(payoff_matrix, noise):
+    """Returns the strategies whose monomorphic states are absorbing: without noise, when every agent follows one of
+    them, every opponent does too, so revising agents keep it if it is the only best reply to itself.
+
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param noise: float, holding the probability of choosing a strategy at random.
+    :return: list, holding the absorbing strategies.
+    """
+    if noise > 0:
+        return []
+    return [s for s in range(payoff_matrix.shape[0])
+            if np.count_nonzero(payoff_matrix[:, s] >= payoff_matrix[s, s]) == 1]
+
+
 class AgentGame(object):
     """Class which implements the communication between Agents within the frame of evolutionary game theory."""
 
-    def __init__(self):
-        workspace = Workspace()
-        self.game_rounds = workspace.conf.get_number_of_game_rounds()
+    def __init__(self, rng=None, conf=None, outputs_path=None):
+        """AgentGame initialization.
+
+        :param rng: numpy random Generator of the simulation. If it is not given, it is built from the seed of the
+            configuration.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
+        :param outputs_path: string, holding the directory where the results are written. If it is not given, it is
+            the outputs directory of the workspace.
+        """
+        conf = conf if conf is not None else Workspace().conf
+        self.rng = rng if rng is not None else get_simulation_rng(conf.get_seed())
+        self.game_rounds = conf.get_number_of_game_rounds()
         self.tick = None
-        self.num_of_channels = workspace.conf.get_number_of_channels()
-        self.n_of_agents = workspace.conf.get_number_of_agents()
-        self.number_of_trials = workspace.conf.get_number_of_trials()
-        self.update_strategies_mode = workspace.conf.get_update_strategies_mode()
-        self.payoff_matrix = self.__get_payoff_matrix(workspace.conf.get_matrix_payoffs())
-        self.noise = workspace.conf.get_noise()
-        self.show_plot_distribution = workspace.conf.get_show_plot_distribution()
-        self.agents = AgentPopulation()
-        self.ticks_per_second = workspace.conf.get_number_of_ticks_per_second()
-
-    def __get_payoff_matrix(self, payoff_matrix):
-        """Returns the matrix of payoffs as numpy array. If the user does not provide any definition of it, returns the
-        coordination matrix.
-
-        :param payoff_matrix: list of lists, holding the definition of the payoff matrix.
-        :return: numpy array, holding the definition of the payoff matrix.
+        self.num_of_channels = conf.get_number_of_channels()
+        self.n_of_agents = conf.get_number_of_agents()
+        self.number_of_trials = conf.get_number_of_trials()
+        self.update_strategies_mode = conf.get_update_strategies_mode()
+        self.payoff_matrix = get_payoff_matrix(conf.get_matrix_payoffs(), self.num_of_channels)
+        self.noise = conf.get_noise()
+        self.show_plot_distribution = conf.get_show_plot_distribution()
+        self.plot_frame_rate = conf.get_plot_frame_rate()
+        self.plot_frames_format = conf.get_plot_frames_format()
+        outputs_path = outputs_path if outputs_path is not None else os.path.join(WORKSPACE, OUTPUTS)
+        self.plot_output_path = os.path.join(outputs_path, FRAMES, get_results_filename(conf))
+        self.plotter = None
+        self.simulation_engine = conf.get_simulation_engine()
+        self.revision_block_size = conf.get_revision_block_size()
+        self.agents = self.__get_population(conf)
+        self.ticks_per_second = conf.get_number_of_ticks_per_second()
+        self.checkpoint_interval = conf.get_checkpoint_interval()
+        self.stop_at_absorbing_state = conf.get_stop_at_absorbing_state()
+        self.convergence_tolerance = conf.get_convergence_tolerance()
+        self.convergence_window = conf.get_convergence_window()
+        self.absorbing_strategies = get_absorbing_strategies(self.payoff_matrix, self.noise)
+        self.bep_candidates, self.payoff_bounds = get_bep_candidates(self.payoff_matrix,
+                                                                     conf.get_payoff_bound_pruning())
+        self.stopping_tick = None
+        self.instrumentation = Instrumentation() if conf.get_instrumentation() else None
+        self.plot_dist = None
+        self.snapshots = None
+
+    def __getstate__(self):
+        """Returns the state of the game saved by a checkpoint, without the plotter of the running simulation.
+
+        :return: dictionary, holding the attributes of the game.
         """
-        n = self.num_of_channels
-        if not payoff_matrix:
-            payoff_matrix = np.zeros((n, n))
-            for i in range(n):
-                payoff_matrix[i, i] = i + 1
-            return payoff_matrix
+        state = self.__dict__.copy()
+        state["plotter"] = None
+        return state
+
+    def __is_stopped(self):
+        """Checks the stopping rules against the logged distributions: the population stands at an absorbing
+        monomorphic state, or no share has changed more than the convergence tolerance along the convergence window.
+
+        :return: True if the simulation may stop and False otherwise.
+        """
+        distribution = self.plot_dist[-1]
+        if self.stop_at_absorbing_state and any(distribution[s] == 1 for s in self.absorbing_strategies):
+            return True
+        if self.convergence_tolerance:
+            window = self.plot_dist[-(self.convergence_window // self.ticks_per_second + 1):]
+            if len(window) * self.ticks_per_second > self.convergence_window:
+                return np.ptp(np.array(window), axis=0).max() <= self.convergence_tolerance
+        return False
+
+    def __get_population(self, conf):
+        """Returns the population of agents backed by the data structure required by the simulation engine.
+
+        :param conf: configuration of the simulation.
+        :return: instance of the population of agents.
+        """
+        if self.simulation_engine in [ARRAY, COMPILED]:
+            return ArrayAgentPopulation(self.rng, conf)
+        elif self.simulation_engine == PARALLEL:
+            return ParallelAgentPopulation(self.rng, conf)
+        elif self.simulation_engine == MEAN_FIELD:
+            return MeanFieldAgentPopulation(self.rng, conf)
+        elif self.simulation_engine == MEAN_DYNAMICS:
+            return MeanDynamicsAgentPopulation(self.rng, conf)
         else:
-            payoff_matrix = np.array(payoff_matrix)
-            assert payoff_matrix.shape == (n, n)
-            return payoff_matrix
+            return AgentPopulation(self.rng, conf)
 
     def play_agent_game(self, player_1, player_2):
         """Implements the game using the matrix of payoffs.
@@ -57,49 +149,166 @@ class AgentGame(object):
         opponent. The revising agent then selects the strategy that obtained the greatest payoff in the tests and,
         in case of ties, one of them is chosen randomly.
         """
-        if self.update_strategies_mode == ALL_IN_ONE_TICK:
-            reordered_ids = random.sample(list(range(self.n_of_agents)), self.n_of_agents)
+        start_time = self.instrumentation.start() if self.instrumentation is not None else None
+        if self.simulation_engine == COMPILED:
+            self.agents.run_compiled_ticks(1, self)
+        elif self.simulation_engine == PARALLEL:
+            self.agents.run_parallel_tick(self)
+        elif self.simulation_engine == MEAN_FIELD:
+            self.agents.run_mean_field_tick(self)
+        elif self.simulation_engine == MEAN_DYNAMICS:
+            self.agents.run_mean_dynamics_tick(self)
+        elif self.revision_block_size > 1:
+            self.__let_blocks_of_players_update_strategies()
+        elif self.update_strategies_mode == ALL_IN_ONE_TICK:
+            reordered_ids = self.rng.permutation(self.n_of_agents).tolist()
             for i in reordered_ids:
-                player_1 = self.agents.population[i]
-                player_1.update_strategy(self)
+                self.agents.update_strategy(i, self)
+        elif self.update_strategies_mode == ASYNCHRONOUS_RANDOM_INDEPENDENT:
+            for i in self.rng.integers(0, self.n_of_agents, size=self.n_of_agents).tolist():
+                self.agents.update_strategy(i, self)
+        else:
+            raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+        if self.instrumentation is not None:
+            self.instrumentation.stop(REVISION, start_time)
+            self.instrumentation.count(REVISIONS, self.n_of_agents)
+
+    def __let_blocks_of_players_update_strategies(self):
+        """Splits the revising agents of the tick into blocks of revision_block_size agents which are revised in one
+        pass each. The agents of a block observe the strategies as they were at the beginning of the block.
+        """
+        if self.update_strategies_mode == ALL_IN_ONE_TICK:
+            revisers = self.rng.permutation(self.n_of_agents)
         elif self.update_strategies_mode == ASYNCHRONOUS_RANDOM_INDEPENDENT:
-            for i in range(self.n_of_agents):
-                player_1 = self.agents.population[random.randint(0, self.n_of_agents - 1)]
-                player_1.update_strategy(self)
+            revisers = self.rng.integers(0, self.n_of_agents, size=self.n_of_agents)
         else:
             raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+        for start in range(0, self.n_of_agents, self.revision_block_size):
+            self.agents.update_strategies(revisers[start:start + self.revision_block_size], self)
 
     def logging_distributions(self, game, plot_dist):
-        """Logs the distributions along the rounds of the game updating the plot or the given list of distributions.
+        """Logs the distributions along the rounds of the game into the given list of distributions, and sends them to
+        the plotter if the plot is required.
 
-        :param game: instance of the class game.
+        :param game: integer, holding the current tick of the game.
         :param plot_dist: list, holding the evolution of the distributions along the simulation.
         """
-        distribution = self.agents.get_strategy_distribution()
-        if self.show_plot_distribution == ON:
-            plot_distribution(game, self.ticks_per_second, distribution, plot_dist)
-        else:
-            plot_dist.append(distribution[-1] / self.n_of_agents)
+        start_time = self.instrumentation.start() if self.instrumentation is not None else None
+        plot_dist.append(self.agents.get_strategy_distribution() / self.n_of_agents)
+        if self.plotter is not None:
+            self.plotter.update(game, plot_dist[-1])
+        if self.instrumentation is not None:
+            self.instrumentation.stop(DISTRIBUTION_LOGGING, start_time)
+
+    def __record_snapshot(self, tick):
+        """Records the strategy of every agent if the snapshots are required and one is due at the given tick.
+
+        :param tick: integer, holding the current tick of the game.
+        """
+        if self.snapshots is not None and self.snapshots.is_due(tick):
+            start_time = self.instrumentation.start() if self.instrumentation is not None else None
+            self.snapshots.record(tick, self.agents.get_strategies())
+            if self.instrumentation is not None:
+                self.instrumentation.stop(IO, start_time)
+
+    def __start_plotter(self, run_number):
+        """Starts the plotter of the distributions if the plot is required, sending it the distributions which were
+        already logged.
 
-    def run_population_game(self):
+        :param run_number: integer, holding the number of the simulation, which names the written plot.
+        """
+        if self.show_plot_distribution != OFF:
+            self.plotter = DistributionPlotter(self.game_rounds / self.ticks_per_second, self.ticks_per_second,
+                                               self.plot_frame_rate, self.show_plot_distribution == HEADLESS,
+                                               self.plot_output_path + RUN_SUFFIX.format(run_number),
+                                               self.plot_frames_format)
+            for i, distribution in enumerate(self.plot_dist):
+                self.plotter.update(i * self.ticks_per_second, distribution)
+
+    def __stop_plotter(self):
+        """Tells the plotter that the simulation finished."""
+        if self.plotter is not None:
+            self.plotter.close()
+            self.plotter = None
+
+    def run_population_game(self, checkpoint=None, run_number=0, snapshots=None):
         """Starts up the clock and runs the population game allowing the agents to review their strategies, at each
         tick of time.
 
+        :param checkpoint: Checkpoint instance where the state of the game is saved every checkpoint_interval ticks,
+            or None.
+        :param run_number: integer, holding the number of the simulation within its checkpoint.
+        :param snapshots: SnapshotWriter instance which records the strategy of every agent every snapshot_interval
+            ticks, or None.
         :return:
             - numpy array, holding the distribution of strategies.
-            - list, needed to plot the distribution.
+            - list, holding the share of agents following each strategy at each logged tick.
         """
-        if self.show_plot_distribution == ON:
-            length_x = self.game_rounds / self.ticks_per_second
-            prepare_plot(length_x, SECONDS, DISTRIBUTION)
-
-        plot_dist = []
+        self.plot_dist = []
         self.tick = 0
-        self.logging_distributions(0, plot_dist)
-        for tick in range(1, self.game_rounds + 1):
-            self.tick = tick
-            self.let_players_update_strategies()
-            if tick % self.ticks_per_second == 0:
-                self.logging_distributions(tick, plot_dist)
-
-        return self.agents.get_strategy_distribution(), plot_dist
+        self.snapshots = snapshots
+        self.__start_plotter(run_number)
+        self.logging_distributions(0, self.plot_dist)
+        self.__record_snapshot(0)
+        return self.__run_ticks(checkpoint, run_number)
+
+    def resume_population_game(self, checkpoint=None, run_number=0):
+        """Runs the rest of a population game restored from a checkpoint.
+
+        :param checkpoint: Checkpoint instance where the state of the game is saved every checkpoint_interval ticks,
+            or None.
+        :param run_number: integer, holding the number of the simulation within its checkpoint.
+        :return:
+            - numpy array, holding the distribution of strategies.
+            - list, holding the share of agents following each strategy at each logged tick.
+        """
+        self.__start_plotter(run_number)
+        return self.__run_ticks(checkpoint, run_number)
+
+    def __fill_trajectory(self):
+        """Stops the simulation at the current tick, repeating its last logged distribution along the rest of the
+        trajectory so that every simulation logs the same number of distributions. The snapshots are filled likewise.
+        """
+        self.stopping_tick = self.tick
+        if self.snapshots is not None:
+            self.snapshots.fill(self.tick, self.agents.get_strategies())
+        number_of_logs = self.game_rounds // self.ticks_per_second + 1
+        if self.plotter is not None:
+            for i in range(len(self.plot_dist), number_of_logs):
+                self.plotter.update(i * self.ticks_per_second, self.plot_dist[-1])
+        self.plot_dist.extend([self.plot_dist[-1]] * (number_of_logs - len(self.plot_dist)))
+
+    def __run_ticks(self, checkpoint, run_number):
+        """Runs the ticks of the game which are left, saving its state periodically if it is required, until the last
+        round or a stopping rule is met.
+
+        :param checkpoint: Checkpoint instance, or None.
+        :param run_number: integer, holding the number of the simulation within its checkpoint.
+        :return:
+            - numpy array, holding the distribution of strategies.
+            - list, holding the share of agents following each strategy at each logged tick.
+        """
+        try:
+            for tick in range(self.tick + 1, self.game_rounds + 1):
+                self.tick = tick
+                self.let_players_update_strategies()
+                self.__record_snapshot(tick)
+                if tick % self.ticks_per_second == 0:
+                    self.logging_distributions(tick, self.plot_dist)
+                    if self.__is_stopped():
+                        self.__fill_trajectory()
+                        break
+                if checkpoint is not None and self.checkpoint_interval and tick % self.checkpoint_interval == 0 \
+                        and tick < self.game_rounds:
+                    start_time = self.instrumentation.start() if self.instrumentation is not None else None
+                    checkpoint.save_game(run_number, self)
+                    if self.instrumentation is not None:
+                        self.instrumentation.stop(IO, start_time)
+        finally:
+            if self.simulation_engine == PARALLEL:
+                self.agents.release_workers()
+
+        if self.snapshots is not None:
+            self.snapshots.close()
+        self.__stop_plotter()
+        return self.agents.get_strategy_distribution(), self.plot_dist
@@ -0,0 +1,243 @@
+import math
+import numpy as np
+
+from pyabm.common.base.game import get_payoff_matrix
+from pyabm.common.base.revision import get_bep_revision_probabilities
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.validation import check_initial_condition
+
+
+def get_compositions(total, parts):
+    """Yields, in lexicographic order, every way of splitting a number of agents among a number of strategies.
+
+    :param total: integer, holding the number of agents.
+    :param parts: integer, holding the number of strategies.
+    :return: generator of tuples, holding the number of agents following each strategy.
+    """
+    if parts == 1:
+        yield total,
+    else:
+        for first in range(total + 1):
+            for rest in get_compositions(total - first, parts - 1):
+                yield (first,) + rest
+
+
+class BEPMarkovChain(object):
+    """Class which implements the exact model of a population without network structure under the best experienced
+    payoff protocol: a finite Markov chain over the vectors of numbers of agents following each strategy. Each
+    revision moves one agent, who is chosen at random, from her strategy i to the strategy j with the probability given
+    by the closed form of the protocol when her opponents are drawn among the rest of the population. It describes the
+    sequential revision of the agent based engines, i.e. with revision_block_size 1.
+    """
+
+    def __init__(self, conf):
+        """BEPMarkovChain initialization.
+
+        :param conf: configuration of the simulations.
+        """
+        if conf.get_use_population_network():
+            raise PyABMException(MARKOV_CHAIN_REQUIRES_NO_NETWORK)
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.initial_distribution_of_strategies = conf.get_initial_distribution_of_strategies()
+        self.number_of_trials = conf.get_number_of_trials()
+        self.noise = conf.get_noise()
+        self.update_strategies_mode = conf.get_update_strategies_mode()
+        if self.update_strategies_mode not in [ASYNCHRONOUS_RANDOM_INDEPENDENT, ALL_IN_ONE_TICK]:
+            raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+        self.payoff_matrix = get_payoff_matrix(conf.get_matrix_payoffs(), self.num_of_channels)
+        number_of_states = math.comb(self.n_of_agents + self.num_of_channels - 1, self.num_of_channels - 1)
+        if number_of_states > MARKOV_CHAIN_STATES_LIMIT:
+            raise PyABMException(TOO_MANY_MARKOV_CHAIN_STATES.format(number_of_states, MARKOV_CHAIN_STATES_LIMIT))
+        self.states = np.array(list(get_compositions(self.n_of_agents, self.num_of_channels)), dtype=np.int64)
+        self.state_index = {state: index for index, state in enumerate(map(tuple, self.states.tolist()))}
+        self.revision_probabilities = self.__get_revision_probabilities()
+        self.revision_matrix = self.__get_revision_matrix()
+        self.tick_matrix = self.__get_tick_matrix() if self.update_strategies_mode == ALL_IN_ONE_TICK else None
+
+    def __get_revision_probabilities(self):
+        """Returns the probability with which a revising agent following each strategy adopts each strategy at each
+        state. Her opponents are drawn with replacement among the other agents.
+
+        :return: numpy array of shape (states, channels, channels), holding the probability of moving from the
+            strategy i to the strategy j at each state.
+        """
+        probabilities = np.zeros((len(self.states), self.num_of_channels, self.num_of_channels))
+        for index, state in enumerate(self.states):
+            for strategy in np.flatnonzero(state):
+                opponents = state.copy()
+                opponents[strategy] -= 1
+                probabilities[index, strategy] = get_bep_revision_probabilities(
+                    self.payoff_matrix, opponents / (self.n_of_agents - 1), self.number_of_trials, self.noise)
+        return probabilities
+
+    def __get_revision_matrix(self):
+        """Returns the transition matrix of one revision of an agent chosen at random.
+
+        :return: scipy sparse matrix of shape (states, states).
+        """
+        from scipy import sparse
+
+        rows, columns, values = [], [], []
+        for strategy in range(self.num_of_channels):
+            for new_strategy in range(self.num_of_channels):
+                probabilities = self.revision_probabilities[:, strategy, new_strategy]
+                sources = np.flatnonzero(self.states[:, strategy] * probabilities)
+                targets = self.states[sources].copy()
+                targets[:, strategy] -= 1
+                targets[:, new_strategy] += 1
+                rows.append(sources)
+                columns.append([self.state_index[target] for target in map(tuple, targets.tolist())])
+                values.append(self.states[sources, strategy] / self.n_of_agents * probabilities[sources])
+        number_of_states = len(self.states)
+        return sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(columns))),
+                                 shape=(number_of_states, number_of_states))
+
+    def __get_tick_matrix(self):
+        """Returns the transition matrix of one tick in which every agent revises once in random order. Within the
+        tick, the chain runs over the pairs of vectors of agents who did not revise yet and agents who already did,
+        since the next reviser is drawn among the former.
+
+        :return: scipy sparse matrix of shape (states, states).
+        """
+        from scipy import sparse
+
+        tick_matrix = sparse.identity(len(self.states), format="csr")
+        for revised in range(self.n_of_agents):
+            unrevised_states = list(get_compositions(self.n_of_agents - revised, self.num_of_channels))
+            revised_states = list(get_compositions(revised, self.num_of_channels))
+            next_revised_index = {state: index for index, state in
+                                  enumerate(get_compositions(revised + 1, self.num_of_channels))}
+            next_unrevised_index = {state: index for index, state in
+                                    enumerate(get_compositions(self.n_of_agents - revised - 1, self.num_of_channels))}
+            rows, columns, values = [], [], []
+            for unrevised_index, unrevised in enumerate(unrevised_states):
+                for revised_index, revised_state in enumerate(revised_states):
+                    row = unrevised_index * len(revised_states) + revised_index
+                    state_index = self.state_index[tuple(np.add(unrevised, revised_state))]
+                    for strategy in np.flatnonzero(unrevised):
+                        next_unrevised = list(unrevised)
+                        next_unrevised[strategy] -= 1
+                        next_row = next_unrevised_index[tuple(next_unrevised)] * len(next_revised_index)
+                        for new_strategy in np.flatnonzero(self.revision_probabilities[state_index, strategy]):
+                            next_revised = list(revised_state)
+                            next_revised[new_strategy] += 1
+                            rows.append(row)
+                            columns.append(next_row + next_revised_index[tuple(next_revised)])
+                            values.append(unrevised[strategy] / (self.n_of_agents - revised) *
+                                          self.revision_probabilities[state_index, strategy, new_strategy])
+            step_matrix = sparse.csr_matrix((values, (rows, columns)), shape=(
+                len(unrevised_states) * len(revised_states), len(next_unrevised_index) * len(next_revised_index)))
+            tick_matrix = tick_matrix @ step_matrix
+        return tick_matrix.tocsr()
+
+    def get_transition_matrix(self):
+        """Returns the matrix of the chain whose closed classes and stationary distributions are computed: the one of a
+        revision under asynchronous random independent revisions, whose ticks are made of independent revisions, and
+        the one of a tick otherwise.
+
+        :return: scipy sparse matrix of shape (states, states).
+        """
+        return self.revision_matrix if self.tick_matrix is None else self.tick_matrix
+
+    def get_initial_distribution(self):
+        """Returns the probability of each state at the beginning of the simulations: the initial condition, or the
+        multinomial distribution of agents who take a strategy at random.
+
+        :return: numpy array, holding the probability of each state.
+        """
+        initial_distribution = np.zeros(len(self.states))
+        if self.initial_distribution_of_strategies:
+            check_initial_condition(self.initial_distribution_of_strategies, self.n_of_agents, self.num_of_channels)
+            initial_distribution[self.state_index[tuple(self.initial_distribution_of_strategies)]] = 1
+        else:
+            from scipy.special import gammaln
+
+            initial_distribution = np.exp(gammaln(self.n_of_agents + 1) - gammaln(self.states + 1).sum(axis=1) -
+                                          self.n_of_agents * np.log(self.num_of_channels))
+        return initial_distribution
+
+    def get_transient_distributions(self, initial_distribution, number_of_ticks, ticks_per_second):
+        """Returns the exact probability of each state at each logged tick.
+
+        :param initial_distribution: numpy array, holding the probability of each state at the tick zero.
+        :param number_of_ticks: integer, holding the number of ticks.
+        :param ticks_per_second: integer, holding the number of ticks between two logs.
+        :return: numpy array of shape (logs, states), holding the probability of each state at each logged tick.
+        """
+        transposed_matrix = self.get_transition_matrix().T.tocsr()
+        steps_per_tick = self.n_of_agents if self.tick_matrix is None else 1
+        distribution = initial_distribution
+        distributions = [distribution]
+        for tick in range(1, number_of_ticks + 1):
+            for step in range(steps_per_tick):
+                distribution = transposed_matrix @ distribution
+            if tick % ticks_per_second == 0:
+                distributions.append(distribution)
+        return np.array(distributions)
+
+    def get_mean_distributions(self, state_distributions):
+        """Returns the expected share of agents following each strategy given the probability of each state.
+
+        :param state_distributions: numpy array, holding the probability of each state, or one row of probabilities
+            per logged tick.
+        :return: numpy array, holding the expected share of agents following each strategy.
+        """
+        return state_distributions @ self.states / self.n_of_agents
+
+    def get_closed_classes(self):
+        """Returns the closed communicating classes of the chain, which the chain never leaves once it enters them.
+        Without noise, the absorbing monomorphic states are among them.
+
+        :return: list, holding the indexes of the states of each closed class.
+        """
+        from scipy.sparse.csgraph import connected_components
+
+        transition_matrix = self.get_transition_matrix().tocoo()
+        _, labels = connected_components(transition_matrix, directed=True, connection="strong")
+        leaving = labels[transition_matrix.row] != labels[transition_matrix.col]
+        open_labels = np.unique(labels[transition_matrix.row[leaving & (transition_matrix.data > 0)]])
+        return [np.flatnonzero(labels == label) for label in np.setdiff1d(np.unique(labels), open_labels)]
+
+    def get_absorption_probabilities(self, initial_distribution, closed_classes):
+        """Returns the probability with which the chain ends up in each closed class from the initial distribution,
+        solving the sparse linear system of the transient states.
+
+        :param initial_distribution: numpy array, holding the probability of each state at the tick zero.
+        :param closed_classes: list, holding the indexes of the states of each closed class.
+        :return: numpy array, holding the probability of ending up in each closed class.
+        """
+        from scipy import sparse
+        from scipy.sparse.linalg import spsolve
+
+        transition_matrix = self.get_transition_matrix().tocsr()
+        transient = np.setdiff1d(np.arange(len(self.states)), np.concatenate(closed_classes))
+        probabilities = np.array([initial_distribution[closed_class].sum() for closed_class in closed_classes])
+        if len(transient):
+            transient_rows = transition_matrix[transient]
+            transient_matrix = transient_rows[:, transient]
+            entering = np.column_stack([np.asarray(transient_rows[:, closed_class].sum(axis=1)).ravel()
+                                        for closed_class in closed_classes])
+            absorption = spsolve((sparse.identity(len(transient), format="csc") - transient_matrix).tocsc(), entering)
+            probabilities += initial_distribution[transient] @ absorption.reshape(len(transient), len(closed_classes))
+        return probabilities
+
+    def get_stationary_distribution(self, closed_class):
+        """Returns the stationary distribution of the chain within one of its closed classes, solving the sparse
+        linear system of the balance equations.
+
+        :param closed_class: numpy array, holding the indexes of the states of the closed class.
+        :return: numpy array, holding the stationary probability of each state of the class.
+        """
+        from scipy import sparse
+        from scipy.sparse.linalg import spsolve
+
+        if len(closed_class) == 1:
+            return np.ones(1)
+        class_matrix = self.get_transition_matrix().tocsr()[closed_class][:, closed_class]
+        balance = (class_matrix.T - sparse.identity(len(closed_class))).tolil()
+        balance[-1, :] = 1
+        right_hand_side = np.zeros(len(closed_class))
+        right_hand_side[-1] = 1
+        return spsolve(balance.tocsc(), right_hand_side)
@@ -0,0 +1,74 @@
+import numpy as np
+
+from pyabm.common.base.revision import get_bep_revision_probabilities
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.validation import check_initial_condition
+from pyabm.common.workspace import Workspace
+
+
+class MeanDynamicsAgentPopulation(object):
+    """Class which implements the large population limit of a well-mixed population of players: the shares of agents
+    following each strategy evolve deterministically following the mean dynamic of the BEP protocol,
+
+        dx/dt = (1 - noise) BEP(x) + noise / number_of_channels - x,
+
+    where a tick lasts one unit of time, since the whole population revises once per tick on average.
+    """
+
+    def __init__(self, rng=None, conf=None):
+        """MeanDynamicsAgentPopulation initialization.
+
+        :param rng: numpy random Generator, unused since the mean dynamic is deterministic.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
+        """
+        conf = conf if conf is not None else Workspace().conf
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.initial_distribution_of_strategies = conf.get_initial_distribution_of_strategies()
+        self.use_population_network = conf.get_use_population_network()
+        if self.use_population_network:
+            raise PyABMException(ENGINE_REQUIRES_NO_NETWORK.format(MEAN_DYNAMICS))
+        self.strategy_shares = self.__populate_group()
+
+    def __populate_group(self):
+        """It settles the share of agents following each strategy as the initial condition in case it were required
+        or as the expected shares when every agent takes a strategy at random otherwise.
+
+        :return: numpy array, holding the share of agents following each strategy.
+        """
+        if not self.initial_distribution_of_strategies:
+            return np.ones(self.num_of_channels) / self.num_of_channels
+        else:
+            check_initial_condition(self.initial_distribution_of_strategies, self.n_of_agents, self.num_of_channels)
+            return np.array(self.initial_distribution_of_strategies, dtype=float) / self.n_of_agents
+
+    @staticmethod
+    def get_mean_dynamic(strategy_shares, game):
+        """Returns the velocity of change of the shares of strategies under the mean dynamic of the BEP protocol.
+
+        :param strategy_shares: numpy array, holding the share of agents following each strategy.
+        :param game: an instance of the current game.
+        :return: numpy array, holding the time derivative of the shares.
+        """
+        return get_bep_revision_probabilities(
+            game.payoff_matrix, strategy_shares, game.number_of_trials, game.noise) - strategy_shares
+
+    def run_mean_dynamics_tick(self, game):
+        """Integrates the mean dynamic along one tick.
+
+        :param game: an instance of the current game.
+        """
+        from scipy.integrate import solve_ivp
+
+        solution = solve_ivp(lambda t, x: self.get_mean_dynamic(x, game), (0, 1), self.strategy_shares,
+                             rtol=1e-8, atol=1e-10)
+        self.strategy_shares = solution.y[:, -1].clip(0, 1)
+        self.strategy_shares /= self.strategy_shares.sum()
+
+    def get_strategy_distribution(self):
+        """Returns the expected histogram of strategies which are being used by the players of the population.
+
+        :return: numpy array, holding the distribution of strategies.
+        """
+        return self.strategy_shares * self.n_of_agents
@@ -0,0 +1,148 @@
+import numpy as np
+
+from pyabm.common.base.revision import get_bep_revision_probabilities
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.validation import check_initial_condition
+from pyabm.common.workspace import Workspace
+
+
+class MeanFieldAgentPopulation(object):
+    """Class which implements a well-mixed population of players by means of the number of agents following each
+    strategy only. Since the opponents are drawn uniformly among the rest of the population, the dynamics only depend
+    on these counts, so the cost of a tick does not depend on the number of agents. The revisions of a tick are grouped
+    into leaps whose revisers observe the counts frozen at the beginning of the leap, which approximates the sequential
+    revision of the agent based engines unless there are as many leaps as agents.
+    """
+
+    def __init__(self, rng=None, conf=None):
+        """MeanFieldAgentPopulation initialization.
+
+        :param rng: numpy random Generator, shared by the whole simulation.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
+        """
+        conf = conf if conf is not None else Workspace().conf
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.initial_distribution_of_strategies = conf.get_initial_distribution_of_strategies()
+        self.use_population_network = conf.get_use_population_network()
+        self.leaps_per_tick = conf.get_mean_field_leaps_per_tick()
+        if self.use_population_network:
+            raise PyABMException(ENGINE_REQUIRES_NO_NETWORK.format(MEAN_FIELD))
+        self.strategy_counts = self.__populate_group()
+
+    def __populate_group(self):
+        """It settles the number of agents following each strategy as the initial condition in case it were required
+        or as if every agent took a strategy at random otherwise.
+
+        :return: numpy array, holding the number of agents following each strategy.
+        """
+        if not self.initial_distribution_of_strategies:
+            return self.rng.multinomial(self.n_of_agents, np.ones(self.num_of_channels) / self.num_of_channels)
+        else:
+            check_initial_condition(self.initial_distribution_of_strategies, self.n_of_agents, self.num_of_channels)
+            return np.array(self.initial_distribution_of_strategies, dtype=np.int64)
+
+    def __draw_hypergeometric(self, n_of_good, n_of_bad, n_of_draws):
+        """Returns the number of good items drawn without replacement. Beyond HYPERGEOMETRIC_LIMIT items, which the
+        numpy generator does not support, it is drawn through the normal approximation.
+
+        :param n_of_good: integer, holding the number of good items.
+        :param n_of_bad: integer, holding the number of bad items.
+        :param n_of_draws: integer, holding the number of drawn items.
+        :return: integer, holding the number of good items drawn.
+        """
+        if n_of_good < HYPERGEOMETRIC_LIMIT and n_of_bad < HYPERGEOMETRIC_LIMIT:
+            return self.rng.hypergeometric(n_of_good, n_of_bad, n_of_draws)
+        n_of_items = n_of_good + n_of_bad
+        p_good = n_of_good / n_of_items
+        variance = n_of_draws * p_good * (1 - p_good) * (n_of_items - n_of_draws) / (n_of_items - 1)
+        n_of_good_draws = int(round(self.rng.normal(n_of_draws * p_good, np.sqrt(variance))))
+        return min(max(n_of_good_draws, n_of_draws - n_of_bad, 0), n_of_good, n_of_draws)
+
+    def __draw_without_replacement(self, strategy_counts, n_of_draws):
+        """Draws agents without replacement and returns how many of them follow each strategy (multivariate
+        hypergeometric distribution), by means of a chain of univariate hypergeometric draws.
+
+        :param strategy_counts: numpy array, holding the number of agents following each strategy.
+        :param n_of_draws: integer, holding the number of agents to draw.
+        :return: numpy array, holding the number of drawn agents following each strategy.
+        """
+        draws = np.zeros_like(strategy_counts)
+        remaining = strategy_counts.sum()
+        for strategy, count in enumerate(strategy_counts):
+            remaining -= count
+            if n_of_draws == 0:
+                break
+            if count > 0:
+                draws[strategy] = self.__draw_hypergeometric(count, remaining, n_of_draws) if remaining else n_of_draws
+                n_of_draws -= draws[strategy]
+        return draws
+
+    def __draw_number_of_distinct_revisers(self, n_of_revisions):
+        """Returns how many different agents are drawn when the given number of revisers are drawn with replacement.
+        It is drawn exactly for populations up to EXACT_DISTINCT_REVISERS_LIMIT agents and through the normal
+        approximation of the occupancy distribution otherwise.
+
+        :param n_of_revisions: integer, holding the number of revisers drawn with replacement.
+        :return: integer, holding the number of different agents among them.
+        """
+        n = self.n_of_agents
+        if n <= EXACT_DISTINCT_REVISERS_LIMIT:
+            return len(np.unique(self.rng.integers(0, n, size=n_of_revisions)))
+        p_untouched = (1 - 1 / n) ** n_of_revisions
+        mean = n * (1 - p_untouched)
+        variance = n * (n - 1) * (1 - 2 / n) ** n_of_revisions + n * p_untouched - (n * p_untouched) ** 2
+        n_of_distinct = int(round(self.rng.normal(mean, np.sqrt(max(variance, 0)))))
+        return min(max(n_of_distinct, 1), n_of_revisions, n)
+
+    def __revise(self, revisers, game):
+        """Lets the given number of agents following each strategy review their strategies. Every reviser draws her
+        opponents among the rest of the population, all of them observing the counts as they are before the leap.
+
+        :param revisers: numpy array, holding the number of revising agents following each strategy.
+        :param game: an instance of the current game.
+        """
+        new_counts = self.strategy_counts - revisers
+        for strategy in np.flatnonzero(revisers):
+            opponents = self.strategy_counts.astype(float)
+            opponents[strategy] -= 1
+            probabilities = get_bep_revision_probabilities(
+                game.payoff_matrix, opponents / (self.n_of_agents - 1), game.number_of_trials, game.noise)
+            new_counts += self.rng.multinomial(revisers[strategy], probabilities)
+        self.strategy_counts = new_counts
+
+    def run_mean_field_tick(self, game):
+        """Lets the population review their strategies along one tick. The revisions of the tick are grouped into
+        leaps_per_tick leaps which draw the revisers exactly, without replacement if every agent revises once per tick
+        and with replacement otherwise. The revisers of a leap observe the counts as they were at its beginning, so this
+        is an approximation of the sequential revision, which is only exact with one leap per agent.
+
+        :param game: an instance of the current game.
+        """
+        leap_sizes = np.diff(np.linspace(0, self.n_of_agents, self.leaps_per_tick + 1).astype(np.int64))
+        if game.update_strategies_mode == ALL_IN_ONE_TICK:
+            pending_revisers = self.strategy_counts.copy()
+            for leap_size in leap_sizes:
+                if leap_size == pending_revisers.sum():
+                    revisers = pending_revisers
+                else:
+                    revisers = self.__draw_without_replacement(pending_revisers, leap_size)
+                pending_revisers = pending_revisers - revisers
+                self.__revise(revisers, game)
+        elif game.update_strategies_mode == ASYNCHRONOUS_RANDOM_INDEPENDENT:
+            # The outcome of a revision does not depend on the strategy of the reviser but through her exclusion from
+            # the opponents, so an agent drawn several times within a leap just revises once.
+            for leap_size in leap_sizes:
+                n_of_distinct_revisers = self.__draw_number_of_distinct_revisers(leap_size)
+                self.__revise(self.__draw_without_replacement(self.strategy_counts, n_of_distinct_revisers), game)
+        else:
+            raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+
+    def get_strategy_distribution(self):
+        """Returns the histogram of strategies which are being used by the players of the population.
+
+        :return: numpy array, holding the distribution of strategies.
+        """
+        return self.strategy_counts.copy()
@@ -0,0 +1,258 @@
+import numpy as np
+
+from pyabm.common.base.network_generators import get_network_edges
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.rng import get_network_rng
+from pyabm.common.workspace import Workspace
+
+
+class CSRNetwork(object):
+    """Class which implements an undirected population network frozen in compressed sparse row format: the neighbors
+    of the node i are indices[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(self, indptr, indices):
+        """CSRNetwork initialization.
+
+        :param indptr: numpy array, holding the position in indices where the neighbors of each node start.
+        :param indices: numpy array, holding the neighbors of every node one after another.
+        """
+        self.indptr = indptr
+        self.indices = indices
+        self.n_of_nodes = len(indptr) - 1
+        self.shared_memories = []
+
+    def __getstate__(self):
+        """Returns the state of the network saved by a checkpoint. The arrays are copied out of the shared memory
+        they may be attached to, since it does not outlive the batch.
+
+        :return: dictionary, holding the attributes of the network.
+        """
+        state = self.__dict__.copy()
+        state["shared_memories"] = []
+        return state
+
+    @staticmethod
+    def from_edges(n_of_nodes, sources, targets):
+        """Builds the network from the arrays of ends of its undirected edges.
+
+        :param n_of_nodes: integer, holding the number of nodes.
+        :param sources: numpy array, holding one end of each edge.
+        :param targets: numpy array, holding the other end of each edge.
+        :return: CSRNetwork instance.
+        """
+        index_type = np.int32 if n_of_nodes <= np.iinfo(np.int32).max else np.int64
+        rows = np.concatenate([sources, targets])
+        columns = np.concatenate([targets, sources])
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(n_of_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_of_nodes), out=indptr[1:])
+        return CSRNetwork(indptr, columns[order].astype(index_type))
+
+    @staticmethod
+    def from_networkx(graph):
+        """Freezes a NetworkX graph whose nodes are labelled from zero to the number of nodes minus one.
+
+        :param graph: NetworkX graph.
+        :return: CSRNetwork instance.
+        """
+        edges = np.array(list(graph.edges()), dtype=np.int64).reshape(-1, 2)
+        return CSRNetwork.from_edges(graph.number_of_nodes(), edges[:, 0], edges[:, 1])
+
+    @staticmethod
+    def stack(networks):
+        """Joins several networks into one whose components are the given networks, one after another: the node i of
+        the k-th network becomes the node k * n + i, where n is the number of nodes of each network.
+
+        :param networks: list, holding CSRNetwork instances with the same number of nodes.
+        :return: CSRNetwork instance.
+        """
+        n_of_nodes = networks[0].n_of_nodes
+        index_type = np.int32 if len(networks) * n_of_nodes <= np.iinfo(np.int32).max else np.int64
+        edge_offsets = np.cumsum([0] + [len(network.indices) for network in networks[:-1]])
+        indptr = np.concatenate([network.indptr[:-1] + edge_offset
+                                 for network, edge_offset in zip(networks, edge_offsets)] +
+                                [[edge_offsets[-1] + len(networks[-1].indices)]])
+        indices = np.concatenate([network.indices.astype(index_type) + k * n_of_nodes
+                                  for k, network in enumerate(networks)])
+        return CSRNetwork(indptr.astype(np.int64), indices)
+
+    def get_edges(self):
+        """Returns the ends of every undirected edge of the network, listed once.
+
+        :return:
+            - numpy array, holding the lesser end of each edge.
+            - numpy array, holding the greater end of each edge.
+        """
+        sources = np.repeat(np.arange(self.n_of_nodes, dtype=np.int64), self.get_degrees())
+        is_listed = sources < self.indices
+        return sources[is_listed], self.indices[is_listed].astype(np.int64)
+
+    def to_networkx(self):
+        """Exports the network to a NetworkX graph with the same nodes and edges, so that it can be analysed with
+        NetworkX.
+
+        :return: NetworkX graph.
+        """
+        from networkx import Graph
+
+        graph = Graph()
+        graph.add_nodes_from(range(self.n_of_nodes))
+        graph.add_edges_from(zip(*(ends.tolist() for ends in self.get_edges())))
+        return graph
+
+    def get_coloring(self, rng):
+        """Returns a proper coloring of the network, where no two neighbors share a color, so the agents of a color can
+        be revised at once without observing each other. It follows the Jones-Plassmann algorithm: at each round, the
+        uncolored nodes whose random priority beats those of all their uncolored neighbors take the least color which
+        none of their neighbors holds. Every round is vectorized and there are few rounds, so it scales to millions of
+        nodes while using few more colors than the greedy coloring.
+
+        :param rng: numpy random Generator, which draws the priorities.
+        :return: numpy array, holding the color of each node, from zero to the number of colors minus one.
+        """
+        priorities = rng.permutation(self.n_of_nodes)
+        colors = np.full(self.n_of_nodes, -1, dtype=np.int64)
+        sources = np.repeat(np.arange(self.n_of_nodes, dtype=np.int64), self.get_degrees())
+        targets = self.indices.astype(np.int64)
+        while np.any(colors < 0):
+            is_beaten = np.zeros(self.n_of_nodes, dtype=bool)
+            is_beaten[sources[(colors[targets] < 0) & (priorities[targets] > priorities[sources])]] = True
+            is_selected = (colors < 0) & ~is_beaten
+            # The least color missing among the colored neighbors of each selected node is found on its sorted colors:
+            # it is the first rank which does not hold its own color, or the number of colors if there is none.
+            is_colored_neighbor = is_selected[sources] & (colors[targets] >= 0)
+            base = colors.max() + 2
+            keys = np.sort(sources[is_colored_neighbor] * base + colors[targets[is_colored_neighbor]])
+            colors[is_selected] = 0
+            if len(keys):
+                keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+                nodes, neighbor_colors = keys // base, keys % base
+                is_start = np.concatenate([[True], nodes[1:] != nodes[:-1]])
+                starts = np.flatnonzero(is_start)
+                groups = np.cumsum(is_start) - 1
+                ranks = np.arange(len(keys)) - starts[groups]
+                sizes = np.diff(np.append(starts, len(keys)))
+                colors[nodes[starts]] = np.minimum.reduceat(np.where(neighbor_colors != ranks, ranks, sizes[groups]),
+                                                            starts)
+            is_pending = colors[sources] < 0
+            sources, targets = sources[is_pending], targets[is_pending]
+        return colors
+
+    def get_degrees(self):
+        """Returns the degree of every node.
+
+        :return: numpy array, holding the degree of every node.
+        """
+        return np.diff(self.indptr)
+
+    def get_neighbor(self, node, rng):
+        """Returns one of the neighbors of the node chosen at random.
+
+        :param node: integer, holding the node.
+        :param rng: numpy random Generator.
+        :return: integer, holding the neighbor.
+        """
+        start = self.indptr[node]
+        return int(self.indices[start + rng.integers(self.indptr[node + 1] - start)])
+
+    def get_neighbors(self, nodes, number_of_neighbors, rng):
+        """Returns a block of neighbors chosen at random with replacement for each of the given nodes.
+
+        :param nodes: numpy array, holding the nodes.
+        :param number_of_neighbors: integer, holding the number of neighbors drawn for each node.
+        :param rng: numpy random Generator.
+        :return: numpy array of shape (nodes, number of neighbors), holding the neighbors.
+        """
+        starts = self.indptr[nodes]
+        degrees = self.indptr[nodes + 1] - starts
+        offsets = (rng.random((len(nodes), number_of_neighbors)) * degrees[:, np.newaxis]).astype(np.int64)
+        return self.indices[starts[:, np.newaxis] + offsets]
+
+
+def get_network_key(conf):
+    """Returns the parameters which define the fixed network of a configuration.
+
+    :param conf: configuration of the simulation.
+    :return: tuple, holding the number of agents, the network algorithm, the number of nearest neighbors, the
+        probability of rewiring, the probability of edge, the network generator and the seed.
+    """
+    return (conf.get_number_of_agents(), conf.get_random_network_algorithm(), conf.get_nearest_neighbors(),
+            conf.get_probability_of_rewiring(), conf.get_probability_of_edge(), conf.get_network_generator(),
+            conf.get_seed())
+
+
+def get_fixed_population_network(conf):
+    """Returns the fixed network shared by every simulation with the network parameters and the seed of the
+    configuration. It is built the first time it is required within the process, unless the parent of the pool
+    already shared it.
+
+    :param conf: configuration of the simulation.
+    :return: CSRNetwork, holding the fixed network.
+    """
+    fixed_networks = Workspace().fixed_networks
+    network_key = get_network_key(conf)
+    if network_key not in fixed_networks:
+        fixed_networks[network_key] = get_population_network(
+            conf.get_number_of_agents(), conf.get_random_network_algorithm(), conf.get_nearest_neighbors(),
+            conf.get_probability_of_rewiring(), conf.get_probability_of_edge(), get_network_rng(conf.get_seed()),
+            conf.get_network_generator())
+    return fixed_networks[network_key]
+
+
+def get_networkx_population_network(n_of_agents, network_algorithm, nearest_neighbors, probability_of_rewiring,
+                                    probability_of_edge, rng):
+    """Returns a random graph which is built with NetworkX following one of these algorithms: Barabasi-Albert, Small
+    World or Erdos-Renyi. It is frozen in compressed sparse row format, so NetworkX is only used to generate it.
+
+    :param n_of_agents: integer, holding the number of agents in the population.
+    :param network_algorithm: string, holding the algorithm used to build the network.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :param probability_of_rewiring: float, holding the probability of rewiring in the Small World network.
+    :param probability_of_edge: float, holding the probability of edge in the Erdos-Renyi network.
+    :param rng: numpy random Generator, which seeds the generation of the graph.
+    :return: CSRNetwork, holding the random graph following the required algorithm.
+    """
+    from networkx.generators.random_graphs import (barabasi_albert_graph, connected_watts_strogatz_graph,
+                                                   fast_gnp_random_graph)
+
+    seed = int(rng.integers(np.iinfo(np.int32).max))
+    if network_algorithm == BARABASI_ALBERT:
+        number_of_links = 1
+        graph = barabasi_albert_graph(n_of_agents, number_of_links, seed=seed)
+    elif network_algorithm == SMALL_WORLD:
+        graph = connected_watts_strogatz_graph(n_of_agents, k=nearest_neighbors, p=probability_of_rewiring, seed=seed)
+    elif network_algorithm == ERDOS_RENYI:
+        graph = fast_gnp_random_graph(n_of_agents, probability_of_edge, seed=seed)
+    else:
+        raise PyABMException(NOT_VALID_NETWORK_ALGORITHM.format(network_algorithm, NETWORK_ALGORITHMS))
+    return CSRNetwork.from_networkx(graph)
+
+
+def get_population_network(n_of_agents, network_algorithm, nearest_neighbors, probability_of_rewiring,
+                           probability_of_edge, rng, network_generator=NETWORKX):
+    """Returns a random graph which is built following one of these algorithms: Barabasi-Albert, Small World or
+    Erdos-Renyi. It will have as many number of nodes as players and it is frozen in compressed sparse row format. The
+    native generator builds the arrays of its edges with vectorized numpy operations, while the NetworkX one builds it
+    as a NetworkX graph. The Erdos-Renyi network is generated again while some agent is left without neighbors.
+
+    :param n_of_agents: integer, holding the number of agents in the population.
+    :param network_algorithm: string, holding the algorithm used to build the network.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :param probability_of_rewiring: float, holding the probability of rewiring in the Small World network.
+    :param probability_of_edge: float, holding the probability of edge in the Erdos-Renyi network.
+    :param rng: numpy random Generator, which seeds the generation of the graph.
+    :param network_generator: string, networkx (default) or native.
+    :return: CSRNetwork, holding the random graph following the required algorithm.
+    """
+    for trial in range(NETWORK_GENERATION_TRIES):
+        if network_generator == NETWORKX:
+            network = get_networkx_population_network(n_of_agents, network_algorithm, nearest_neighbors,
+                                                      probability_of_rewiring, probability_of_edge, rng)
+        else:
+            network = CSRNetwork.from_edges(n_of_agents, *get_network_edges(
+                n_of_agents, network_algorithm, nearest_neighbors, probability_of_rewiring, probability_of_edge, rng))
+        if network_algorithm != ERDOS_RENYI or network.get_degrees().min() > 0:
+            return network
+    raise PyABMException(NETWORK_WITH_ISOLATED_AGENTS.format(NETWORK_GENERATION_TRIES))
@@ -0,0 +1,170 @@
+import numpy as np
+
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+
+
+def is_connected(n_of_nodes, sources, targets):
+    """Returns True if the undirected graph given by its edges has a single connected component.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param sources: numpy array, holding one end of each edge.
+    :param targets: numpy array, holding the other end of each edge.
+    :return: True if the graph is connected and False otherwise.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    graph = coo_matrix((np.ones(len(sources), dtype=np.int8), (sources, targets)), shape=(n_of_nodes, n_of_nodes))
+    return connected_components(graph, directed=False, return_labels=False) == 1
+
+
+def get_ring_lattice_edges(n_of_nodes, nearest_neighbors):
+    """Returns the edges of the ring lattice where every node is joined to its nearest_neighbors // 2 neighbors on
+    each side.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :return:
+        - numpy array, holding the node of each edge.
+        - numpy array, holding its neighbor on the right.
+    """
+    distances = np.arange(1, nearest_neighbors // 2 + 1, dtype=np.int64)
+    sources = np.repeat(np.arange(n_of_nodes, dtype=np.int64), len(distances))
+    return sources, (sources + np.tile(distances, n_of_nodes)) % n_of_nodes
+
+
+def get_small_world_edges(n_of_nodes, nearest_neighbors, probability_of_rewiring, rng):
+    """Returns the edges of a Watts-Strogatz small world network: each edge of the ring lattice is rewired with the
+    given probability, keeping its node and replacing its neighbor with a node drawn at random. The rewired edges are
+    drawn all at once, and those which would join a node with itself or with one of its neighbors are drawn again,
+    keeping their neighbor if they still fail after a bounded number of rounds.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :param probability_of_rewiring: float, holding the probability of rewiring each edge.
+    :param rng: numpy random Generator.
+    :return:
+        - numpy array, holding one end of each edge.
+        - numpy array, holding the other end of each edge.
+    """
+    sources, targets = get_ring_lattice_edges(n_of_nodes, nearest_neighbors)
+    pending = np.flatnonzero(rng.random(len(sources)) < probability_of_rewiring)
+    for rewiring_round in range(SMALL_WORLD_REWIRING_ROUNDS):
+        if not len(pending):
+            break
+        new_targets = rng.integers(0, n_of_nodes, size=len(pending))
+        keys = np.concatenate([np.minimum(sources, targets) * n_of_nodes + np.maximum(sources, targets),
+                               np.minimum(sources[pending], new_targets) * n_of_nodes +
+                               np.maximum(sources[pending], new_targets)])
+        # The current edges come first, so a new edge is only kept if it is not one of them nor a previous new edge.
+        _, first = np.unique(keys, return_index=True)
+        is_new = np.zeros(len(keys), dtype=bool)
+        is_new[first] = True
+        rewired = is_new[len(sources):] & (new_targets != sources[pending])
+        targets[pending[rewired]] = new_targets[rewired]
+        pending = pending[~rewired]
+    return sources, targets
+
+
+def get_connected_small_world_edges(n_of_nodes, nearest_neighbors, probability_of_rewiring, rng):
+    """Returns the edges of a connected Watts-Strogatz small world network, generating it again until it is connected.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :param probability_of_rewiring: float, holding the probability of rewiring each edge.
+    :param rng: numpy random Generator.
+    :return:
+        - numpy array, holding one end of each edge.
+        - numpy array, holding the other end of each edge.
+    """
+    for trial in range(NETWORK_GENERATION_TRIES):
+        sources, targets = get_small_world_edges(n_of_nodes, nearest_neighbors, probability_of_rewiring, rng)
+        if is_connected(n_of_nodes, sources, targets):
+            return sources, targets
+    raise PyABMException(NETWORK_NOT_CONNECTED.format(NETWORK_GENERATION_TRIES))
+
+
+def get_preferential_attachment_edges(n_of_nodes, rng):
+    """Returns the edges of a Barabasi-Albert network where each new node is joined to one of the previous nodes,
+    chosen with probability proportional to its degree, starting from the edge between the nodes 0 and 1.
+
+    The list of ends of the edges holds every node as many times as its degree, so the new node v picks a uniform
+    position among the 2 (v - 1) ends of the previous edges: an even position is the new node of one of them, which is
+    known, and an odd one is its old node, which is copied from an earlier edge. Every edge is drawn at once and the
+    copies are resolved by pointer jumping, in a number of vectorized passes which grows with the logarithm of the
+    number of nodes.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param rng: numpy random Generator.
+    :return:
+        - numpy array, holding the new node of each edge.
+        - numpy array, holding the old node it is joined to.
+    """
+    n_of_edges = max(n_of_nodes - 1, 0)
+    targets = np.zeros(n_of_edges, dtype=np.int64)
+    pointers = np.zeros(n_of_edges, dtype=np.int64)
+    is_resolved = np.ones(n_of_edges, dtype=bool)
+    positions = rng.integers(0, 2 * np.arange(1, n_of_edges, dtype=np.int64))
+    copies = positions % 2 == 1
+    targets[1:] = positions // 2 + 1
+    pointers[1:] = positions // 2
+    is_resolved[1:] = ~copies
+    pending = np.flatnonzero(~is_resolved)
+    while len(pending):
+        referenced = pointers[pending]
+        done = is_resolved[referenced]
+        targets[pending[done]] = targets[referenced[done]]
+        is_resolved[pending[done]] = True
+        pending = pending[~done]
+        pointers[pending] = pointers[pointers[pending]]
+    return np.arange(1, n_of_edges + 1, dtype=np.int64), targets
+
+
+def get_erdos_renyi_edges(n_of_nodes, probability_of_edge, rng):
+    """Returns the edges of an Erdos-Renyi network, where each pair of nodes is joined with the given probability.
+    The number of edges is drawn from its binomial distribution and then as many distinct pairs are drawn uniformly,
+    so the cost grows with the number of edges instead of the number of pairs.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param probability_of_edge: float, holding the probability of joining each pair of nodes.
+    :param rng: numpy random Generator.
+    :return:
+        - numpy array, holding the greater node of each edge.
+        - numpy array, holding the lesser node of each edge.
+    """
+    n_of_pairs = n_of_nodes * (n_of_nodes - 1) // 2
+    n_of_edges = rng.binomial(n_of_pairs, probability_of_edge) if n_of_pairs else 0
+    keys = np.zeros(0, dtype=np.int64)
+    while len(keys) < n_of_edges:
+        keys = np.sort(np.concatenate([keys, rng.integers(0, n_of_pairs, size=n_of_edges - len(keys))]))
+        keys = keys[np.concatenate([[True], keys[1:] != keys[:-1]])]
+    # The pair number k is the pair (i, j) with j < i of the lower triangle, where k = i (i - 1) / 2 + j.
+    sources = ((1 + np.sqrt(1 + 8 * keys.astype(np.float64))) // 2).astype(np.int64)
+    sources -= sources * (sources - 1) // 2 > keys
+    sources += (sources + 1) * sources // 2 <= keys
+    return sources, keys - sources * (sources - 1) // 2
+
+
+def get_network_edges(n_of_nodes, network_algorithm, nearest_neighbors, probability_of_rewiring, probability_of_edge,
+                      rng):
+    """Returns the edges of a random network generated natively by the given algorithm.
+
+    :param n_of_nodes: integer, holding the number of nodes.
+    :param network_algorithm: string, holding the algorithm used to build the network.
+    :param nearest_neighbors: integer, holding the number of neighbors in the ring topology.
+    :param probability_of_rewiring: float, holding the probability of rewiring in the Small World network.
+    :param probability_of_edge: float, holding the probability of edge in the Erdos-Renyi network.
+    :param rng: numpy random Generator.
+    :return:
+        - numpy array, holding one end of each edge.
+        - numpy array, holding the other end of each edge.
+    """
+    if network_algorithm == BARABASI_ALBERT:
+        return get_preferential_attachment_edges(n_of_nodes, rng)
+    elif network_algorithm == SMALL_WORLD:
+        return get_connected_small_world_edges(n_of_nodes, nearest_neighbors, probability_of_rewiring, rng)
+    elif network_algorithm == ERDOS_RENYI:
+        return get_erdos_renyi_edges(n_of_nodes, probability_of_edge, rng)
+    else:
+        raise PyABMException(NOT_VALID_NETWORK_ALGORITHM.format(network_algorithm, NETWORK_ALGORITHMS))
@@ -0,0 +1,237 @@
+import multiprocessing
+import numpy as np
+
+from pyabm.common.base.array_population import ArrayAgentPopulation
+from pyabm.common.base.network import CSRNetwork
+from pyabm.common.base.revision import revise_strategies
+from pyabm.common.base.shared_network import attach_array, export_array
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.workspace import Workspace
+
+worker_block_revision = None
+
+
+class BlockRevision(object):
+    """Revises blocks of agents of the parallel engine with the batched revision kernel. The parent and each worker
+    of its pool hold one over the same arrays, which the workers attach to in shared memory.
+    """
+
+    def __init__(self, arrays, payoff_matrix, number_of_trials, noise):
+        """BlockRevision initialization.
+
+        :param arrays: tuple, holding the strategies, the array where the new strategies are written or None, the mask
+            of the revising agents of the tick or None, the order in which the agents are revised, and the CSR index
+            pointer and neighbors of the network.
+        :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+        :param number_of_trials: integer, holding the number of times that each strategy is tested.
+        :param noise: float, holding the probability of choosing a strategy at random.
+        """
+        self.strategies, self.updated_strategies, self.is_reviser, self.revision_order, indptr, indices = arrays
+        self.population_network = CSRNetwork(indptr, indices)
+        self.payoff_matrix = payoff_matrix
+        self.number_of_trials = number_of_trials
+        self.noise = noise
+        self.shared_memories = []
+
+    def revise(self, block):
+        """Lets the agents placed at the given positions of the revision order review their strategies in one pass,
+        drawing from the random stream of the block.
+
+        :param block: tuple, holding the first and the last position of the block, and the seed of its stream.
+        :return: numpy array, holding the change in the number of agents following each strategy.
+        """
+        start, stop, seed = block
+        rng = np.random.default_rng(seed)
+        revisers = self.revision_order[start:stop]
+        if self.is_reviser is not None:
+            revisers = revisers[self.is_reviser[revisers]]
+        num_of_channels = self.payoff_matrix.shape[0]
+        opponents = self.population_network.get_neighbors(revisers, num_of_channels * self.number_of_trials, rng)
+        strategy_counts = np.zeros(num_of_channels, dtype=np.int64)
+        revise_strategies(self.strategies, revisers,
+                          opponents.reshape(len(revisers), num_of_channels, self.number_of_trials),
+                          self.payoff_matrix, self.noise, rng, strategy_counts, self.updated_strategies)
+        return strategy_counts
+
+
+def initialize_revision_worker(handles, payoff_matrix, number_of_trials, noise):
+    """Initializes each worker of the pool of the parallel engine, attaching it to the arrays of the population.
+
+    :param handles: list, holding the handle of each array in shared memory, or None for the missing ones.
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param number_of_trials: integer, holding the number of times that each strategy is tested.
+    :param noise: float, holding the probability of choosing a strategy at random.
+    """
+    global worker_block_revision
+    shared_memories, arrays = [], []
+    for handle in handles:
+        if handle is None:
+            arrays.append(None)
+        else:
+            block, array = attach_array(handle)
+            shared_memories.append(block)
+            arrays.append(array)
+    worker_block_revision = BlockRevision(tuple(arrays), payoff_matrix, number_of_trials, noise)
+    worker_block_revision.shared_memories = shared_memories
+
+
+def revise_shared_block(block):
+    """Revises one block of agents within a worker of the pool of the parallel engine.
+
+    :param block: tuple, holding the first and the last position of the block, and the seed of its stream.
+    :return: numpy array, holding the change in the number of agents following each strategy.
+    """
+    return worker_block_revision.revise(block)
+
+
+class ParallelAgentPopulation(ArrayAgentPopulation):
+    """Class which implements the population of players of the parallel engine, which splits the revisions of one
+    simulation on a network among number_of_processors processes.
+
+    In the colored mode, the network is colored so that no two neighbors share a color, and each pass revises one color
+    class after another, in random order. The agents of a class do not observe each other, so revising all of them at
+    once is the same as revising them one after another: the pass is a sequential revision whose order runs over the
+    color classes. In the synchronous mode, every agent of a pass revises at once observing the strategies at the
+    beginning of the pass. When every agent revises once per tick, the tick is one pass. When number of agents revisers
+    are drawn with replacement, as in the sequential engines, an agent drawn k times revises once in each of the first
+    k passes of the tick, so it revises k times, each revision observing the previous ones. The order of the revisions
+    runs over the color classes and the passes instead of being uniformly random, so the dynamics are close to those
+    of the sequential engines but not the same. Either way, the agents are revised in blocks of PARALLEL_BLOCK_SIZE
+    agents, each of them drawing from its own stream seeded by the simulation, so the results do not depend on the
+    number of processors.
+    """
+
+    def __init__(self, rng=None, conf=None):
+        """ParallelAgentPopulation initialization.
+
+        :param rng: numpy random Generator, shared by the whole simulation.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
+        """
+        conf = conf if conf is not None else Workspace().conf
+        super(ParallelAgentPopulation, self).__init__(rng, conf)
+        if not self.use_population_network:
+            raise PyABMException(PARALLEL_REQUIRES_NETWORK)
+        self.parallel_revision_mode = conf.get_parallel_revision_mode()
+        self.update_strategies_mode = conf.get_update_strategies_mode()
+        if self.update_strategies_mode not in [ASYNCHRONOUS_RANDOM_INDEPENDENT, ALL_IN_ONE_TICK]:
+            raise PyABMException(UPDATE_STRATEGIES_MODE_REQUIRED)
+        self.number_of_processors = conf.get_number_of_processors()
+        if self.parallel_revision_mode == COLORED:
+            colors = self.population_network.get_coloring(self.rng)
+            self.revision_order = np.argsort(colors, kind="stable")
+            self.color_bounds = np.searchsorted(colors[self.revision_order], np.arange(colors.max() + 2))
+            self.updated_strategies = None
+        else:
+            self.revision_order = np.arange(self.n_of_agents, dtype=np.int64)
+            self.color_bounds = np.array([0, self.n_of_agents])
+            self.updated_strategies = self.strategies.copy()
+        self.is_reviser = np.zeros(self.n_of_agents, dtype=bool) \
+            if self.update_strategies_mode == ASYNCHRONOUS_RANDOM_INDEPENDENT else None
+        self.pool = None
+        self.shared_memories = []
+
+    def __getstate__(self):
+        """Returns the state of the population saved by a checkpoint, without the pool of workers and with the arrays
+        copied out of the shared memory.
+
+        :return: dictionary, holding the attributes of the population.
+        """
+        state = self.__dict__.copy()
+        state["pool"] = None
+        state["shared_memories"] = []
+        for name in ["strategies", "updated_strategies", "is_reviser"]:
+            if state[name] is not None:
+                state[name] = state[name].copy()
+        return state
+
+    def __get_revision_arrays(self):
+        """Returns the arrays which the revision of a block requires.
+
+        :return: tuple, holding the strategies, the array where the new strategies are written or None, the mask of
+            the revising agents or None, the revision order, and the CSR index pointer and neighbors of the network.
+        """
+        return (self.strategies, self.updated_strategies, self.is_reviser, self.revision_order,
+                self.population_network.indptr, self.population_network.indices)
+
+    def __start_workers(self, game):
+        """Exports the arrays of the population into shared memory and starts the pool of workers attached to them.
+        The population keeps working on the shared strategies from then on.
+
+        :param game: an instance of the current game.
+        """
+        handles, shared_arrays = [], []
+        for array in self.__get_revision_arrays():
+            if array is None:
+                handles.append(None)
+                shared_arrays.append(None)
+            else:
+                block, handle = export_array(array)
+                self.shared_memories.append(block)
+                handles.append(handle)
+                shared_arrays.append(np.ndarray(array.shape, array.dtype, buffer=block.buf))
+        self.strategies, self.updated_strategies, self.is_reviser = shared_arrays[:3]
+        self.pool = multiprocessing.Pool(processes=self.number_of_processors, initializer=initialize_revision_worker,
+                                         initargs=(handles, game.payoff_matrix, game.number_of_trials, game.noise))
+
+    def release_workers(self):
+        """Stops the pool of workers and copies the arrays of the population out of the shared memory, which is
+        released.
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.shared_memories:
+            self.strategies = self.strategies.copy()
+            if self.updated_strategies is not None:
+                self.updated_strategies = self.updated_strategies.copy()
+            if self.is_reviser is not None:
+                self.is_reviser = self.is_reviser.copy()
+            for block in self.shared_memories:
+                block.close()
+                block.unlink()
+            self.shared_memories = []
+
+    def run_parallel_tick(self, game):
+        """Lets the population review their strategies along one tick, sending the blocks of each color class to the
+        pool of workers. The pool is started at the first tick, unless there is a single processor or the simulation
+        already runs within a pool, where the blocks are revised by this process.
+
+        :param game: an instance of the current game.
+        """
+        if self.pool is None and self.number_of_processors > 1 and not multiprocessing.current_process().daemon:
+            self.__start_workers(game)
+        if self.is_reviser is not None:
+            revisions = np.bincount(self.rng.integers(0, self.n_of_agents, size=self.n_of_agents),
+                                    minlength=self.n_of_agents)
+            number_of_passes = revisions.max()
+        else:
+            number_of_passes = 1
+        block_revision = BlockRevision(self.__get_revision_arrays(), game.payoff_matrix, game.number_of_trials,
+                                       game.noise) if self.pool is None else None
+        for pass_number in range(number_of_passes):
+            if self.is_reviser is not None:
+                np.greater(revisions, pass_number, out=self.is_reviser)
+            self.__run_parallel_pass(block_revision)
+
+    def __run_parallel_pass(self, block_revision):
+        """Lets the revising agents of one pass review their strategies, one color class after another.
+
+        :param block_revision: BlockRevision instance, which revises the blocks within this process, or None if they
+            are sent to the pool of workers.
+        """
+        if self.updated_strategies is not None:
+            self.updated_strategies[:] = self.strategies
+        for color in self.rng.permutation(len(self.color_bounds) - 1).tolist():
+            starts = range(self.color_bounds[color], self.color_bounds[color + 1], PARALLEL_BLOCK_SIZE)
+            seeds = self.rng.integers(np.iinfo(np.int64).max, size=len(starts)).tolist()
+            blocks = [(start, min(start + PARALLEL_BLOCK_SIZE, self.color_bounds[color + 1]), seed)
+                      for start, seed in zip(starts, seeds)]
+            if self.pool is not None:
+                strategy_counts = self.pool.map(revise_shared_block, blocks)
+            else:
+                strategy_counts = [block_revision.revise(block) for block in blocks]
+            self.strategy_counts += np.sum(strategy_counts, axis=0, dtype=np.int64)
+        if self.updated_strategies is not None:
+            self.strategies[:] = self.updated_strategies
@@ -1,11 +1,9 @@
-import random
 import numpy as np
 
-from networkx.generators.random_graphs import barabasi_albert_graph, connected_watts_strogatz_graph
-
 from pyabm.common.base.agent import Agent
+from pyabm.common.base.network import get_fixed_population_network, get_population_network
 from pyabm.common.constants import *
-from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.validation import check_initial_condition
 from pyabm.common.workspace import Workspace
 
 
@@ -14,29 +12,29 @@ class AgentPopulation(object):
     payoff protocol.
     """
 
-    def __init__(self):
-        workspace = Workspace()
-        self.n_of_agents = workspace.conf.get_number_of_agents()
-        self.num_of_channels = workspace.conf.get_number_of_channels()
-        self.initial_distribution_of_strategies = workspace.conf.get_initial_distribution_of_strategies()
-        self.use_population_network = workspace.conf.get_use_population_network()
-        self.population, self.population_map = self.__populate_group()
-        if self.use_population_network:
-            self.probability_of_edge = workspace.conf.get_probability_of_edge()
-            self.network_algorithm = workspace.conf.get_random_network_algorithm()
-            self.nearest_neighbors = workspace.conf.get_nearest_neighbors()
-            self.probability_of_rewiring = workspace.conf.get_probability_of_rewiring()
-            self.population_network = self.__get_population_network()
-
-    def __check_initial_condition(self, random_initial_condition):
-        """Checks whether the initial condition match the number of players and channels.
+    def __init__(self, rng=None, conf=None):
+        """AgentPopulation initialization.
 
-        :param random_initial_condition: list, holding the initial distribution of players with each strategy.
+        :param rng: numpy random Generator, shared by the whole simulation.
+        :param conf: configuration of the simulation. If it is not given, it is read from the workspace.
         """
-        if sum(random_initial_condition) != self.n_of_agents:
-            raise PyABMException(INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_PLAYERS)
-        if len(random_initial_condition) != self.num_of_channels:
-            raise PyABMException(INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_CHANNELS)
+        conf = conf if conf is not None else Workspace().conf
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.n_of_agents = conf.get_number_of_agents()
+        self.num_of_channels = conf.get_number_of_channels()
+        self.initial_distribution_of_strategies = conf.get_initial_distribution_of_strategies()
+        self.use_population_network = conf.get_use_population_network()
+        self.population, self.population_map = self.__populate_group()
+        self.strategy_counts = np.bincount([player.strategy for player in self.population],
+                                           minlength=self.num_of_channels)
+        if self.use_population_network:
+            self.probability_of_edge = conf.get_probability_of_edge()
+            self.network_algorithm = conf.get_random_network_algorithm()
+            self.nearest_neighbors = conf.get_nearest_neighbors()
+            self.probability_of_rewiring = conf.get_probability_of_rewiring()
+            self.network_generator = conf.get_network_generator()
+            self.population_network = get_fixed_population_network(conf) if conf.get_fixed_network() \
+                else self.__get_population_network()
 
     def __populate_group(self):
         """It settles the crowd of agents following the initial condition in case it were required or randomly
@@ -47,32 +45,25 @@ class AgentPopulation(object):
             - Python dictionary which maps the id to the index within the instance.
         """
         if not self.initial_distribution_of_strategies:
-            population = [Agent(i, self.num_of_channels) for i in range(self.n_of_agents)]
+            population = [Agent(i, self.num_of_channels, rng=self.rng) for i in range(self.n_of_agents)]
         else:
-            self.__check_initial_condition(self.initial_distribution_of_strategies)
-            ids = random.sample(list(range(self.n_of_agents)), self.n_of_agents)
-            strategies = random.sample(
-                [s for s in range(self.num_of_channels) for i in range(self.initial_distribution_of_strategies[s])],
-                self.n_of_agents)
-            population = [Agent(ids.pop(), self.num_of_channels, s) for s in strategies]
+            check_initial_condition(self.initial_distribution_of_strategies, self.n_of_agents, self.num_of_channels)
+            ids = self.rng.permutation(self.n_of_agents).tolist()
+            strategies = self.rng.permutation(
+                [s for s in range(self.num_of_channels) for i in range(self.initial_distribution_of_strategies[s])])
+            population = [Agent(ids.pop(), self.num_of_channels, s, self.rng) for s in strategies.tolist()]
         population_map = {population[k].player_id: k for k in range(len(population))}
         return population, population_map
 
     def __get_population_network(self):
-        """Returns a random graph which is built following one of these algorithms: Barabasi-Albert o Small World. It
-        will have as many number of nodes as players.
+        """Returns a random graph which is built following one of these algorithms: Barabasi-Albert, Small World or
+        Erdos-Renyi. It will have as many number of nodes as players.
 
-        :return: NetworkX random graph, following the required algorithm.
+        :return: CSRNetwork, holding the random graph following the required algorithm.
         """
-        if self.network_algorithm == BARABASI_ALBERT:
-            number_of_links = 1
-            return barabasi_albert_graph(self.n_of_agents, number_of_links)
-        elif self.network_algorithm == SMALL_WORLD:
-            return connected_watts_strogatz_graph(
-                self.n_of_agents, k=self.nearest_neighbors, p=self.probability_of_rewiring)
-        else:
-            raise PyABMException(
-                NOT_VALID_NETWORK_ALGORITHM.format(self.network_algorithm, [BARABASI_ALBERT, SMALL_WORLD]))
+        return get_population_network(
+            self.n_of_agents, self.network_algorithm, self.nearest_neighbors, self.probability_of_rewiring,
+            self.probability_of_edge, self.rng, self.network_generator)
 
     def get_opponent(self, player_id):
         """Returns a random opponent avoiding the play of an agent with himself.
@@ -81,20 +72,48 @@ class AgentPopulation(object):
         :return: agent, who represents the opponent.
         """
         if self.use_population_network:
-            neighbors_index = random.choice(
-                list(self.population_network.neighbors(self.population_map[player_id])))
+            neighbors_index = self.population_network.get_neighbor(self.population_map[player_id], self.rng)
             return self.population[neighbors_index]
         else:
-            player_2 = self.population[random.randint(0, len(self.population) - 1)]
+            player_2 = self.population[self.rng.integers(len(self.population))]
             while player_2.player_id == player_id:
-                player_2 = self.population[random.randint(0, len(self.population) - 1)]
+                player_2 = self.population[self.rng.integers(len(self.population))]
             return player_2
 
+    def update_strategy(self, index, game):
+        """Lets the agent placed at the given index of the population review her strategy.
+
+        :param index: integer, holding the index of the revising agent within the population.
+        :param game: an instance of the current game.
+        """
+        player = self.population[index]
+        previous_strategy = player.strategy
+        player.update_strategy(game)
+        if player.strategy != previous_strategy:
+            self.strategy_counts[previous_strategy] -= 1
+            self.strategy_counts[player.strategy] += 1
+
+    def update_strategies(self, indexes, game):
+        """Lets a block of agents review their strategies one after another.
+
+        :param indexes: iterable, holding the indexes of the revising agents within the population.
+        :param game: an instance of the current game.
+        """
+        for index in indexes:
+            self.update_strategy(index, game)
+
+    def get_strategies(self):
+        """Returns the strategy of every agent, ordered by its index within the population, which is its node of the
+        network.
+
+        :return: numpy array, holding the strategy of every agent.
+        """
+        return np.array([player.strategy for player in self.population])
+
     def get_strategy_distribution(self):
-        """Returns the histogram of strategies which are being used by the players of the population.
+        """Returns the histogram of strategies which are being used by the players of the population. It is kept up to
+        date along the revisions, so it does not depend on the number of agents.
 
         :return: numpy array, holding the distribution of strategies.
         """
-        strategies = [player.strategy for player in self.population]
-        distribution = np.histogram(strategies, bins=list(range(self.num_of_channels + 1)))[0]
-        return distribution
+        return self.strategy_counts.copy()
@@ -0,0 +1,117 @@
+import numpy as np
+
+
+def get_random_argmax(values, rng):
+    """Returns, for each row, the index of one of its maximum values chosen randomly with uniform distribution.
+
+    :param values: 2-D numpy array, holding one row of values per revising agent.
+    :param rng: numpy random Generator.
+    :return: numpy array, holding the selected column for each row.
+    """
+    is_max = values == values.max(axis=1, keepdims=True)
+    return np.argmax(is_max * rng.random(values.shape), axis=1)
+
+
+def get_bep_candidates(payoff_matrix, payoff_bound_pruning):
+    """Returns the order in which a revising agent tests the strategies under the BEP protocol, along with the greatest
+    payoff that each of them can get. With payoff bound pruning, the strategies are sorted by decreasing maximum of
+    their row of the payoff matrix: the test stops once the best payoff found beats the bound of the next candidate,
+    and a candidate is not tested again once it reaches its bound, which does not change the law of the selected
+    strategy. Otherwise, every strategy is tested in its own order against an infinite bound, which prunes nothing.
+
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param payoff_bound_pruning: bool, true if the candidates which cannot win must not be tested.
+    :return:
+        - numpy array, holding the strategies in the order in which they are tested.
+        - numpy array, holding the greatest payoff that each of them can get, in the same order.
+    """
+    num_of_channels = payoff_matrix.shape[0]
+    if not payoff_bound_pruning:
+        return np.arange(num_of_channels), np.full(num_of_channels, np.inf)
+    row_maxima = payoff_matrix.max(axis=1)
+    candidates = np.argsort(-row_maxima, kind="stable")
+    return candidates, row_maxima[candidates]
+
+
+def get_bep_strategies(payoff_matrix, opponent_strategies, rng):
+    """Batched best experienced payoff protocol: every revising agent tests each strategy against the opponents drawn
+    for it, keeps the best payoff of the trials and selects the strategy that obtained the greatest payoff. Ties are
+    resolved randomly.
+
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param opponent_strategies: numpy array of shape (revising agents, channels, trials), holding the strategies of the
+        opponents drawn for each revising agent, tested strategy and trial.
+    :param rng: numpy random Generator.
+    :return: numpy array, holding the strategy selected by each revising agent.
+    """
+    test_strategies = np.arange(payoff_matrix.shape[0])[:, np.newaxis]
+    payoffs = payoff_matrix[test_strategies, opponent_strategies].max(axis=2)
+    return get_random_argmax(payoffs, rng)
+
+
+def revise_strategies(strategies, revisers, opponents, payoff_matrix, noise, rng, strategy_counts=None,
+                      updated_strategies=None):
+    """Revises a whole block of agents in one pass: each of them follows the BEP protocol or, with probability noise,
+    takes a strategy at random. All the revising agents of the block observe the strategies as they were at the
+    beginning of the block.
+
+    :param strategies: numpy array, holding the strategy of every agent. It is updated in place, unless
+        updated_strategies is given.
+    :param revisers: numpy array, holding the indexes of the revising agents.
+    :param opponents: numpy array of shape (revising agents, channels, trials), holding the indexes of the opponents.
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param noise: float, holding the probability of choosing a strategy at random.
+    :param rng: numpy random Generator.
+    :param strategy_counts: numpy array, holding the number of agents following each strategy. If it is given, it is
+        updated in place.
+    :param updated_strategies: numpy array, where the new strategies are written. If it is not given, they are written
+        into strategies.
+    """
+    num_of_channels = payoff_matrix.shape[0]
+    new_strategies = get_bep_strategies(payoff_matrix, strategies[opponents], rng)
+    noisy = rng.random(len(revisers)) <= noise
+    new_strategies[noisy] = rng.integers(0, num_of_channels, size=np.count_nonzero(noisy))
+    if strategy_counts is not None:
+        # Revisers drawn with replacement may appear several times within the block; the last revision is the one kept.
+        revisers, last = np.unique(revisers[::-1], return_index=True)
+        new_strategies = new_strategies[::-1][last]
+        strategy_counts -= np.bincount(strategies[revisers], minlength=num_of_channels)
+        strategy_counts += np.bincount(new_strategies, minlength=num_of_channels)
+    (strategies if updated_strategies is None else updated_strategies)[revisers] = new_strategies
+
+
+def get_bep_revision_probabilities(payoff_matrix, opponent_distribution, number_of_trials, noise):
+    """Closed form of the best experienced payoff protocol: returns the probability with which a revising agent adopts
+    each strategy when every opponent is drawn independently following the given distribution of strategies.
+
+    The best payoff of the candidate s over the trials is at most v with probability F_s(v) ** number_of_trials, where
+    F_s(v) is the probability of getting at most v in one trial. The candidate s is chosen when its best payoff v is not
+    beaten by any other candidate, with probability 1 / (1 + T) if there are T other candidates tied at v, which is the
+    integral over u in [0, 1] of the product of (P(M_t < v) + u P(M_t = v)) over the other candidates t.
+
+    :param payoff_matrix: numpy array, holding the definition of the payoff matrix.
+    :param opponent_distribution: numpy array, holding the probability of meeting an opponent with each strategy.
+    :param number_of_trials: integer, holding the number of times that each strategy is tested.
+    :param noise: float, holding the probability of choosing a strategy at random.
+    :return: numpy array, holding the probability of adopting each strategy.
+    """
+    num_of_channels = payoff_matrix.shape[0]
+    values = np.unique(payoff_matrix)
+    order = np.argsort(payoff_matrix, axis=1)
+    cumulative = np.zeros((num_of_channels, num_of_channels + 1))
+    np.cumsum(np.asarray(opponent_distribution, dtype=float)[order], axis=1, out=cumulative[:, 1:])
+    p_at_most = np.array([cumulative[s, np.searchsorted(payoff_matrix[s, order[s]], values, side="right")]
+                          for s in range(num_of_channels)]).clip(0, 1) ** number_of_trials
+    p_less = np.concatenate([np.zeros((num_of_channels, 1)), p_at_most[:, :-1]], axis=1)
+    p_equal = p_at_most - p_less
+
+    # Gauss-Legendre quadrature integrates exactly the polynomials of degree num_of_channels - 1 in u.
+    nodes, weights = np.polynomial.legendre.leggauss(max(1, (num_of_channels + 1) // 2))
+    nodes, weights = (nodes + 1) / 2, weights / 2
+    factors = p_less[:, :, np.newaxis] + nodes * p_equal[:, :, np.newaxis]
+    ones = np.ones((1,) + factors.shape[1:])
+    prefix = np.concatenate([ones, np.cumprod(factors, axis=0)[:-1]], axis=0)
+    suffix = np.concatenate([np.cumprod(factors[::-1], axis=0)[:-1][::-1], ones], axis=0)
+    probabilities = np.einsum("sk,skq,q->s", p_equal, prefix * suffix, weights)
+    probabilities /= probabilities.sum()
+    return (1 - noise) * probabilities + noise / num_of_channels
@@ -0,0 +1,77 @@
+import numpy as np
+
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from pyabm.common.base.network import CSRNetwork, get_fixed_population_network, get_network_key
+from pyabm.common.workspace import Workspace
+
+
+def export_array(array):
+    """Copies an array into a new block of shared memory.
+
+    :param array: numpy array.
+    :return:
+        - SharedMemory instance, holding the block, which must be unlinked by its owner.
+        - tuple, holding the name of the block, the shape and the type of the array.
+    """
+    block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, array.dtype, buffer=block.buf)[...] = array
+    return block, (block.name, array.shape, array.dtype.str)
+
+
+def attach_array(handle):
+    """Attaches to an array exported into shared memory, without copying it.
+
+    :param handle: tuple, holding the name of the block, the shape and the type of the array.
+    :return:
+        - SharedMemory instance, holding the block, which must be kept while the array is used.
+        - numpy array, backed by the block.
+    """
+    name, shape, dtype = handle
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype, buffer=block.buf)
+
+
+@contextmanager
+def share_fixed_networks(confs):
+    """Builds once the fixed network of each configuration which requires it and exports its arrays into shared
+    memory, which is released on exit. The network is dropped from this process once it is exported, so a single copy
+    of it is kept whatever the number of processes attached to it.
+
+    :param confs: list, holding the configurations of the simulations run by the pool.
+    :return: dictionary, holding the handles of the arrays of each fixed network keyed by its network parameters.
+    """
+    blocks = []
+    network_handles = {}
+    try:
+        for conf in confs:
+            if conf.get_use_population_network() and conf.get_fixed_network():
+                network_key = get_network_key(conf)
+                if network_key not in network_handles:
+                    network = get_fixed_population_network(conf)
+                    indptr_block, indptr_handle = export_array(network.indptr)
+                    indices_block, indices_handle = export_array(network.indices)
+                    blocks += [indptr_block, indices_block]
+                    network_handles[network_key] = (indptr_handle, indices_handle)
+                    del Workspace().fixed_networks[network_key]
+        yield network_handles
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def attach_fixed_networks(network_handles):
+    """Attaches the worker to the fixed networks shared by the parent of the pool, so that the populations find them
+    instead of building their own.
+
+    :param network_handles: dictionary, holding the handles of the arrays of each fixed network keyed by its network
+        parameters.
+    """
+    for network_key, (indptr_handle, indices_handle) in network_handles.items():
+        indptr_block, indptr = attach_array(indptr_handle)
+        indices_block, indices = attach_array(indices_handle)
+        network = CSRNetwork(indptr, indices)
+        network.shared_memories = [indptr_block, indices_block]
+        Workspace().fixed_networks[network_key] = network
@@ -1,3 +1,4 @@
+import copy
 import json
 
 from pyabm.common.constants import *
@@ -8,9 +9,34 @@ from pyabm.common.utils.decorators import handle_config_parser_exception
 class Conf:
     """This class holds the methods that interacts with the PyABM configuration file."""
 
-    def __init__(self, conf_path):
-        with open(conf_path) as config_file:
-            self.conf = json.load(config_file)
+    def __init__(self, conf_path=None, conf=None):
+        """Conf initialization.
+
+        :param conf_path: string, holding the path of the configuration file.
+        :param conf: dictionary, holding the configuration already parsed. If it is given, conf_path is not read.
+        """
+        if conf is not None:
+            self.conf = conf
+        else:
+            with open(conf_path) as config_file:
+                self.conf = json.load(config_file)
+
+    def with_parameters(self, parameters):
+        """Returns a copy of the configuration where the given parameters are overridden. The attributes of the
+        network can be given by their own names.
+
+        :param parameters: dictionary, holding the value of each overridden parameter.
+        :return: Conf instance.
+        """
+        conf = copy.deepcopy(self.conf)
+        for name, value in parameters.items():
+            if name in NETWORK_ATTRIBUTES_PARAMETERS:
+                conf.setdefault(NETWORK, {}).setdefault(NETWORK_ATTRIBUTES, {})[name] = value
+            elif name in [USE_NETWORK_STRUCTURE, FIXED_NETWORK, NETWORK_GENERATOR]:
+                conf.setdefault(NETWORK, {})[name] = value
+            else:
+                conf[name] = value
+        return Conf(conf=conf)
 
     @handle_config_parser_exception("Configuration error: ")
     def get_number_of_game_rounds(self):
@@ -83,11 +109,17 @@ class Conf:
 
     @handle_config_parser_exception("Configuration error: ")
     def get_show_plot_distribution(self):
-        """Returns true if we want to show the distribution plot.
+        """Returns ON if we want to show the distribution plot, HEADLESS if we want to write it to a file instead and
+        OFF otherwise.
 
         :return: the show plot distribution.
         """
-        return self.conf.get(SHOW_PLOT_DISTRIBUTION, OFF)
+        show_plot_distribution = self.conf.get(SHOW_PLOT_DISTRIBUTION, OFF)
+        allowed_values = [ON, OFF, HEADLESS]
+        if show_plot_distribution not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(show_plot_distribution, allowed_values))
+        else:
+            return show_plot_distribution
 
     @handle_config_parser_exception("Configuration error: ")
     def get_number_of_simulations(self):
@@ -160,3 +192,233 @@ class Conf:
         :return: bool indicating whether network structure is required or not.
         """
         return self.conf[NETWORK][USE_NETWORK_STRUCTURE]
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_fixed_network(self):
+        """Returns True if every simulation must play on the same population network and False if each simulation
+        builds its own.
+
+        :return: True if the network is fixed and False otherwise.
+        """
+        return self.conf[NETWORK].get(FIXED_NETWORK, False)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_network_generator(self):
+        """Returns the generator of the population networks: networkx (default), which builds them with NetworkX as
+        earlier versions did, or native, which builds the arrays of the network with vectorized numpy operations. The
+        native networks differ from the NetworkX ones for the same seed, so they must be required explicitly.
+
+        :return: the network generator.
+        """
+        network_generator = self.conf[NETWORK].get(NETWORK_GENERATOR, NETWORKX)
+        allowed_values = [NATIVE, NETWORKX]
+        if network_generator not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(network_generator, allowed_values))
+        else:
+            return network_generator
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_simulation_engine(self):
+        """Returns the simulation engine: agents, which keeps one instance per agent, array, which keeps the state of
+        the population in numpy arrays, compiled, which runs the revisions of the array state in a compiled loop,
+        parallel, which revises the array state of a network in several processes, mean_field, which only keeps the
+        number of agents following each strategy, or mean_dynamics, which integrates the deterministic large
+        population limit.
+
+        :return: the simulation engine.
+        """
+        simulation_engine = self.conf.get(SIMULATION_ENGINE, AGENTS)
+        allowed_values = [AGENTS, ARRAY, COMPILED, PARALLEL, MEAN_FIELD, MEAN_DYNAMICS]
+        if simulation_engine not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(simulation_engine, allowed_values))
+        else:
+            return simulation_engine
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_revision_block_size(self):
+        """Returns the number of agents which are revised in one pass by the batched revision kernel.
+
+        :return: the revision block size.
+        """
+        return self.conf.get(REVISION_BLOCK_SIZE, 1)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_mean_field_leaps_per_tick(self):
+        """Returns the number of leaps in which the revisions of a tick are grouped by the mean field engine, 20 by
+        default. The revisers of a leap observe the counts frozen at its beginning, so the default is an approximation
+        of the sequential revision, which is only matched with as many leaps as agents.
+
+        :return: the number of leaps per tick.
+        """
+        return self.conf.get(MEAN_FIELD_LEAPS_PER_TICK, 20)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_seed(self):
+        """Returns the seed of the random streams of the simulations, or None if they must not be reproducible.
+
+        :return: the seed.
+        """
+        return self.conf.get(SEED)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_revision_protocol(self):
+        """Returns the revision protocol followed by the agents.
+
+        :return: the revision protocol.
+        """
+        return self.conf.get(REVISION_PROTOCOL, BEP)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_results_format(self):
+        """Returns the columnar format of the results: parquet, npz or auto, which takes parquet if pyarrow is
+        installed and npz otherwise.
+
+        :return: the results format.
+        """
+        results_format = self.conf.get(RESULTS_FORMAT, AUTO)
+        allowed_values = [AUTO, PARQUET, NPZ]
+        if results_format not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(results_format, allowed_values))
+        else:
+            return results_format
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_pool_chunksize(self):
+        """Returns the number of simulations which are sent at once to each worker of the pool.
+
+        :return: the pool chunksize.
+        """
+        return self.conf.get(POOL_CHUNKSIZE, 1)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_parameter_sweep(self):
+        """Returns the definition of the parameter sweep: a grid, holding the list of values of each parameter whose
+        combinations are simulated, and/or a list of points, holding the parameters of each simulated point.
+
+        :return: the parameter sweep.
+        """
+        return self.conf.get(PARAMETER_SWEEP, {})
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_use_result_cache(self):
+        """Returns True if the trajectories of the simulations must be cached and False otherwise. Only the seeded
+        simulations are cached, since the rest of them cannot be reproduced.
+
+        :return: True if the result cache must be used and False otherwise.
+        """
+        return self.conf.get(USE_RESULT_CACHE, True)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_result_cache_size(self):
+        """Returns the maximum size of the result cache in megabytes.
+
+        :return: the result cache size.
+        """
+        return self.conf.get(RESULT_CACHE_SIZE, 1024)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_checkpoint_interval(self):
+        """Returns the number of ticks between two checkpoints of the state of a running game, or zero if the running
+        games are not checkpointed.
+
+        :return: the checkpoint interval.
+        """
+        return self.conf.get(CHECKPOINT_INTERVAL, 0)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_snapshot_interval(self):
+        """Returns the number of ticks between two snapshots of the strategy of every agent, or zero if no snapshot is
+        recorded.
+
+        :return: the snapshot interval.
+        """
+        return self.conf.get(SNAPSHOT_INTERVAL, 0)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_stop_at_absorbing_state(self):
+        """Returns True if the simulations must stop once they reach an absorbing monomorphic state and False
+        otherwise.
+
+        :return: True if the simulations stop at absorbing states and False otherwise.
+        """
+        return self.conf.get(STOP_AT_ABSORBING_STATE, False)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_convergence_tolerance(self):
+        """Returns the maximum change of the share of any strategy along the convergence window for a simulation to be
+        considered converged, or zero if the simulations must not stop on convergence.
+
+        :return: the convergence tolerance.
+        """
+        return self.conf.get(CONVERGENCE_TOLERANCE, 0)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_convergence_window(self):
+        """Returns the number of ticks along which the distribution of strategies must stay within the convergence
+        tolerance.
+
+        :return: the convergence window.
+        """
+        return self.conf.get(CONVERGENCE_WINDOW, 50)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_plot_frame_rate(self):
+        """Returns the maximum number of frames per second rendered by the distribution plot.
+
+        :return: the plot frame rate.
+        """
+        return self.conf.get(PLOT_FRAME_RATE, 10)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_plot_frames_format(self):
+        """Returns the format of the frames written by the headless distribution plot: gif, for an animation file, or
+        png, for one image per frame.
+
+        :return: the plot frames format.
+        """
+        plot_frames_format = self.conf.get(PLOT_FRAMES_FORMAT, GIF)
+        allowed_values = [GIF, PNG]
+        if plot_frames_format not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(plot_frames_format, allowed_values))
+        else:
+            return plot_frames_format
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_instrumentation(self):
+        """Returns True if the time spent in each phase of the simulations must be measured and False otherwise.
+
+        :return: True if the instrumentation is required and False otherwise.
+        """
+        return self.conf.get(INSTRUMENTATION, False)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_ensemble_size(self):
+        """Returns the number of simulations of a batch which are advanced together as one ensemble, or 1 if every
+        simulation runs on its own.
+
+        :return: the ensemble size.
+        """
+        return self.conf.get(ENSEMBLE_SIZE, 1)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_payoff_bound_pruning(self):
+        """Returns True if the revising agents stop testing the strategies which cannot beat the best payoff found so
+        far and False otherwise.
+
+        :return: True if the payoff bound pruning is required and False otherwise.
+        """
+        return self.conf.get(PAYOFF_BOUND_PRUNING, False)
+
+    @handle_config_parser_exception("Configuration error: ")
+    def get_parallel_revision_mode(self):
+        """Returns how the parallel engine revises the agents: colored, which revises one color class of the network
+        after another, or synchronous, which revises every agent at once.
+
+        :return: the parallel revision mode.
+        """
+        parallel_revision_mode = self.conf.get(PARALLEL_REVISION_MODE, COLORED)
+        allowed_values = [COLORED, SYNCHRONOUS]
+        if parallel_revision_mode not in allowed_values:
+            raise PyABMException(NOT_VALID_CONFIGURATION_PARAMETER.format(parallel_revision_mode, allowed_values))
+        else:
+            return parallel_revision_mode
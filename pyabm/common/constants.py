@@ -3,12 +3,15 @@
 ########################################################################################################################
 ON = "ON"
 OFF = "OFF"
+HEADLESS = "HEADLESS"
 
 ########################################################################################################################
 # PLOTS
 ########################################################################################################################
 SECONDS = "Seconds"
 DISTRIBUTION = "Distribution"
+SIMULATIONS = "Simulations"
+STRATEGY = "Strategy"
 WRITE_RESULTS_TO_CSV = "write_results_to_csv"
 A = "a"
 B = "b"
@@ -19,9 +22,23 @@ M = "m"
 Y = "y"
 K = "k"
 W = "w"
+STACKED_COLORS = [B, G, R, C, M, Y, K, K]
+HEAT_MAP_COLORMAP = "viridis"
+HEAT_MAP_GAMMA = 0.5
 RUN_NUMBER = "run_number"
 STEP = "step"
 STRATEGY_RATIO = "strategy_ratio"
+STRATEGY_COLUMN = "strategy_{}"
+NPZ_RUN_ENTRY = "run_{}.npy"
+CONFIGURATION = "configuration"
+SECOND_TITLE = "Second {}"
+PLOT_FRAME_RATE = "plot_frame_rate"
+PLOT_FRAMES_FORMAT = "plot_frames_format"
+GIF = "gif"
+PNG = "png"
+FRAMES = "frames"
+FRAME_FILE = "frame_{:05d}.png"
+RUN_SUFFIX = "_run_{}"
 
 ########################################################################################################################
 # CONFIGURATION
@@ -37,12 +54,14 @@ PAYOFFS_VELOCITY_OF_CHANGE = "payoffs_velocity_of_change"
 MATRIX_PAYOFFS = "matrix_payoffs"
 SHOW_PLOT_DISTRIBUTION = "show_plot_distribution"
 REVISION_PROTOCOL = "revision_protocol"
+BEP = "bep"
 NUMBER_OF_SIMULATIONS = "number_of_simulations"
 ASYNCHRONOUS_RANDOM_INDEPENDENT = "asynchronous_random_independent"
 ALL_IN_ONE_TICK = "all_in_one_tick"
 UPDATE_STRATEGIES_MODE = "update_strategies_mode"
 NOISE = "noise"
 NUMBER_OF_PROCESSORS = "number_of_processors"
+POOL_CHUNKSIZE = "pool_chunksize"
 NETWORK = "network"
 NETWORK_ATTRIBUTES = "network_attributes"
 USE_NETWORK_STRUCTURE = "use_network_structure"
@@ -50,10 +69,111 @@ PROBABILITY_OF_EDGE = "probability_of_edge"
 NETWORK_ALGORITHM = "network_algorithm"
 PROBABILITY_OF_REWIRING = "probability_of_rewiring"
 NEAREST_NEIGHBORS = "nearest_neighbors"
+NETWORK_ATTRIBUTES_PARAMETERS = [PROBABILITY_OF_EDGE, NETWORK_ALGORITHM, PROBABILITY_OF_REWIRING, NEAREST_NEIGHBORS]
+PARAMETER_SWEEP = "parameter_sweep"
+GRID = "grid"
+POINTS = "points"
+POINT_SUFFIX = "_point_{}"
+SWEEP_INDEX_SUFFIX = "_sweep.json"
+PARAMETERS = "parameters"
+FILENAME = "filename"
 WORKSPACE = "workspace"
+RESOURCES = "resources"
+CONF = "conf"
+PYABM_JSON = "pyabm.json"
+LOGGING_CONF_JSON = "logging_conf.json"
 OUTPUTS = "outputs"
 BARABASI_ALBERT = "barabasi-albert"
 SMALL_WORLD = "sw"
+ERDOS_RENYI = "erdos-renyi"
+NETWORK_ALGORITHMS = [BARABASI_ALBERT, SMALL_WORLD, ERDOS_RENYI]
+NETWORK_GENERATOR = "network_generator"
+NATIVE = "native"
+NETWORKX = "networkx"
+NETWORK_GENERATION_TRIES = 100
+SMALL_WORLD_REWIRING_ROUNDS = 100
+SIMULATION_ENGINE = "simulation_engine"
+AGENTS = "agents"
+ARRAY = "array"
+COMPILED = "compiled"
+MEAN_FIELD = "mean_field"
+MEAN_FIELD_LEAPS_PER_TICK = "mean_field_leaps_per_tick"
+EXACT_DISTINCT_REVISERS_LIMIT = 10 ** 6
+HYPERGEOMETRIC_LIMIT = 10 ** 9
+SEED = "seed"
+RESULTS_FORMAT = "results_format"
+AUTO = "auto"
+PARQUET = "parquet"
+NPZ = "npz"
+REVISION_BLOCK_SIZE = "revision_block_size"
+USE_RESULT_CACHE = "use_result_cache"
+RESULT_CACHE_SIZE = "result_cache_size"
+CACHE = "cache"
+CACHE_ENTRY = "{}.npy"
+VERSION_FILE = "VERSION"
+RUN_NUMBER_KEY = "run_number"
+POINT_NUMBER_KEY = "point_number"
+ENGINE_VERSION = "engine_version"
+CHECKPOINT_INTERVAL = "checkpoint_interval"
+CHECKPOINTS = "checkpoints"
+GAME_CHECKPOINT = "game_run_{}.pkl"
+TRAJECTORY_CHECKPOINT = "trajectory_run_{}.npy"
+CONFIGURATION_DIGEST_SUFFIX = "_{:.16}"
+SINGLE_GAME_SUFFIX = "_single"
+STOP_AT_ABSORBING_STATE = "stop_at_absorbing_state"
+CONVERGENCE_TOLERANCE = "convergence_tolerance"
+CONVERGENCE_WINDOW = "convergence_window"
+QUICK = "quick"
+FULL = "full"
+BENCHMARK_BASELINE = "benchmark_baseline.json"
+SECONDS_KEY = "seconds"
+TICKS_PER_SECOND_KEY = "ticks_per_second"
+REVISIONS_PER_SECOND = "agent_revisions_per_second"
+INSTRUMENTATION = "instrumentation"
+REVISION = "revision"
+OPPONENT_SAMPLING = "opponent_sampling"
+PAYOFF_EVALUATION = "payoff_evaluation"
+TIE_BREAKING = "tie_breaking"
+DISTRIBUTION_LOGGING = "distribution_logging"
+IO = "io"
+PHASES = [REVISION, OPPONENT_SAMPLING, PAYOFF_EVALUATION, TIE_BREAKING, DISTRIBUTION_LOGGING, IO]
+REVISIONS = "revisions"
+OPPONENT_DRAWS = "opponent_draws"
+COUNTERS = [REVISIONS, OPPONENT_DRAWS]
+TIMES = "times"
+COUNTS = "counts"
+RATES = "rates"
+PER_SECOND_SUFFIX = "_per_second"
+METRICS = "metrics"
+DESCRIPTION = "description"
+ENSEMBLE_SIZE = "ensemble_size"
+ENSEMBLE_BLOCK_SIZE = "ensemble_block_size"
+FIXED_NETWORK = "fixed_network"
+NETWORK_STREAM = 1
+PAYOFF_BOUND_PRUNING = "payoff_bound_pruning"
+PARALLEL = "parallel"
+PARALLEL_REVISION_MODE = "parallel_revision_mode"
+COLORED = "colored"
+SYNCHRONOUS = "synchronous"
+PARALLEL_BLOCK_SIZE = 2 ** 14
+MARKOV_CHAIN_STATES_LIMIT = 10 ** 6
+MARKOV_CHAIN_SUFFIX = "_markov_chain.npz"
+STATES = "states"
+STATE_DISTRIBUTIONS = "state_distributions"
+MEAN_DISTRIBUTIONS = "mean_distributions"
+CLOSED_CLASSES = "closed_classes"
+ABSORPTION_PROBABILITIES = "absorption_probabilities"
+STATIONARY_DISTRIBUTION = "stationary_distribution"
+SNAPSHOT_INTERVAL = "snapshot_interval"
+SNAPSHOTS = "snapshots"
+SHAPE = "shape"
+DTYPE = "dtype"
+TICKS = "ticks"
+STOPPING_TICK = "stopping_tick"
+NON_EFFECTIVE_PARAMETERS = [NUMBER_OF_SIMULATIONS, NUMBER_OF_PROCESSORS, POOL_CHUNKSIZE, SHOW_PLOT_DISTRIBUTION,
+                            PLOT_FRAME_RATE, PLOT_FRAMES_FORMAT,
+                            WRITE_RESULTS_TO_CSV, RESULTS_FORMAT, PARAMETER_SWEEP, USE_RESULT_CACHE, RESULT_CACHE_SIZE,
+                            CHECKPOINT_INTERVAL, INSTRUMENTATION, SNAPSHOT_INTERVAL]
 
 ########################################################################################################################
 # EXCEPTIONS
@@ -63,3 +183,16 @@ NOT_VALID_NETWORK_ALGORITHM = "The network algorithm {} is not valid. It must be
 UPDATE_STRATEGIES_MODE_REQUIRED = "One update strategy mode must be specified."
 INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_PLAYERS = "Initial condition do not match the number of players."
 INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_CHANNELS = "Initial condition do not match the number of channels."
+MISSING_OPTIONAL_DEPENDENCY = "The package {} must be installed to use {}."
+PARALLEL_REQUIRES_NETWORK = "The parallel engine requires network structure."
+SNAPSHOTS_REQUIRE_AGENT_STATE = "The snapshots require the strategy of every agent, which the {} engine does not keep."
+SNAPSHOTS_NOT_AVAILABLE_WITHIN_ENSEMBLES = "The snapshots are not available within ensembles, whose size must be 1."
+RUNNING_GAMES_NOT_CHECKPOINTED_WITHIN_ENSEMBLES = "The checkpoint_interval is ignored within ensembles: only their " \
+                                                  "finished simulations are checkpointed."
+COMPILED_LOOP_INTERPRETED = "The package numba is not installed, so the loop of the compiled engine is interpreted."
+NETWORK_NOT_CONNECTED = "No connected small world network was generated in {} tries."
+NETWORK_WITH_ISOLATED_AGENTS = "Every Erdos-Renyi network generated in {} tries left some agents without neighbors."
+ENGINE_REQUIRES_NO_NETWORK = "The {} engine requires a population without network structure."
+MARKOV_CHAIN_REQUIRES_NO_NETWORK = "The Markov chain solver requires a population without network structure."
+TOO_MANY_MARKOV_CHAIN_STATES = "The Markov chain has {} states, beyond the limit of {}."
+ENSEMBLE_REQUIRES_ARRAY_STATE = "The ensembles of simulations require the agents or array engine, but {} was given."
@@ -5,6 +5,7 @@ import logging.config
 from os import makedirs, path
 
 # Project imports
+from pyabm.common.constants import RESOURCES, CONF, LOGGING_CONF_JSON
 from pyabm.common.singleton import Singleton
 
 # Disable unneeded logging stuff, although they are not logged, they are calculated
@@ -17,8 +18,9 @@ logging._srcfile = None
 
 
 class LoggerManager(metaclass=Singleton):
-    """Utility singleton class to configure loggers (only one for now):
+    """Utility singleton class to configure loggers:
     - one for the application traces
+    - one for the metrics, named metrics, which writes through the metrics handler
 
     This class should be initialized when launching the script. After that, just use the regular python logging system:
 
@@ -32,7 +34,7 @@ class LoggerManager(metaclass=Singleton):
     def __init__(self):
         """Logger initializer"""
 
-        with open('logging_conf.json', 'r') as logging_configuration_file:
+        with open(path.join(RESOURCES, CONF, LOGGING_CONF_JSON), 'r') as logging_configuration_file:
             config_dict = json.load(logging_configuration_file)
 
         logger_handlers = ["file", "metrics_handler"]
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+from os import path
+
+from pyabm.common.constants import *
+
+
+def get_engine_version():
+    """Returns the version of the simulation engine, read from the VERSION file of the project.
+
+    :return: string, holding the version.
+    """
+    project_path = path.dirname(path.dirname(path.dirname(path.dirname(path.abspath(__file__)))))
+    with open(path.join(project_path, VERSION_FILE)) as version_file:
+        return version_file.read().strip()
+
+
+def get_effective_configuration(conf):
+    """Returns the parameters which determine the trajectory of a simulation: the configuration without the
+    parameters regarding how the batch is run and written, and with the defaults of the optional parameters filled in.
+
+    :param conf: configuration of the simulation.
+    :return: dictionary, holding the effective configuration.
+    """
+    effective_configuration = {name: value for name, value in conf.conf.items()
+                               if name not in NON_EFFECTIVE_PARAMETERS}
+    effective_configuration.update({SIMULATION_ENGINE: conf.get_simulation_engine(),
+                                    REVISION_PROTOCOL: conf.get_revision_protocol(),
+                                    REVISION_BLOCK_SIZE: conf.get_revision_block_size(),
+                                    MEAN_FIELD_LEAPS_PER_TICK: conf.get_mean_field_leaps_per_tick(),
+                                    ENSEMBLE_SIZE: conf.get_ensemble_size(),
+                                    FIXED_NETWORK: conf.get_fixed_network(),
+                                    NETWORK_GENERATOR: conf.get_network_generator(),
+                                    PAYOFF_BOUND_PRUNING: conf.get_payoff_bound_pruning(),
+                                    PARALLEL_REVISION_MODE: conf.get_parallel_revision_mode(),
+                                    SEED: conf.get_seed()})
+    return effective_configuration
+
+
+def get_configuration_digest(conf):
+    """Returns the SHA-256 digest of the canonical JSON of the effective configuration, which identifies the
+    simulations defined by a configuration.
+
+    :param conf: configuration of the simulations.
+    :return: string, holding the digest.
+    """
+    return hashlib.sha256(json.dumps(get_effective_configuration(conf), sort_keys=True).encode()).hexdigest()
+
+
+class ResultCache(object):
+    """On-disk cache of the trajectories of the simulations, stored in workspace/outputs/cache and addressed by the
+    hash of the effective configuration, the seed, the number of the simulation and the version of the engine. Its
+    size is bounded by evicting the least recently used trajectories.
+    """
+
+    def __init__(self, outputs_path, max_size):
+        """ResultCache initialization.
+
+        :param outputs_path: string, holding the directory where the results are written.
+        :param max_size: float, holding the maximum size of the cache in megabytes.
+        """
+        self.path = path.join(outputs_path, CACHE)
+        self.max_size = int(max_size * 2 ** 20)
+        self.engine_version = get_engine_version()
+        if not path.exists(self.path):
+            os.makedirs(self.path, exist_ok=True)
+
+    def get_key(self, conf, run_number, point_number=None):
+        """Returns the key of the trajectory of the given simulation: the SHA-256 digest of the canonical JSON of its
+        effective configuration, numbers and engine version. Within ensembles, the last one of a batch is cut short at
+        the number of simulations, and the trajectories depend on the size of their ensemble, so it is added too.
+
+        :param conf: configuration of the simulation.
+        :param run_number: integer, holding the number of the simulation.
+        :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+        :return: string, holding the key.
+        """
+        content = {CONFIGURATION: get_effective_configuration(conf),
+                   RUN_NUMBER_KEY: run_number,
+                   POINT_NUMBER_KEY: point_number,
+                   ENGINE_VERSION: self.engine_version}
+        ensemble_size = conf.get_ensemble_size()
+        if ensemble_size > 1:
+            first_run_number = run_number // ensemble_size * ensemble_size
+            content[ENSEMBLE_BLOCK_SIZE] = min(ensemble_size, conf.get_number_of_simulations() - first_run_number)
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+    def __get_entry_path(self, key):
+        """Returns the path of the file holding the given trajectory.
+
+        :param key: string, holding the key of the trajectory.
+        :return: string, holding the path.
+        """
+        return path.join(self.path, CACHE_ENTRY.format(key))
+
+    def get(self, key):
+        """Returns the cached trajectory, marking it as recently used, or None if it is not cached.
+
+        :param key: string, holding the key of the trajectory.
+        :return: numpy array, holding the trajectory, or None.
+        """
+        entry_path = self.__get_entry_path(key)
+        try:
+            trajectory = np.load(entry_path)
+        except (OSError, ValueError):
+            return None
+        os.utime(entry_path)
+        return trajectory
+
+    def put(self, key, trajectory):
+        """Stores the trajectory and evicts the least recently used ones if the cache exceeds its size.
+
+        :param key: string, holding the key of the trajectory.
+        :param trajectory: list or numpy array, holding the distribution of strategies at each logged step.
+        """
+        entry_path = self.__get_entry_path(key)
+        temporary_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        with open(temporary_path, "wb") as entry:
+            np.save(entry, np.asarray(trajectory, dtype=float))
+        os.replace(temporary_path, entry_path)
+        self.__evict()
+
+    def __evict(self):
+        """Removes the least recently used trajectories until the cache fits its size."""
+        entries = [entry for entry in os.scandir(self.path) if entry.name.endswith(CACHE_ENTRY.format(""))]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.max_size:
+                break
+            size -= entry.stat().st_size
+            os.remove(entry.path)
+
+    def clear(self):
+        """Invalidates the whole cache."""
+        for entry in os.scandir(self.path):
+            if entry.name.endswith(CACHE_ENTRY.format("")):
+                os.remove(entry.path)
+
+
+def get_result_cache(outputs_path, conf):
+    """Returns the result cache if the configuration requires it. The simulations without seed are not cached, since
+    they cannot be reproduced.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :return: ResultCache instance, or None.
+    """
+    if conf.get_use_result_cache() and conf.get_seed() is not None:
+        return ResultCache(outputs_path, conf.get_result_cache_size())
+    return None
@@ -0,0 +1,111 @@
+import logging
+import os
+import pickle
+import shutil
+import numpy as np
+
+from os import path
+
+from pyabm.common.constants import *
+from pyabm.common.utils.cache import get_configuration_digest
+from pyabm.common.utils.results import get_results_filename
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint(object):
+    """Directory in workspace/outputs/checkpoints holding the state of an unfinished batch of simulations: the
+    trajectory of every finished simulation and the last snapshot of the games which were running. Every file is
+    replaced atomically, so a killed batch never leaves a corrupt checkpoint behind.
+    """
+
+    def __init__(self, outputs_path, name):
+        """Checkpoint initialization.
+
+        :param outputs_path: string, holding the directory where the results are written.
+        :param name: string, holding the name of the batch.
+        """
+        self.path = path.join(outputs_path, CHECKPOINTS, name)
+        os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def __replace(file_path, write):
+        """Writes a file through a temporary one which replaces it at once.
+
+        :param file_path: string, holding the path of the file.
+        :param write: function, which writes the content into the given file object.
+        """
+        temporary_path = "{}.{}.tmp".format(file_path, os.getpid())
+        with open(temporary_path, "wb") as checkpoint_file:
+            write(checkpoint_file)
+        os.replace(temporary_path, file_path)
+
+    def save_game(self, run_number, game):
+        """Saves the full state of a running game.
+
+        :param run_number: integer, holding the number of the simulation.
+        :param game: an instance of the current game.
+        """
+        self.__replace(path.join(self.path, GAME_CHECKPOINT.format(run_number)),
+                       lambda checkpoint_file: pickle.dump(game, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def load_game(self, run_number):
+        """Returns the last saved state of a game, or None if it was never saved.
+
+        :param run_number: integer, holding the number of the simulation.
+        :return: an instance of the game, or None.
+        """
+        game_path = path.join(self.path, GAME_CHECKPOINT.format(run_number))
+        if not path.exists(game_path):
+            return None
+        with open(game_path, "rb") as checkpoint_file:
+            return pickle.load(checkpoint_file)
+
+    def save_trajectory(self, run_number, trajectory):
+        """Saves the trajectory of a finished simulation and drops the state of its game.
+
+        :param run_number: integer, holding the number of the simulation.
+        :param trajectory: list or numpy array, holding the distribution of strategies at each logged step.
+        """
+        self.__replace(path.join(self.path, TRAJECTORY_CHECKPOINT.format(run_number)),
+                       lambda checkpoint_file: np.save(checkpoint_file, np.asarray(trajectory, dtype=float)))
+        game_path = path.join(self.path, GAME_CHECKPOINT.format(run_number))
+        if path.exists(game_path):
+            os.remove(game_path)
+
+    def load_trajectory(self, run_number):
+        """Returns the trajectory of a finished simulation, or None if it did not finish.
+
+        :param run_number: integer, holding the number of the simulation.
+        :return: numpy array, holding the trajectory, or None.
+        """
+        trajectory_path = path.join(self.path, TRAJECTORY_CHECKPOINT.format(run_number))
+        return np.load(trajectory_path) if path.exists(trajectory_path) else None
+
+    def clear(self):
+        """Removes the whole checkpoint."""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def get_checkpoint(outputs_path, conf, resume, suffix=""):
+    """Returns the checkpoint of the batch of simulations defined by the configuration, or None if checkpoint_interval
+    is zero, which disables the checkpoints. It is named after the batch and the digest of its effective
+    configuration, so batches with the same name but different parameters never share it. Unless the batch is
+    resumed, the checkpoint of a previous batch with the same configuration is discarded.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :param resume: bool, true if the batch continues from its checkpoint.
+    :param suffix: string, appended to the name of the batch.
+    :return: Checkpoint instance, or None.
+    """
+    if not conf.get_checkpoint_interval():
+        return None
+    if conf.get_ensemble_size() > 1:
+        logger.warning(RUNNING_GAMES_NOT_CHECKPOINTED_WITHIN_ENSEMBLES)
+    name = get_results_filename(conf) + suffix + CONFIGURATION_DIGEST_SUFFIX.format(get_configuration_digest(conf))
+    checkpoint = Checkpoint(outputs_path, name)
+    if not resume:
+        checkpoint.clear()
+        checkpoint = Checkpoint(outputs_path, name)
+    return checkpoint
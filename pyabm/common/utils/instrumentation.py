@@ -0,0 +1,123 @@
+import json
+import logging
+import os
+
+from os import path
+from time import perf_counter
+
+from pyabm.common.constants import *
+from pyabm.common.utils.results import get_results_filename
+
+
+class Instrumentation(object):
+    """Accumulates the time spent in each phase of a simulation and the number of revisions and opponent draws. The
+    instrumented code only calls it when the game holds an instance, so disabled instrumentation costs one comparison
+    per call site.
+    """
+
+    def __init__(self):
+        """Instrumentation initialization."""
+        self.times = dict.fromkeys(PHASES, 0.)
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    @staticmethod
+    def start():
+        """Returns the current time of the performance counter, which starts the timing of a phase.
+
+        :return: float, holding the current time.
+        """
+        return perf_counter()
+
+    def stop(self, phase, start_time):
+        """Adds the time elapsed since the start of the timing to the given phase.
+
+        :param phase: string, holding the name of the phase.
+        :param start_time: float, holding the time returned by start.
+        """
+        self.times[phase] += perf_counter() - start_time
+
+    def count(self, counter, increment=1):
+        """Increments the given counter.
+
+        :param counter: string, holding the name of the counter.
+        :param increment: integer, holding the increment.
+        """
+        self.counts[counter] += increment
+
+    def merge_file(self, summary_path):
+        """Adds the times and counts of the summary written into the given JSON file, if it exists.
+
+        :param summary_path: string, holding the path of the file.
+        """
+        if path.exists(summary_path):
+            with open(summary_path) as summary_file:
+                self.merge(json.load(summary_file))
+
+    def merge(self, summary):
+        """Adds the times and counts of a summary, e.g. the one of a simulation run by another worker.
+
+        :param summary: dictionary, holding the times and counts as returned by get_summary.
+        """
+        for phase, seconds in summary[TIMES].items():
+            self.times[phase] = self.times.get(phase, 0.) + seconds
+        for counter, value in summary[COUNTS].items():
+            self.counts[counter] = self.counts.get(counter, 0) + value
+
+    def get_summary(self):
+        """Returns the times and counts along with the derived rates.
+
+        :return: dictionary, holding the times in seconds of each phase, the counts and the rates per second.
+        """
+        revision_time = self.times[REVISION]
+        return {TIMES: dict(self.times),
+                COUNTS: dict(self.counts),
+                RATES: {counter + PER_SECOND_SUFFIX: value / revision_time if revision_time else None
+                        for counter, value in self.counts.items()}}
+
+    def write_summary(self, summary_path):
+        """Writes the summary into a JSON file.
+
+        :param summary_path: string, holding the path of the file.
+        """
+        os.makedirs(path.dirname(summary_path), exist_ok=True)
+        with open(summary_path, W) as summary_file:
+            json.dump(self.get_summary(), summary_file, indent=2)
+
+    def log_summary(self, description):
+        """Emits the summary through the metrics logger.
+
+        :param description: string, holding what the summary refers to.
+        """
+        logging.getLogger(METRICS).info(json.dumps({DESCRIPTION: description, **self.get_summary()}))
+
+
+def get_instrumentation_path(outputs_path, conf, run_number=None, point_number=None):
+    """Returns the path of the JSON summary of the instrumentation of a simulation, or of the whole batch if no
+    simulation is given.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :param run_number: integer, holding the number of the simulation, or None.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    :return: string, holding the path.
+    """
+    filename = get_results_filename(conf)
+    if point_number is not None:
+        filename += POINT_SUFFIX.format(point_number)
+    if run_number is not None:
+        filename += RUN_SUFFIX.format(run_number)
+    return path.join(outputs_path, INSTRUMENTATION, filename + ".json")
+
+
+def clear_instrumentation_summaries(outputs_path, conf, point_number=None):
+    """Removes the JSON summaries of the simulations of a batch left by earlier batches with the same name, so that
+    only the summaries written by the current batch remain.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    """
+    for run_number in range(conf.get_number_of_simulations()):
+        summary_path = get_instrumentation_path(outputs_path, conf, run_number, point_number)
+        if path.exists(summary_path):
+            os.remove(summary_path)
@@ -1,180 +1,256 @@
-import pandas as pd
+import multiprocessing
+import os
+import queue
+import threading
+import time
 import numpy as np
 
-from matplotlib import pyplot as plt
-from os import path
-
 from pyabm.common.constants import *
-from pyabm.common.workspace import Workspace
 
 
-def prepare_plot(length_x, xlabel, ylabel):
+def set_plot_style():
+    """Sets the style of the plots, the seaborn whitegrid one if seaborn is installed. Matplotlib and seaborn are only
+    imported once a plot is required.
     """
+    try:
+        import seaborn as sns
+        sns.set(style="whitegrid")
+    except ImportError:
+        pass
 
-    :param length_x:
-    :param xlabel:
-    :param ylabel:
-    :return:
-    """
-    plt.figure()
-    plt.axes(xlim=(0, length_x), ylim=(0, 1))
-    plt.xlabel(xlabel)
-    plt.ylabel(ylabel)
-    plt.ion()
 
+def get_heat_map_norm():
+    """Returns the normalization of the shares drawn in a heat map, which stretches the small shares so that they can
+    be told apart when there are many strategies.
 
-def plot_distribution(g, ticks_per_second, distribution, plot_dist):
+    :return: matplotlib normalization.
     """
+    from matplotlib.colors import PowerNorm
+
+    return PowerNorm(gamma=HEAT_MAP_GAMMA, vmin=0, vmax=1)
+
+
+def plot_mean_distribution(mean_distribution):
+    """Shows the evolution of the mean distribution of strategies of a batch of simulations: one line per strategy, or
+    a heat map of the share of each strategy if there are more strategies than colors of the stacked plot.
 
-    :param g:
-    :param ticks_per_second:
-    :param distribution:
-    :param plot_dist:
-    :return:
+    :param mean_distribution: numpy array, holding the mean share of agents following each strategy at each logged
+        step.
     """
-    plot_dist.append(distribution[::-1] / sum(distribution))
-    df_plot_dist = pd.DataFrame(plot_dist)
-    colors = [B, G, R, C, M, Y, K, K][:len(distribution)]
-    df_plot_dist.columns = ["c{}".format(i) for i in range(len(df_plot_dist.columns))]
-    plt.stackplot(df_plot_dist.index,
-                  [df_plot_dist["{}".format(c)].values for c in df_plot_dist.columns],
-                  colors=colors)
-    plt.title("Second {}".format(g / ticks_per_second))
-    plt.draw()
-    plt.pause(0.0001)
-
-
-def write_partial_results_to_csv(run_number, number_of_game_rounds, distribution, number_of_simulations,
-                                 revision_protocol, update_strategies_mode, number_of_agents, number_of_channels,
-                                 noise, use_network_structure, probability_of_edge, network_algorithm,
-                                 probability_of_rewiring, nearest_neighbors):
+    from matplotlib import pyplot as plt
+
+    set_plot_style()
+    if mean_distribution.shape[1] > len(STACKED_COLORS):
+        plt.imshow(mean_distribution.T, aspect="auto", origin="lower", interpolation="nearest", cmap=HEAT_MAP_COLORMAP,
+                   norm=get_heat_map_norm())
+        plt.ylabel(STRATEGY)
+        plt.colorbar(label=DISTRIBUTION)
+    else:
+        plt.plot(mean_distribution)
+    plt.show()
+
+
+def prepare_axes(axes, length_x, xlabel, ylabel):
+    """Sets the limits and labels of the axes of the distribution plot.
+
+    :param axes: matplotlib axes.
+    :param length_x: float, holding the length of the x axis.
+    :param xlabel: string, holding the label of the x axis.
+    :param ylabel: string, holding the label of the y axis.
     """
+    axes.set_xlim(0, length_x)
+    axes.set_ylim(0, 1)
+    axes.set_xlabel(xlabel)
+    axes.set_ylabel(ylabel)
 
-    :param run_number:
-    :param number_of_game_rounds:
-    :param distribution:
-    :param number_of_simulations:
-    :param revision_protocol:
-    :param update_strategies_mode:
-    :param number_of_agents:
-    :param number_of_channels:
-    :param noise:
-    :param use_network_structure:
-    :param probability_of_edge:
-    :param network_algorithm:
-    :param probability_of_rewiring:
-    :param nearest_neighbors:
-    :return:
+
+class DistributionRenderer(object):
+    """Draws the evolution of the distribution of strategies incrementally: each frame only stacks the segment logged
+    since the previous frame, so the cost of a frame does not depend on the length of the history. If there are more
+    strategies than colors of the stacked plot, each segment is drawn as one mesh of a heat map of the share of each
+    strategy instead, so the cost of a frame does not depend on the number of strategies either.
     """
-    workspace = Workspace()
-    pd_runs = pd.DataFrame({RUN_NUMBER: run_number,
-                            STEP: list(range(number_of_game_rounds + 1)),
-                            STRATEGY_RATIO: distribution})
-    if use_network_structure:
-        if network_algorithm == "sw":
-            filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise_{}_rewiring_{}_net_alg_{}_neighbors.csv" \
-                .format(revision_protocol,
-                        number_of_channels,
-                        number_of_simulations,
-                        update_strategies_mode,
-                        number_of_agents,
-                        noise,
-                        probability_of_rewiring,
-                        network_algorithm,
-                        nearest_neighbors)
+
+    def __init__(self, axes, ticks_per_second):
+        """DistributionRenderer initialization.
+
+        :param axes: matplotlib axes.
+        :param ticks_per_second: integer, holding the number of ticks per second.
+        """
+        self.axes = axes
+        self.ticks_per_second = ticks_per_second
+        self.seconds = []
+        self.distributions = []
+        self.drawn = 0
+
+    def add(self, tick, distribution):
+        """Appends one snapshot of the distribution of strategies.
+
+        :param tick: integer, holding the tick of the snapshot.
+        :param distribution: numpy array, holding the share of agents following each strategy.
+        """
+        self.seconds.append(tick / self.ticks_per_second)
+        self.distributions.append(distribution)
+
+    def draw(self):
+        """Draws the snapshots which were not drawn yet, joined to the last drawn one.
+
+        :return: True if anything new was drawn and False otherwise.
+        """
+        if self.drawn == len(self.distributions):
+            return False
+        start = max(self.drawn - 1, 0)
+        shares = np.array(self.distributions[start:])
+        if shares.shape[1] > len(STACKED_COLORS):
+            if len(shares) < 2:
+                return False
+            mesh = self.axes.pcolormesh(self.seconds[start:], np.arange(shares.shape[1] + 1), shares[1:].T,
+                                        shading="flat", cmap=HEAT_MAP_COLORMAP, norm=get_heat_map_norm())
+            if not self.drawn:
+                self.axes.set_ylim(0, shares.shape[1])
+                self.axes.set_ylabel(STRATEGY)
+                self.axes.figure.colorbar(mesh, ax=self.axes, label=DISTRIBUTION)
         else:
-            filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise_{}_rewiring_{}_net_alg_{}_prob_edge.csv" \
-                       .format(revision_protocol,
-                               number_of_channels,
-                               number_of_simulations,
-                               update_strategies_mode,
-                               number_of_agents,
-                               noise,
-                               probability_of_rewiring,
-                               network_algorithm,
-                               probability_of_edge)
-        pd_runs.to_csv(path.join(workspace.root, OUTPUTS, filename),
-                       header=True if run_number == 0 else False,
-                       mode=W if run_number == 0 else A,
-                       sep="|",
-                       index=False)
+            colors = STACKED_COLORS[:shares.shape[1]]
+            self.axes.stackplot(self.seconds[start:], shares[:, ::-1].T, colors=colors, linewidth=0)
+        self.axes.set_title(SECOND_TITLE.format(self.seconds[-1]))
+        self.drawn = len(self.distributions)
+        return True
+
+
+def render_live_distributions(snapshots, length_x, ticks_per_second, frame_rate):
+    """Shows the distribution plot in a window, rendering the snapshots received through the queue at most frame_rate
+    times per second. Once the simulation finishes, the window stays open until the user closes it.
+
+    :param snapshots: queue, holding tuples of tick and distribution, and None once the simulation finishes.
+    :param length_x: float, holding the length of the x axis.
+    :param ticks_per_second: integer, holding the number of ticks per second.
+    :param frame_rate: float, holding the maximum number of frames per second.
+    """
+    from matplotlib import pyplot as plt
+
+    set_plot_style()
+    figure = plt.figure()
+    axes = figure.add_subplot()
+    prepare_axes(axes, length_x, SECONDS, DISTRIBUTION)
+    renderer = DistributionRenderer(axes, ticks_per_second)
+    plt.show(block=False)
+    finished = False
+    while not finished:
+        finished = receive_snapshots(snapshots, renderer, 1 / frame_rate)
+        if renderer.draw():
+            figure.canvas.draw_idle()
+        plt.pause(1 / frame_rate)
+    plt.show()
+
+
+def render_headless_distributions(snapshots, length_x, ticks_per_second, frame_rate, output_path, frames_format):
+    """Writes the distribution plot to an animation file or to one image per frame, rendering the snapshots received
+    through the queue at most frame_rate times per second. It does not need any graphical interface.
+
+    :param snapshots: queue, holding tuples of tick and distribution, and None once the simulation finishes.
+    :param length_x: float, holding the length of the x axis.
+    :param ticks_per_second: integer, holding the number of ticks per second.
+    :param frame_rate: float, holding the maximum number of frames per second.
+    :param output_path: string, holding the path of the output without extension.
+    :param frames_format: string, gif to write an animation or png to write one image per frame.
+    """
+    from matplotlib.animation import PillowWriter
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    set_plot_style()
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    prepare_axes(axes, length_x, SECONDS, DISTRIBUTION)
+    renderer = DistributionRenderer(axes, ticks_per_second)
+    if frames_format == GIF:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        writer = PillowWriter(fps=frame_rate)
+        writer.setup(figure, "{}.{}".format(output_path, GIF))
     else:
-        filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise.csv" \
-                   .format(revision_protocol,
-                           number_of_channels,
-                           number_of_simulations,
-                           update_strategies_mode,
-                           number_of_agents,
-                           noise)
-        pd_runs.to_csv(path.join(workspace.root, OUTPUTS, filename),
-                       header=True if run_number == 0 else False,
-                       mode=W if run_number == 0 else A,
-                       sep="|",
-                       index=False)
-
-
-def write_result_to_csv(number_of_game_rounds, distributions, number_of_simulations, revision_protocol,
-                        update_strategies_mode, number_of_agents, number_of_channels, noise, use_network_structure,
-                        probability_of_edge, network_algorithm, probability_of_rewiring, nearest_neighbors):
+        os.makedirs(output_path, exist_ok=True)
+        writer = None
+    number_of_frames = 0
+    finished = False
+    while not finished:
+        last_frame_time = time.time()
+        finished = receive_snapshots(snapshots, renderer, 1 / frame_rate)
+        if renderer.draw():
+            if writer is not None:
+                writer.grab_frame()
+            else:
+                figure.savefig(os.path.join(output_path, FRAME_FILE.format(number_of_frames)))
+            number_of_frames += 1
+        time.sleep(max(0., 1 / frame_rate - (time.time() - last_frame_time)))
+    if writer is not None:
+        writer.finish()
+
+
+def receive_snapshots(snapshots, renderer, timeout):
+    """Hands every snapshot waiting in the queue to the renderer, waiting for the first one up to the given time.
+
+    :param snapshots: queue, holding tuples of tick and distribution, and None once the simulation finishes.
+    :param renderer: DistributionRenderer instance.
+    :param timeout: float, holding the number of seconds to wait for the first snapshot.
+    :return: True if the simulation finished and False otherwise.
     """
+    try:
+        snapshot = snapshots.get(timeout=timeout)
+        while True:
+            if snapshot is None:
+                return True
+            renderer.add(*snapshot)
+            snapshot = snapshots.get_nowait()
+    except queue.Empty:
+        return False
+
 
-    :param number_of_game_rounds:
-    :param distributions:
-    :param number_of_simulations:
-    :param revision_protocol:
-    :param update_strategies_mode:
-    :param number_of_agents:
-    :param number_of_channels:
-    :param noise:
-    :param use_network_structure:
-    :param probability_of_edge:
-    :param network_algorithm:
-    :param probability_of_rewiring:
-    :return:
+class DistributionPlotter(object):
+    """Plots the evolution of the distribution of strategies apart from the simulation: the snapshots are sent through
+    an unbounded queue to a renderer running in another process, so the simulation never waits for the drawing. The
+    pool workers cannot start processes, so within them the renderer runs headless in a thread.
     """
-    workspace = Workspace()
-    run_numbers = [[run_number for game_round in range(number_of_game_rounds + 1)]
-                   for run_number in range(number_of_simulations)]
-    step = [list(range(number_of_game_rounds + 1)) for run_number in range(number_of_simulations)]
-
-    print(np.array(run_numbers).shape)
-    print(np.array(step).shape)
-    print(np.array(distributions).shape)
-    pd_runs = pd.DataFrame({RUN_NUMBER: np.array(run_numbers).reshape(1, -1)[0],
-                            STEP: np.array(step).reshape(1, -1)[0],
-                            STRATEGY_RATIO: np.array(distributions).reshape(1, -1)[0]})
-    if use_network_structure:
-        if network_algorithm == "sw":
-            filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise_{}_rewiring_{}_net_alg_{}_neighbors.csv" \
-                .format(revision_protocol,
-                        number_of_channels,
-                        number_of_simulations,
-                        update_strategies_mode,
-                        number_of_agents,
-                        noise,
-                        probability_of_rewiring,
-                        network_algorithm,
-                        nearest_neighbors)
+
+    def __init__(self, length_x, ticks_per_second, frame_rate, headless, output_path, frames_format=GIF):
+        """DistributionPlotter initialization.
+
+        :param length_x: float, holding the length of the x axis.
+        :param ticks_per_second: integer, holding the number of ticks per second.
+        :param frame_rate: float, holding the maximum number of frames per second.
+        :param headless: bool, true if the plot must be written instead of shown.
+        :param output_path: string, holding the path of the written output without extension.
+        :param frames_format: string, gif to write an animation or png to write one image per frame.
+        """
+        self.headless = headless or multiprocessing.current_process().daemon
+        if multiprocessing.current_process().daemon:
+            self.snapshots = queue.Queue()
+            worker_type = threading.Thread
         else:
-            filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise_{}_rewiring_{}_net_alg_{}_prob_edge.csv" \
-                       .format(revision_protocol,
-                               number_of_channels,
-                               number_of_simulations,
-                               update_strategies_mode,
-                               number_of_agents,
-                               noise,
-                               probability_of_rewiring,
-                               network_algorithm,
-                               probability_of_edge)
-    else:
-        filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise.csv"\
-            .format(revision_protocol,
-                    number_of_channels,
-                    number_of_simulations,
-                    update_strategies_mode,
-                    number_of_agents,
-                    noise)
-    pd_runs.to_csv(path.join(workspace.root, OUTPUTS, filename),
-                   header=True,
-                   sep="|",
-                   index=False)
+            self.snapshots = multiprocessing.Queue()
+            worker_type = multiprocessing.Process
+        if self.headless:
+            target = render_headless_distributions
+            args = (self.snapshots, length_x, ticks_per_second, frame_rate, output_path, frames_format)
+        else:
+            target = render_live_distributions
+            args = (self.snapshots, length_x, ticks_per_second, frame_rate)
+        self.renderer = worker_type(target=target, args=args)
+        self.renderer.start()
+
+    def update(self, tick, distribution):
+        """Sends one snapshot of the distribution of strategies to the renderer.
+
+        :param tick: integer, holding the tick of the snapshot.
+        :param distribution: numpy array, holding the share of agents following each strategy.
+        """
+        self.snapshots.put((tick, distribution))
+
+    def close(self):
+        """Tells the renderer that the simulation finished. It waits for the headless renderer to write its output,
+        while the window of the live one stays open.
+        """
+        self.snapshots.put(None)
+        if self.headless:
+            self.renderer.join()
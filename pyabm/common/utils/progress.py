@@ -0,0 +1,45 @@
+import sys
+import time
+
+
+class ProgressReporter(object):
+    """Reports the progress of a batch of simulations along with the estimated time left."""
+
+    def __init__(self, total, description, stream=None):
+        """ProgressReporter initialization.
+
+        :param total: integer, holding the number of tasks of the batch.
+        :param description: string, holding the name of the tasks.
+        :param stream: file object where the progress is written, the standard error by default.
+        """
+        self.total = total
+        self.description = description
+        self.stream = stream or sys.stderr
+        self.done = 0
+        self.start_time = time.time()
+
+    @staticmethod
+    def __format_seconds(seconds):
+        """Returns the given number of seconds as h:mm:ss.
+
+        :param seconds: float, holding the number of seconds.
+        :return: string, holding the formatted time.
+        """
+        minutes, seconds = divmod(int(round(seconds)), 60)
+        hours, minutes = divmod(minutes, 60)
+        return "{}:{:02d}:{:02d}".format(hours, minutes, seconds)
+
+    def update(self, n=1):
+        """Records that n more tasks have finished and refreshes the progress line.
+
+        :param n: integer, holding the number of finished tasks.
+        """
+        self.done += n
+        elapsed = time.time() - self.start_time
+        eta = elapsed / self.done * (self.total - self.done) if self.done else 0
+        self.stream.write("\r{}: {}/{} ({:.0%}) elapsed {} ETA {}".format(
+            self.description, self.done, self.total, self.done / self.total if self.total else 1,
+            self.__format_seconds(elapsed), self.__format_seconds(eta)))
+        if self.done >= self.total:
+            self.stream.write("\n")
+        self.stream.flush()
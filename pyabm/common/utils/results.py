@@ -0,0 +1,181 @@
+import json
+import zipfile
+import numpy as np
+
+from importlib.util import find_spec
+from os import path
+
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+
+
+def get_results_filename(conf):
+    """Returns the name, without extension, of the files holding the results of a batch of simulations.
+
+    :param conf: configuration of the simulations.
+    :return: string, holding the file name.
+    """
+    filename = "python_{}_{}_strategies_{}_runs_{}_{}_agents_{}_noise".format(conf.get_revision_protocol(),
+                                                                               conf.get_number_of_channels(),
+                                                                               conf.get_number_of_simulations(),
+                                                                               conf.get_update_strategies_mode(),
+                                                                               conf.get_number_of_agents(),
+                                                                               conf.get_noise())
+    if conf.get_use_population_network():
+        if conf.get_random_network_algorithm() == SMALL_WORLD:
+            filename += "_{}_rewiring_{}_net_alg_{}_neighbors".format(conf.get_probability_of_rewiring(),
+                                                                      conf.get_random_network_algorithm(),
+                                                                      conf.get_nearest_neighbors())
+        else:
+            filename += "_{}_rewiring_{}_net_alg_{}_prob_edge".format(conf.get_probability_of_rewiring(),
+                                                                      conf.get_random_network_algorithm(),
+                                                                      conf.get_probability_of_edge())
+    return filename
+
+
+class ResultSink(object):
+    """Base class of the writers which store the trajectory of each simulation as soon as it finishes, so the results
+    of a batch never need to be held in memory. A trajectory is the list of distributions of strategies, as shares of
+    the population, logged along the simulation.
+    """
+
+    extension = None
+
+    def __init__(self, outputs_path, filename, conf):
+        """ResultSink initialization.
+
+        :param outputs_path: string, holding the directory where the results are written.
+        :param filename: string, holding the name of the file without extension.
+        :param conf: configuration of the simulations.
+        """
+        self.path = path.join(outputs_path, filename + self.extension)
+        self.conf = conf
+
+    def write(self, run_number, trajectory):
+        """Appends the trajectory of one simulation.
+
+        :param run_number: integer, holding the number of the simulation.
+        :param trajectory: list or numpy array, holding the distribution of strategies at each logged step.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Flushes and closes the underlying file."""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class ParquetResultSink(ResultSink):
+    """Writes the trajectories into a Parquet file, one row group per simulation, with the columns run_number, step
+    and one column with the share of each strategy.
+    """
+
+    extension = ".parquet"
+
+    def __init__(self, outputs_path, filename, conf):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        super(ParquetResultSink, self).__init__(outputs_path, filename, conf)
+        num_of_channels = conf.get_number_of_channels()
+        self.schema = pa.schema(
+            [pa.field(RUN_NUMBER, pa.int32()), pa.field(STEP, pa.int32())] +
+            [pa.field(STRATEGY_COLUMN.format(s), pa.float64()) for s in range(num_of_channels)],
+            metadata={CONFIGURATION: json.dumps(conf.conf)})
+        self.writer = pq.ParquetWriter(self.path, self.schema)
+
+    def write(self, run_number, trajectory):
+        import pyarrow as pa
+
+        trajectory = np.asarray(trajectory, dtype=float)
+        columns = [pa.array(np.full(len(trajectory), run_number, dtype=np.int32)),
+                   pa.array(np.arange(len(trajectory), dtype=np.int32))]
+        columns += [pa.array(trajectory[:, s]) for s in range(trajectory.shape[1])]
+        self.writer.write_table(pa.Table.from_arrays(columns, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+class NpzResultSink(ResultSink):
+    """Writes the trajectories into a numpy .npz archive, one array of shape (steps, channels) per simulation. The
+    archive is reopened in append mode for each simulation, so it stays readable if the batch is interrupted, and
+    numpy.load reads the simulations lazily.
+    """
+
+    extension = ".npz"
+
+    def __init__(self, outputs_path, filename, conf):
+        super(NpzResultSink, self).__init__(outputs_path, filename, conf)
+        with zipfile.ZipFile(self.path, mode=W) as archive:
+            archive.writestr(CONFIGURATION + ".json", json.dumps(conf.conf))
+
+    def write(self, run_number, trajectory):
+        with zipfile.ZipFile(self.path, mode=A) as archive:
+            with archive.open(NPZ_RUN_ENTRY.format(run_number), mode=W) as entry:
+                np.lib.format.write_array(entry, np.asarray(trajectory, dtype=float))
+
+
+class CsvResultSink(ResultSink):
+    """Writes the share of the last strategy along each simulation into a pipe-delimited CSV file, with the columns
+    run_number, step and strategy_ratio.
+    """
+
+    extension = ".csv"
+
+    def __init__(self, outputs_path, filename, conf):
+        super(CsvResultSink, self).__init__(outputs_path, filename, conf)
+        self.header = True
+
+    def write(self, run_number, trajectory):
+        import pandas as pd
+
+        strategy_ratio = np.asarray(trajectory, dtype=float)[:, -1]
+        pd_runs = pd.DataFrame({RUN_NUMBER: run_number,
+                                STEP: list(range(len(strategy_ratio))),
+                                STRATEGY_RATIO: strategy_ratio})
+        pd_runs.to_csv(self.path, header=self.header, mode=W if self.header else A, sep="|", index=False)
+        self.header = False
+
+
+class MultipleResultSink(ResultSink):
+    """Forwards each trajectory to several sinks."""
+
+    def __init__(self, sinks):
+        self.sinks = sinks
+
+    def write(self, run_number, trajectory):
+        for sink in self.sinks:
+            sink.write(run_number, trajectory)
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+
+def get_result_sink(outputs_path, conf, filename=None):
+    """Returns the sink which stores the results of a batch of simulations following the configuration: the columnar
+    one, Parquet if pyarrow is available or npz otherwise, plus the CSV exporter if it is required.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :param filename: string, holding the name of the files without extension. By default, it is built from the
+        configuration.
+    :return: ResultSink instance.
+    """
+    filename = filename or get_results_filename(conf)
+    results_format = conf.get_results_format()
+    if results_format == AUTO:
+        results_format = PARQUET if find_spec("pyarrow") is not None else NPZ
+    if results_format == PARQUET and find_spec("pyarrow") is None:
+        raise PyABMException(MISSING_OPTIONAL_DEPENDENCY.format("pyarrow", PARQUET))
+    sinks = [ParquetResultSink(outputs_path, filename, conf) if results_format == PARQUET
+             else NpzResultSink(outputs_path, filename, conf)]
+    if conf.get_write_results_to_csv():
+        sinks.append(CsvResultSink(outputs_path, filename, conf))
+    return MultipleResultSink(sinks)
@@ -0,0 +1,68 @@
+import numpy as np
+
+from pyabm.common.constants import NETWORK_STREAM
+
+
+def get_simulation_seed_sequence(seed=None, run_number=0, point_number=None):
+    """Returns the seed sequence of one simulation, spawned from the seed of the batch.
+
+    :param seed: integer, holding the seed of the batch of simulations, or None.
+    :param run_number: integer, holding the number of the simulation within the batch.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None outside of sweeps.
+    :return: numpy SeedSequence.
+    """
+    seed_sequence = np.random.SeedSequence(seed)
+    if point_number is not None:
+        seed_sequence = get_child_seed_sequence(seed_sequence, point_number)
+    return get_child_seed_sequence(seed_sequence, run_number)
+
+
+def get_child_seed_sequence(seed_sequence, child_number):
+    """Returns the given child of a seed sequence, the same one that spawn would return at that position, without
+    spawning the children before it.
+
+    :param seed_sequence: numpy SeedSequence.
+    :param child_number: integer, holding the position of the child.
+    :return: numpy SeedSequence.
+    """
+    return np.random.SeedSequence(seed_sequence.entropy, spawn_key=seed_sequence.spawn_key + (child_number,),
+                                  pool_size=seed_sequence.pool_size)
+
+
+def get_simulation_rng(seed=None, run_number=0, point_number=None):
+    """Returns the random generator of one simulation. The generators of the different simulations are backed by
+    independent streams spawned from the same seed sequence, so a batch of simulations is reproducible given the seed
+    and does not depend on the worker which runs each of them. Without seed, fresh entropy is taken from the OS.
+
+    :param seed: integer, holding the seed of the batch of simulations, or None.
+    :param run_number: integer, holding the number of the simulation within the batch.
+    :param point_number: integer, holding the number of the point of a parameter sweep, whose batch gets its own
+        stream, or None outside of sweeps.
+    :return: numpy random Generator.
+    """
+    return np.random.default_rng(get_simulation_seed_sequence(seed, run_number, point_number))
+
+
+def get_ensemble_rng(seed=None, first_run_number=0, point_number=None):
+    """Returns the random generator shared by the revisions of an ensemble of simulations. Its stream is the first
+    child of the stream of the first simulation of the ensemble, so it is independent of the streams which set up the
+    initial state of each simulation.
+
+    :param seed: integer, holding the seed of the batch of simulations, or None.
+    :param first_run_number: integer, holding the number of the first simulation of the ensemble.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None outside of sweeps.
+    :return: numpy random Generator.
+    """
+    return np.random.default_rng(get_simulation_seed_sequence(seed, first_run_number, point_number).spawn(1)[0])
+
+
+def get_network_rng(seed=None):
+    """Returns the random generator of the fixed network shared by every simulation of a batch or a sweep. Its seed
+    sequence is the root of its own tree, whose entropy is the seed followed by NETWORK_STREAM, while the streams of
+    the simulations, the points and the ensembles are all spawned from the tree of the seed alone. So no run, point or
+    ensemble number can reach the stream of the network, which is independent of all of them.
+
+    :param seed: integer, holding the seed of the batch of simulations, or None.
+    :return: numpy random Generator.
+    """
+    return np.random.default_rng(np.random.SeedSequence(None if seed is None else [seed, NETWORK_STREAM]))
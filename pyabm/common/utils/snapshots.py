@@ -0,0 +1,157 @@
+import json
+import os
+import numpy as np
+
+from os import path
+
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+from pyabm.common.utils.results import get_results_filename
+
+
+def get_snapshot_path(outputs_path, conf, run_number=0, point_number=None):
+    """Returns the path of the file holding the snapshots of the strategies of a simulation. Its JSON header is kept
+    next to it, with the same name.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulations.
+    :param run_number: integer, holding the number of the simulation.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    :return: string, holding the path.
+    """
+    filename = get_results_filename(conf)
+    if point_number is not None:
+        filename += POINT_SUFFIX.format(point_number)
+    filename += RUN_SUFFIX.format(run_number)
+    return path.join(outputs_path, SNAPSHOTS, filename + ".npy")
+
+
+def get_header_path(snapshot_path):
+    """Returns the path of the JSON header of a file of snapshots.
+
+    :param snapshot_path: string, holding the path of the file of snapshots.
+    :return: string, holding the path of the header.
+    """
+    return path.splitext(snapshot_path)[0] + ".json"
+
+
+def load_snapshots(snapshot_path):
+    """Opens a file of snapshots for its analysis. The snapshots are mapped read-only from the disk, so rows and columns
+    are read lazily when they are accessed, and nothing is copied into memory until then.
+
+    :param snapshot_path: string, holding the path of the file of snapshots.
+    :return:
+        - numpy memmap of shape (snapshots, agents), holding the strategy of every agent at each snapshot: the row i
+          is the tick header["ticks"][i] and the column j is the agent j, which is the node j of the network.
+        - dictionary, holding the header: shape, dtype, snapshot interval, ticks, stopping tick, number of the
+          simulation and of the point of the sweep, and configuration of the simulation.
+    """
+    with open(get_header_path(snapshot_path), R) as header_file:
+        header = json.load(header_file)
+    return np.load(snapshot_path, mmap_mode=R), header
+
+
+def get_snapshot_writer(outputs_path, conf, run_number=0, point_number=None):
+    """Returns the writer of the snapshots of a simulation, or None if its configuration does not require them.
+
+    :param outputs_path: string, holding the directory where the results are written.
+    :param conf: configuration of the simulation.
+    :param run_number: integer, holding the number of the simulation.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    :return: SnapshotWriter instance, or None.
+    """
+    snapshot_interval = conf.get_snapshot_interval()
+    if not snapshot_interval:
+        return None
+    simulation_engine = conf.get_simulation_engine()
+    if simulation_engine in [MEAN_FIELD, MEAN_DYNAMICS]:
+        raise PyABMException(SNAPSHOTS_REQUIRE_AGENT_STATE.format(simulation_engine))
+    return SnapshotWriter(get_snapshot_path(outputs_path, conf, run_number, point_number), snapshot_interval,
+                          conf.get_number_of_game_rounds(), conf.get_number_of_agents(),
+                          conf.get_number_of_channels(),
+                          {RUN_NUMBER_KEY: run_number, POINT_NUMBER_KEY: point_number, CONFIGURATION: conf.conf})
+
+
+class SnapshotWriter(object):
+    """Records the strategy of every agent every snapshot_interval ticks into a .npy file of shape (snapshots, agents).
+    The file is preallocated when the simulation starts and written through a memory map, so the snapshots are paged
+    out to the disk instead of piling up in memory. A JSON header next to it describes the file and the simulation.
+    """
+
+    def __init__(self, snapshot_path, snapshot_interval, game_rounds, n_of_agents, num_of_channels, header):
+        """SnapshotWriter initialization, which creates the file of snapshots and its header.
+
+        :param snapshot_path: string, holding the path of the file of snapshots.
+        :param snapshot_interval: integer, holding the number of ticks between two snapshots.
+        :param game_rounds: integer, holding the number of ticks of the simulation.
+        :param n_of_agents: integer, holding the number of agents in the population.
+        :param num_of_channels: integer, holding the number of strategies.
+        :param header: dictionary, holding the description of the simulation which is added to the header.
+        """
+        self.path = snapshot_path
+        self.snapshot_interval = snapshot_interval
+        ticks = list(range(0, game_rounds + 1, snapshot_interval))
+        dtype = np.min_scalar_type(num_of_channels - 1)
+        self.header = {SHAPE: [len(ticks), n_of_agents], DTYPE: dtype.str, SNAPSHOT_INTERVAL: snapshot_interval,
+                       TICKS: ticks, STOPPING_TICK: None, **header}
+        os.makedirs(path.dirname(snapshot_path), exist_ok=True)
+        self.snapshots = np.lib.format.open_memmap(snapshot_path, mode="w+", dtype=dtype,
+                                                   shape=(len(ticks), n_of_agents))
+        self.__write_header()
+
+    def __getstate__(self):
+        """Returns the state of the writer saved by a checkpoint, without the memory map of the file, which is opened
+        again when the simulation is resumed.
+
+        :return: dictionary, holding the attributes of the writer.
+        """
+        state = self.__dict__.copy()
+        state["snapshots"] = None
+        return state
+
+    def __get_snapshots(self):
+        """Returns the memory map of the file of snapshots, opening it if it is not open.
+
+        :return: numpy memmap, holding the snapshots.
+        """
+        if self.snapshots is None:
+            self.snapshots = np.lib.format.open_memmap(self.path, mode="r+")
+        return self.snapshots
+
+    def __write_header(self):
+        """Writes the header of the file of snapshots."""
+        with open(get_header_path(self.path), W) as header_file:
+            json.dump(self.header, header_file, indent=2)
+
+    def is_due(self, tick):
+        """Checks whether a snapshot must be recorded at the given tick.
+
+        :param tick: integer, holding the current tick of the game.
+        :return: True if the snapshot is due and False otherwise.
+        """
+        return tick % self.snapshot_interval == 0
+
+    def record(self, tick, strategies):
+        """Records the strategy of every agent at the given tick.
+
+        :param tick: integer, holding the current tick of the game, which must be a multiple of the interval.
+        :param strategies: numpy array, holding the strategy of every agent.
+        """
+        self.__get_snapshots()[tick // self.snapshot_interval] = strategies
+
+    def fill(self, stopping_tick, strategies):
+        """Records the strategies of a simulation stopped by a stopping rule as the snapshots of the rest of the ticks,
+        as its trajectory does.
+
+        :param stopping_tick: integer, holding the tick at which the simulation stopped.
+        :param strategies: numpy array, holding the strategy of every agent.
+        """
+        self.__get_snapshots()[stopping_tick // self.snapshot_interval + 1:] = strategies
+        self.header[STOPPING_TICK] = stopping_tick
+
+    def close(self):
+        """Flushes the snapshots to the disk, releases the memory map and writes the final header."""
+        if self.snapshots is not None:
+            self.snapshots.flush()
+            self.snapshots = None
+        self.__write_header()
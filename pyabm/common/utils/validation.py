@@ -0,0 +1,15 @@
+from pyabm.common.constants import *
+from pyabm.common.exceptions import PyABMException
+
+
+def check_initial_condition(initial_distribution_of_strategies, n_of_agents, num_of_channels):
+    """Checks whether the initial condition matches the number of players and channels.
+
+    :param initial_distribution_of_strategies: list, holding the initial distribution of players with each strategy.
+    :param n_of_agents: integer, holding the number of agents in the population.
+    :param num_of_channels: integer, holding the number of strategies.
+    """
+    if sum(initial_distribution_of_strategies) != n_of_agents:
+        raise PyABMException(INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_PLAYERS)
+    if len(initial_distribution_of_strategies) != num_of_channels:
+        raise PyABMException(INITIAL_CONDITION_DO_NOT_MATCH_THE_NUMBER_OF_CHANNELS)
@@ -1,18 +1,22 @@
 import os
 
 from pyabm.common.conf import Conf
-from pyabm.common.constants import WORKSPACE, OUTPUTS
+from pyabm.common.constants import WORKSPACE, OUTPUTS, RESOURCES, CONF, PYABM_JSON
 from pyabm.common.singleton import Singleton
 
 
 class Workspace(metaclass=Singleton):
 
-    def __init__(self):
-        """Workspace."""
+    def __init__(self, conf=None):
+        """Workspace.
+
+        :param conf: configuration already parsed, if the configuration file must not be read.
+        """
         self.root = WORKSPACE
         if not os.path.exists(self.root):
             os.mkdir(self.root)
         if not os.path.exists(os.path.join(self.root, OUTPUTS)):
             os.mkdir(os.path.join(self.root, OUTPUTS))
-        self.pyabm_conf_path = os.path.join("resources", "conf", "pyabm.json")
-        self.conf = Conf(self.pyabm_conf_path)
+        self.pyabm_conf_path = os.path.join(RESOURCES, CONF, PYABM_JSON)
+        self.conf = conf if conf is not None else Conf(self.pyabm_conf_path)
+        self.fixed_networks = {}
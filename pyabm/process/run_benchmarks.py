@@ -0,0 +1,155 @@
+import json
+import time
+
+from os import path
+
+from pyabm.common.base.game import AgentGame
+from pyabm.common.constants import *
+from pyabm.common.utils.rng import get_simulation_rng
+from pyabm.common.workspace import Workspace
+
+BASE_CASE = {SIMULATION_ENGINE: ARRAY, NUMBER_OF_AGENTS: 1000, NUMBER_OF_CHANNELS: 5, NUMBER_OF_TRIALS: 1,
+             UPDATE_STRATEGIES_MODE: ASYNCHRONOUS_RANDOM_INDEPENDENT, NETWORK_ALGORITHM: None}
+AXES = {SIMULATION_ENGINE: [AGENTS, ARRAY, COMPILED, PARALLEL, MEAN_FIELD, MEAN_DYNAMICS],
+        NUMBER_OF_AGENTS: [100, 1000, 10000],
+        NUMBER_OF_CHANNELS: [2, 5, 10],
+        NUMBER_OF_TRIALS: [1, 2, 4],
+        UPDATE_STRATEGIES_MODE: [ASYNCHRONOUS_RANDOM_INDEPENDENT, ALL_IN_ONE_TICK],
+        NETWORK_ALGORITHM: [None, SMALL_WORLD, BARABASI_ALBERT]}
+FIXED_PARAMETERS = {INITIAL_DISTRIBUTION_OF_STRATEGIES: [], MATRIX_PAYOFFS: [], TICKS_PER_SECOND: 1, NOISE: 0.,
+                    SHOW_PLOT_DISTRIBUTION: OFF, NEAREST_NEIGHBORS: 4, PROBABILITY_OF_REWIRING: 0.1,
+                    CHECKPOINT_INTERVAL: 0, STOP_AT_ABSORBING_STATE: False, CONVERGENCE_TOLERANCE: 0}
+
+
+def is_feasible_case(case):
+    """Checks whether the engine of a benchmark case can run on its population: the mean engines require a well-mixed
+    population, while the parallel one requires a network.
+
+    :param case: dictionary, holding the parameters of the case.
+    :return: True if the case can be run and False otherwise.
+    """
+    if case[SIMULATION_ENGINE] in [MEAN_FIELD, MEAN_DYNAMICS]:
+        return case[NETWORK_ALGORITHM] is None
+    if case[SIMULATION_ENGINE] == PARALLEL:
+        return case[NETWORK_ALGORITHM] is not None
+    return True
+
+
+def get_benchmark_cases(suite):
+    """Returns the cases of the benchmark suite. The quick suite moves one axis at a time away from the base case, and
+    runs the parallel engine on every network algorithm since it cannot run on the well-mixed base case, while the
+    full one takes every combination of the axes.
+
+    :param suite: string, quick or full.
+    :return: list, holding the parameters of each case.
+    """
+    if suite == FULL:
+        cases = [{}]
+        for name, values in AXES.items():
+            cases = [dict(case, **{name: value}) for case in cases for value in values]
+    else:
+        cases = [dict(BASE_CASE)]
+        for name, values in AXES.items():
+            cases += [dict(BASE_CASE, **{name: value}) for value in values if value != BASE_CASE[name]]
+        cases += [dict(BASE_CASE, **{SIMULATION_ENGINE: PARALLEL, NETWORK_ALGORITHM: network_algorithm})
+                  for network_algorithm in AXES[NETWORK_ALGORITHM] if network_algorithm is not None]
+    return [case for case in cases if is_feasible_case(case)]
+
+
+def get_case_id(case):
+    """Returns the identifier of a benchmark case, which keys it within the baseline.
+
+    :param case: dictionary, holding the parameters of the case.
+    :return: string, holding the identifier.
+    """
+    return ",".join("{}={}".format(name, case[name]) for name in AXES)
+
+
+def get_case_conf(conf, case, number_of_ticks):
+    """Returns the configuration of a benchmark case.
+
+    :param conf: base configuration.
+    :param case: dictionary, holding the parameters of the case.
+    :param number_of_ticks: integer, holding the number of ticks of the simulation.
+    :return: Conf instance.
+    """
+    parameters = dict(FIXED_PARAMETERS, **case)
+    parameters[USE_NETWORK_STRUCTURE] = case[NETWORK_ALGORITHM] is not None
+    parameters[NETWORK_ALGORITHM] = case[NETWORK_ALGORITHM] or SMALL_WORLD
+    parameters[NUMBER_OF_GAME_ROUNDS] = number_of_ticks
+    return conf.with_parameters(parameters)
+
+
+def time_case(conf, repeat):
+    """Times run_population_game, keeping the best of the given number of repetitions. The population is built before
+    the clock starts, so only the ticks are timed, and the compiled loop is compiled beforehand.
+
+    :param conf: configuration of the case.
+    :param repeat: integer, holding the number of repetitions.
+    :return: float, holding the best time in seconds.
+    """
+    if conf.get_simulation_engine() == COMPILED:
+        AgentGame(get_simulation_rng(0), conf).let_players_update_strategies()
+    best_time = float("inf")
+    for run_number in range(repeat):
+        game = AgentGame(get_simulation_rng(0, run_number), conf)
+        start_time = time.perf_counter()
+        game.run_population_game()
+        best_time = min(best_time, time.perf_counter() - start_time)
+    return best_time
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Returns the cases whose agent revisions per second dropped more than the tolerance below the baseline.
+
+    :param results: dictionary, holding the metrics of each case.
+    :param baseline: dictionary, holding the metrics of each case in the baseline.
+    :param tolerance: float, holding the allowed relative slowdown.
+    :return: list, holding the identifiers of the regressed cases.
+    """
+    return [case_id for case_id, metrics in results.items()
+            if case_id in baseline
+            and metrics[REVISIONS_PER_SECOND] < (1 - tolerance) * baseline[case_id][REVISIONS_PER_SECOND]]
+
+
+def run_benchmarks(suite=QUICK, number_of_ticks=20, repeat=3, baseline_path=None, save_baseline=False,
+                   tolerance=0.2):
+    """Times run_population_game across engines, numbers of agents, channels and trials, update modes and network
+    algorithms, reporting ticks per second and agent revisions per second of each case. The results are compared with
+    the stored baseline, flagging the cases which got slower than the tolerance allows, or stored as the new baseline.
+
+    :param suite: string, quick to move one axis at a time away from the base case or full for every combination.
+    :param number_of_ticks: integer, holding the number of ticks of each simulation.
+    :param repeat: integer, holding the number of times each case is run, keeping the best time.
+    :param baseline_path: string, holding the path of the baseline file. By default, it is kept in workspace/outputs.
+    :param save_baseline: bool, true if the results must be stored as the new baseline.
+    :param tolerance: float, holding the allowed relative slowdown with respect to the baseline.
+    :return: list, holding the identifiers of the regressed cases.
+    """
+    workspace = Workspace()
+    baseline_path = baseline_path or path.join(workspace.root, OUTPUTS, BENCHMARK_BASELINE)
+    results = {}
+    for case in get_benchmark_cases(suite):
+        conf = get_case_conf(workspace.conf, case, number_of_ticks)
+        elapsed_time = time_case(conf, repeat)
+        results[get_case_id(case)] = {SECONDS_KEY: elapsed_time,
+                                      TICKS_PER_SECOND_KEY: number_of_ticks / elapsed_time,
+                                      REVISIONS_PER_SECOND: number_of_ticks * case[NUMBER_OF_AGENTS] / elapsed_time}
+        print("{}: {:.1f} ticks/s, {:.0f} agent revisions/s".format(
+            get_case_id(case), results[get_case_id(case)][TICKS_PER_SECOND_KEY],
+            results[get_case_id(case)][REVISIONS_PER_SECOND]))
+
+    regressions = []
+    if save_baseline:
+        with open(baseline_path, W) as baseline_file:
+            json.dump(results, baseline_file, indent=2)
+        print("The baseline was saved to {}".format(baseline_path))
+    elif path.exists(baseline_path):
+        with open(baseline_path) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare_with_baseline(results, baseline, tolerance)
+        for case_id in regressions:
+            print("REGRESSION {}: {:.0f} agent revisions/s against {:.0f} in the baseline".format(
+                case_id, results[case_id][REVISIONS_PER_SECOND], baseline[case_id][REVISIONS_PER_SECOND]))
+        print("{} regressions out of {} cases.".format(len(regressions), len(results)))
+    return regressions
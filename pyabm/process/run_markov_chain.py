@@ -0,0 +1,51 @@
+import time
+import numpy as np
+
+from os import path
+
+from pyabm.common.base.markov_chain import BEPMarkovChain
+from pyabm.common.constants import *
+from pyabm.common.utils.plot import plot_mean_distribution
+from pyabm.common.utils.results import get_results_filename
+from pyabm.common.workspace import Workspace
+
+
+def solve_markov_chain(show_plot=True):
+    """Solves exactly the population game as a Markov chain over the vectors of numbers of agents following each
+    strategy, instead of averaging a batch of simulations. It computes the probability of each state at each logged
+    tick, the probability of ending up in each closed class of the chain and the stationary distribution within each
+    of them, which are written to workspace/outputs along with the states.
+
+    :param show_plot: bool, true if the evolution of the expected distribution must be shown once it is solved.
+    :return: numpy array, holding the expected share of agents following each strategy at each logged tick.
+    """
+    start_time = time.time()
+    workspace = Workspace()
+    chain = BEPMarkovChain(workspace.conf)
+    initial_distribution = chain.get_initial_distribution()
+    state_distributions = chain.get_transient_distributions(initial_distribution,
+                                                            workspace.conf.get_number_of_game_rounds(),
+                                                            workspace.conf.get_number_of_ticks_per_second())
+    mean_distributions = chain.get_mean_distributions(state_distributions)
+    closed_classes = chain.get_closed_classes()
+    absorption_probabilities = chain.get_absorption_probabilities(initial_distribution, closed_classes)
+    class_labels = np.full(len(chain.states), -1)
+    stationary_distribution = np.zeros(len(chain.states))
+    for label, (closed_class, probability) in enumerate(zip(closed_classes, absorption_probabilities)):
+        class_stationary_distribution = chain.get_stationary_distribution(closed_class)
+        class_labels[closed_class] = label
+        stationary_distribution[closed_class] = probability * class_stationary_distribution
+        print("Closed class of {} states with mean distribution {}, reached with probability {}".format(
+            len(closed_class), class_stationary_distribution @ chain.states[closed_class] / chain.n_of_agents,
+            probability))
+
+    np.savez(path.join(workspace.root, OUTPUTS, get_results_filename(workspace.conf) + MARKOV_CHAIN_SUFFIX),
+             **{STATES: chain.states, STATE_DISTRIBUTIONS: state_distributions, MEAN_DISTRIBUTIONS: mean_distributions,
+                CLOSED_CLASSES: class_labels, ABSORPTION_PROBABILITIES: absorption_probabilities,
+                STATIONARY_DISTRIBUTION: stationary_distribution})
+    print("The expected final distribution is: {}".format(mean_distributions[-1]))
+    print("The long run distribution is: {}".format(chain.get_mean_distributions(stationary_distribution)))
+    print("--- %s seconds ---" % (time.time() - start_time))
+    if show_plot:
+        plot_mean_distribution(mean_distributions)
+    return mean_distributions
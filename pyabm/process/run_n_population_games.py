@@ -1,57 +1,142 @@
 import multiprocessing
 import numpy as np
-import matplotlib.pyplot as plt
 import time
 
+from functools import partial
+from os import path
+
+from pyabm.common.constants import OUTPUTS, SIMULATIONS, IO
+from pyabm.common.base.shared_network import attach_fixed_networks, share_fixed_networks
 from pyabm.common.workspace import Workspace
-from pyabm.process.run_population_game import play_population_game
-from pyabm.common.utils.plot import write_partial_results_to_csv, write_result_to_csv
+from pyabm.process.run_population_game import play_numbered_population_games
+from pyabm.common.utils.cache import get_result_cache
+from pyabm.common.utils.checkpoint import get_checkpoint
+from pyabm.common.utils.instrumentation import (Instrumentation, clear_instrumentation_summaries,
+                                                get_instrumentation_path)
+from pyabm.common.utils.plot import plot_mean_distribution
+from pyabm.common.utils.progress import ProgressReporter
+from pyabm.common.utils.results import get_result_sink, get_results_filename
+
+
+def initialize_worker(conf, network_handles=None):
+    """Initializes each worker of the pool with the configuration parsed by the parent process, so the workers never
+    read the configuration file, and attaches it to the fixed networks shared by the parent.
+
+    :param conf: configuration of the simulations.
+    :param network_handles: dictionary, holding the handles of the arrays of each fixed network, or None.
+    """
+    Workspace(conf).conf = conf
+    if network_handles:
+        attach_fixed_networks(network_handles)
+
+
+def get_ensemble_blocks(run_numbers, ensemble_size, number_of_simulations):
+    """Returns the blocks of simulations which hold the given ones. The simulations of a batch are grouped into
+    ensembles of consecutive numbers starting from zero, so each simulation always shares its ensemble with the same
+    simulations and is reproducible when it is run again on its own block.
+
+    :param run_numbers: list, holding the numbers of the simulations to run.
+    :param ensemble_size: integer, holding the number of simulations of each ensemble.
+    :param number_of_simulations: integer, holding the number of simulations of the batch.
+    :return: list, holding the numbers of the simulations of each block.
+    """
+    block_numbers = sorted({run_number // ensemble_size for run_number in run_numbers})
+    return [list(range(block_number * ensemble_size, min((block_number + 1) * ensemble_size, number_of_simulations)))
+            for block_number in block_numbers]
+
 
+def get_simulations(run_numbers, number_of_processors, chunksize, conf, play_game=play_numbered_population_games,
+                    network_handles=None):
+    """Yields the simulations as they finish, running them in a pool of processes if required.
 
-def play_n_population_game():
+    :param run_numbers: iterable, holding the blocks of numbers of the simulations to run, or the tasks given to
+        play_game.
+    :param number_of_processors: integer, holding the number of processes of the pool, or zero to run them in this one.
+    :param chunksize: integer, holding the number of tasks sent at once to each worker.
+    :param conf: configuration of the simulations.
+    :param play_game: function, which plays one block of simulations and returns them along with their numbers and
+        the paths of the summaries of its instrumentation.
+    :param network_handles: dictionary, holding the handles of the fixed networks shared with the pool, or None.
+    :return: generator of tuples, holding the number of each simulation of a block and its distribution evolution,
+        and the paths of the summaries of the instrumentation of the block.
+    """
+    if number_of_processors:
+        with multiprocessing.Pool(processes=number_of_processors, initializer=initialize_worker,
+                                  initargs=(conf, network_handles)) as a_pool:
+            for simulation in a_pool.imap_unordered(play_game, run_numbers, chunksize):
+                yield simulation
+    else:
+        for run_number in run_numbers:
+            yield play_game(run_number)
+
+
+def play_n_population_game(resume=False, show_plot=True):
+    """Runs the batch of simulations, writing each of them as soon as it finishes. Only the simulations missing from
+    the result cache are run, and if checkpoint_interval is set, every finished simulation is checkpointed along with
+    the state of the running ones, so an interrupted batch can be resumed without redoing the finished work. If the
+    ensemble size is greater than
+    one, the simulations are advanced together in ensembles of that size, which are sent to the pool as one task each.
+
+    :param resume: bool, true if the batch continues from its checkpoint.
+    :param show_plot: bool, true if the mean distribution evolution must be shown once the batch finishes.
+    """
     start_time = time.time()
     workspace = Workspace()
     number_of_simulations = workspace.conf.get_number_of_simulations()
     number_of_processors = workspace.conf.get_number_of_processors()
-    distributions = []
+    sum_of_distributions = 0
+    progress = ProgressReporter(number_of_simulations, SIMULATIONS)
 
-    if number_of_processors:
-        a_pool = multiprocessing.Pool(processes=number_of_processors)
-        distributions = a_pool.map(play_population_game, range(number_of_simulations))
-        a_pool.close()
-        write_result_to_csv(workspace.conf.get_number_of_game_rounds(),
-                            distributions,
-                            number_of_simulations,
-                            workspace.conf.get_revision_protocol(),
-                            workspace.conf.get_update_strategies_mode(),
-                            workspace.conf.get_number_of_agents(),
-                            workspace.conf.get_number_of_channels(),
-                            workspace.conf.get_noise(),
-                            workspace.conf.get_use_population_network(),
-                            workspace.conf.get_probability_of_edge(),
-                            workspace.conf.get_random_network_algorithm(),
-                            workspace.conf.get_probability_of_rewiring(),
-                            workspace.conf.get_nearest_neighbors())
+    outputs_path = path.join(workspace.root, OUTPUTS)
+    result_cache = get_result_cache(outputs_path, workspace.conf)
+    checkpoint = get_checkpoint(outputs_path, workspace.conf, resume)
+    instrumentation = Instrumentation() if workspace.conf.get_instrumentation() else None
+    if instrumentation is not None:
+        clear_instrumentation_summaries(outputs_path, workspace.conf)
+    missing_run_numbers = []
 
-    else:
+    with get_result_sink(outputs_path, workspace.conf) as result_sink:
         for run_number in range(number_of_simulations):
-            distribution = play_population_game()
-            distributions.append(distribution)
-            if workspace.conf.get_write_results_to_csv():
-                write_partial_results_to_csv(run_number,
-                                             workspace.conf.get_number_of_game_rounds(),
-                                             distribution,
-                                             number_of_simulations,
-                                             workspace.conf.get_revision_protocol(),
-                                             workspace.conf.get_update_strategies_mode(),
-                                             workspace.conf.get_number_of_agents(),
-                                             workspace.conf.get_number_of_channels(),
-                                             workspace.conf.get_noise())
-
-    mean_distribution = np.array(distributions).mean(axis=0)
+            distribution = result_cache.get(result_cache.get_key(workspace.conf, run_number)) if result_cache else None
+            if distribution is None and checkpoint is not None:
+                distribution = checkpoint.load_trajectory(run_number)
+            if distribution is None:
+                missing_run_numbers.append(run_number)
+            else:
+                result_sink.write(run_number, distribution)
+                sum_of_distributions += distribution
+                progress.update()
+        missing_run_number_set = set(missing_run_numbers)
+        blocks = get_ensemble_blocks(missing_run_numbers, workspace.conf.get_ensemble_size(), number_of_simulations)
+        with share_fixed_networks([workspace.conf] if number_of_processors and blocks else []) as network_handles:
+            simulations = get_simulations(blocks, number_of_processors, workspace.conf.get_pool_chunksize(),
+                                          workspace.conf, partial(play_numbered_population_games,
+                                                                  checkpoint=checkpoint), network_handles)
+            for block_simulations, summary_paths in simulations:
+                for run_number, distribution in block_simulations:
+                    if run_number not in missing_run_number_set:
+                        continue
+                    io_start_time = instrumentation.start() if instrumentation is not None else None
+                    if result_cache:
+                        result_cache.put(result_cache.get_key(workspace.conf, run_number), distribution)
+                    result_sink.write(run_number, distribution)
+                    if instrumentation is not None:
+                        instrumentation.stop(IO, io_start_time)
+                    sum_of_distributions += np.array(distribution)
+                    progress.update()
+                if instrumentation is not None:
+                    for summary_path in summary_paths:
+                        instrumentation.merge_file(summary_path)
+    if checkpoint is not None:
+        checkpoint.clear()
+    if instrumentation is not None:
+        instrumentation.write_summary(get_instrumentation_path(outputs_path, workspace.conf))
+        instrumentation.log_summary(get_results_filename(workspace.conf))
+
+    mean_distribution = sum_of_distributions / number_of_simulations
     print("The average of distributions is:")
 
     print(mean_distribution)
-    plt.plot(mean_distribution)
     print("--- %s seconds ---" % (time.time() - start_time))
-    plt.show()
+    if show_plot:
+        plot_mean_distribution(mean_distribution)
@@ -0,0 +1,122 @@
+import itertools
+import json
+import numpy as np
+import time
+
+from contextlib import ExitStack
+from os import path
+
+from pyabm.common.base.shared_network import share_fixed_networks
+from pyabm.common.constants import *
+from pyabm.common.workspace import Workspace
+from pyabm.process.run_n_population_games import get_ensemble_blocks, get_simulations
+from pyabm.process.run_population_game import play_sweep_population_games
+from pyabm.common.utils.cache import get_result_cache
+from pyabm.common.utils.instrumentation import Instrumentation, clear_instrumentation_summaries
+from pyabm.common.utils.progress import ProgressReporter
+from pyabm.common.utils.results import get_result_sink, get_results_filename
+
+
+def get_sweep_points(parameter_sweep):
+    """Expands the definition of a parameter sweep into the list of its points: every combination of the values of
+    the grid followed by the explicit points.
+
+    :param parameter_sweep: dictionary, holding the grid, which maps each parameter to the list of its values, and/or
+        the list of points, each one mapping parameters to values.
+    :return: list, holding the overridden parameters of each point.
+    """
+    grid = parameter_sweep.get(GRID, {})
+    names = sorted(grid)
+    points = [dict(zip(names, values)) for values in itertools.product(*[grid[name] for name in names])] if grid else []
+    return points + list(parameter_sweep.get(POINTS, []))
+
+
+def get_point_key(point):
+    """Returns the hashable key of a point of the sweep: the tuple of pairs of parameter and value sorted by parameter,
+    where the list values are turned into tuples.
+
+    :param point: dictionary, holding the overridden parameters of the point.
+    :return: tuple, holding the key of the point.
+    """
+    def freeze(value):
+        return tuple(freeze(item) for item in value) if isinstance(value, list) else value
+    return tuple((name, freeze(point[name])) for name in sorted(point))
+
+
+def play_parameter_sweep():
+    """Runs the simulations of every point of the parameter sweep on one shared pool of processes, so the processors do
+    not idle between points. The simulations of each point are written to their own result files, which are listed
+    along with the parameters of each point in a JSON index in workspace/outputs. Only the simulations missing from
+    the result cache are run.
+
+    :return: dictionary, holding the mean distribution evolution of each point keyed by its parameter tuple.
+    """
+    start_time = time.time()
+    workspace = Workspace()
+    outputs_path = path.join(workspace.root, OUTPUTS)
+    points = get_sweep_points(workspace.conf.get_parameter_sweep())
+    confs = [workspace.conf.with_parameters(point) for point in points]
+    filenames = [get_results_filename(conf) + POINT_SUFFIX.format(point_number)
+                 for point_number, conf in enumerate(confs)]
+    tasks = [(point_number, run_number, conf) for point_number, conf in enumerate(confs)
+             for run_number in range(conf.get_number_of_simulations())]
+    result_caches = [get_result_cache(outputs_path, conf) for conf in confs]
+    sums_of_distributions = [0] * len(points)
+    progress = ProgressReporter(len(tasks), SIMULATIONS)
+    missing_run_numbers = [[] for _ in points]
+    instrumentation = Instrumentation() if workspace.conf.get_instrumentation() else None
+    if instrumentation is not None:
+        for point_number, conf in enumerate(confs):
+            clear_instrumentation_summaries(outputs_path, conf, point_number)
+
+    with ExitStack() as stack:
+        result_sinks = [stack.enter_context(get_result_sink(outputs_path, conf, filename))
+                        for conf, filename in zip(confs, filenames)]
+        for point_number, run_number, conf in tasks:
+            result_cache = result_caches[point_number]
+            distribution = result_cache.get(result_cache.get_key(conf, run_number, point_number)) \
+                if result_cache else None
+            if distribution is None:
+                missing_run_numbers[point_number].append(run_number)
+            else:
+                result_sinks[point_number].write(run_number, distribution)
+                sums_of_distributions[point_number] += distribution
+                progress.update()
+        missing_run_number_sets = [set(run_numbers) for run_numbers in missing_run_numbers]
+        missing_tasks = [(point_number, block, conf) for point_number, conf in enumerate(confs)
+                         for block in get_ensemble_blocks(missing_run_numbers[point_number], conf.get_ensemble_size(),
+                                                          conf.get_number_of_simulations())]
+        number_of_processors = workspace.conf.get_number_of_processors()
+        with share_fixed_networks(confs if number_of_processors and missing_tasks else []) as network_handles:
+            simulations = get_simulations(missing_tasks, number_of_processors, workspace.conf.get_pool_chunksize(),
+                                          workspace.conf, play_sweep_population_games, network_handles)
+            for block_simulations, summary_paths in simulations:
+                for point_number, run_number, distribution in block_simulations:
+                    if run_number not in missing_run_number_sets[point_number]:
+                        continue
+                    io_start_time = instrumentation.start() if instrumentation is not None else None
+                    result_cache = result_caches[point_number]
+                    if result_cache:
+                        result_cache.put(result_cache.get_key(confs[point_number], run_number, point_number),
+                                         distribution)
+                    result_sinks[point_number].write(run_number, distribution)
+                    if instrumentation is not None:
+                        instrumentation.stop(IO, io_start_time)
+                    sums_of_distributions[point_number] += np.array(distribution)
+                    progress.update()
+                if instrumentation is not None:
+                    for summary_path in summary_paths:
+                        instrumentation.merge_file(summary_path)
+
+    if instrumentation is not None:
+        sweep_name = get_results_filename(workspace.conf) + SWEEP_INDEX_SUFFIX
+        instrumentation.write_summary(path.join(outputs_path, INSTRUMENTATION, sweep_name))
+        instrumentation.log_summary(sweep_name)
+
+    index = [{PARAMETERS: point, FILENAME: filename} for point, filename in zip(points, filenames)]
+    with open(path.join(outputs_path, get_results_filename(workspace.conf) + SWEEP_INDEX_SUFFIX), W) as index_file:
+        json.dump(index, index_file, indent=2)
+
+    print("--- %s seconds ---" % (time.time() - start_time))
+    return {get_point_key(point): sum_of_distributions / conf.get_number_of_simulations()
+            for point, conf, sum_of_distributions in zip(points, confs, sums_of_distributions)}
@@ -1,10 +1,119 @@
+from os import path
+
+from pyabm.common.base.ensemble_game import EnsembleGame
 from pyabm.common.base.game import AgentGame
+from pyabm.common.constants import OUTPUTS, SINGLE_GAME_SUFFIX
+from pyabm.common.utils.checkpoint import get_checkpoint
+from pyabm.common.utils.instrumentation import get_instrumentation_path
+from pyabm.common.utils.rng import get_ensemble_rng, get_simulation_rng
+from pyabm.common.utils.snapshots import get_snapshot_writer
+from pyabm.common.workspace import Workspace
 
 
-def play_population_game(pool_parameter=None):
-    g = AgentGame()
+def play_population_game(pool_parameter=None, conf=None, point_number=None, checkpoint=None):
+    run_number = pool_parameter or 0
+    conf = conf if conf is not None else Workspace().conf
+    outputs_path = path.join(Workspace().root, OUTPUTS)
+    g = checkpoint.load_game(run_number) if checkpoint is not None else None
 
-    print("The initial distribution is: {}".format(g.agents.get_strategy_distribution()))
-    _, distribution_evolution = g.run_population_game()
+    if g is None:
+        g = AgentGame(get_simulation_rng(conf.get_seed(), run_number, point_number), conf, outputs_path)
+        print("The initial distribution is: {}".format(g.agents.get_strategy_distribution()))
+        snapshots = get_snapshot_writer(outputs_path, conf, run_number, point_number)
+        _, distribution_evolution = g.run_population_game(checkpoint, run_number, snapshots)
+    else:
+        print("Resuming from tick {} the distribution: {}".format(g.tick, g.agents.get_strategy_distribution()))
+        _, distribution_evolution = g.resume_population_game(checkpoint, run_number)
     print("The final distribution is: {}".format(g.agents.get_strategy_distribution()))
+    if g.instrumentation is not None:
+        g.instrumentation.write_summary(get_instrumentation_path(outputs_path, conf, run_number, point_number))
+    if checkpoint is not None:
+        checkpoint.save_trajectory(run_number, distribution_evolution)
     return distribution_evolution
+
+
+def play_single_population_game(resume=False):
+    """Plays one simulation checkpointing its state every checkpoint_interval ticks, so that it can be resumed if it
+    is interrupted.
+
+    :param resume: bool, true if the simulation continues from its last checkpoint.
+    :return: list, holding the share of agents following each strategy at each logged tick.
+    """
+    workspace = Workspace()
+    checkpoint = get_checkpoint(path.join(workspace.root, OUTPUTS), workspace.conf, resume, SINGLE_GAME_SUFFIX)
+    if checkpoint is None:
+        return play_population_game(conf=workspace.conf)
+    distribution_evolution = checkpoint.load_trajectory(0)
+    if distribution_evolution is None:
+        distribution_evolution = play_population_game(conf=workspace.conf, checkpoint=checkpoint)
+    checkpoint.clear()
+    return distribution_evolution
+
+
+def play_ensemble_population_game(run_numbers, conf=None, point_number=None, checkpoint=None):
+    """Plays the given simulations of a batch together as one ensemble. The initial state of each simulation is set up
+    from its own random stream, while the revisions of the whole ensemble draw from one stream.
+
+    :param run_numbers: list, holding the consecutive numbers of the simulations of the ensemble.
+    :param conf: configuration of the simulations. If it is not given, it is read from the workspace.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    :param checkpoint: Checkpoint instance of the batch, or None.
+    :return: list, holding the distribution evolution of each simulation.
+    """
+    conf = conf if conf is not None else Workspace().conf
+    g = EnsembleGame([get_simulation_rng(conf.get_seed(), run_number, point_number) for run_number in run_numbers],
+                     get_ensemble_rng(conf.get_seed(), run_numbers[0], point_number), conf)
+    distribution_evolutions = g.run_population_game()
+    print("The final mean distribution of the simulations {} to {} is: {}".format(
+        run_numbers[0], run_numbers[-1], g.agents.get_strategy_distributions().mean(axis=0)))
+    if g.instrumentation is not None:
+        g.instrumentation.write_summary(
+            get_instrumentation_path(path.join(Workspace().root, OUTPUTS), conf, run_numbers[0], point_number))
+    if checkpoint is not None:
+        for run_number, distribution_evolution in zip(run_numbers, distribution_evolutions):
+            checkpoint.save_trajectory(run_number, distribution_evolution)
+    return distribution_evolutions
+
+
+def play_numbered_population_games(run_numbers, conf=None, point_number=None, checkpoint=None):
+    """Plays the given block of simulations of a batch, together as one ensemble if the ensemble size is greater than
+    one and one after another otherwise, and returns them along with their numbers, since the blocks of a batch may
+    finish in any order.
+
+    :param run_numbers: list, holding the numbers of the simulations of the block.
+    :param conf: configuration of the simulations. If it is not given, it is read from the workspace.
+    :param point_number: integer, holding the number of the point of a parameter sweep, or None.
+    :param checkpoint: Checkpoint instance of the batch, or None.
+    :return:
+        - list, holding tuples of the number of each simulation and its distribution evolution.
+        - list, holding the paths of the JSON summaries of the instrumentation written by the block: one for the
+          whole ensemble or one for each simulation, or none if the instrumentation is disabled.
+    """
+    conf = conf if conf is not None else Workspace().conf
+    if conf.get_ensemble_size() > 1:
+        distribution_evolutions = play_ensemble_population_game(run_numbers, conf, point_number, checkpoint)
+        summary_run_numbers = run_numbers[:1]
+    else:
+        distribution_evolutions = [play_population_game(run_number, conf, point_number, checkpoint)
+                                   for run_number in run_numbers]
+        summary_run_numbers = run_numbers
+    summary_paths = [get_instrumentation_path(path.join(Workspace().root, OUTPUTS), conf, run_number, point_number)
+                     for run_number in summary_run_numbers] if conf.get_instrumentation() else []
+    return list(zip(run_numbers, distribution_evolutions)), summary_paths
+
+
+def play_sweep_population_games(task):
+    """Plays the given block of simulations of a point of a parameter sweep and returns them along with their numbers,
+    since the simulations of a sweep may finish in any order.
+
+    :param task: tuple, holding the number of the point, the numbers of the simulations of the block and the
+        configuration of the point.
+    :return:
+        - list, holding tuples of the number of the point, the number of each simulation and its distribution
+          evolution.
+        - list, holding the paths of the JSON summaries of the instrumentation written by the block.
+    """
+    point_number, run_numbers, conf = task
+    simulations, summary_paths = play_numbered_population_games(run_numbers, conf, point_number)
+    return [(point_number, run_number, distribution_evolution)
+            for run_number, distribution_evolution in simulations], summary_paths
@@ -1,13 +0,0 @@
-import seaborn as sns
-
-from pyabm.process.run_n_population_games import play_n_population_game
-
-sns.set(style="whitegrid")
-
-
-def main():
-    play_n_population_game()
-
-
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,17 @@
+from os import path
+
+import pytest
+
+from pyabm.common.conf import Conf
+
+PYABM_JSON_PATH = path.join(path.dirname(path.dirname(path.abspath(__file__))), "resources", "conf", "pyabm.json")
+
+
+@pytest.fixture
+def make_conf():
+    """Returns a function which builds the configuration of the repository with the given parameters overridden, so
+    the tests never read the workspace.
+    """
+    def make(**parameters):
+        return Conf(PYABM_JSON_PATH).with_parameters(parameters)
+    return make
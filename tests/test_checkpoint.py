@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from pyabm.common.base.game import AgentGame
+from pyabm.common.constants import AGENTS, ARRAY, COMPILED, PARALLEL
+from pyabm.common.utils.checkpoint import Checkpoint
+
+
+class Interruption(Exception):
+    """Raised to kill a game right after one of its checkpoints."""
+
+
+class InterruptingCheckpoint(Checkpoint):
+    """Checkpoint which interrupts the game after the given number of saves."""
+
+    def __init__(self, outputs_path, name, number_of_saves):
+        super(InterruptingCheckpoint, self).__init__(outputs_path, name)
+        self.number_of_saves = number_of_saves
+
+    def save_game(self, run_number, game):
+        super(InterruptingCheckpoint, self).save_game(run_number, game)
+        self.number_of_saves -= 1
+        if self.number_of_saves == 0:
+            raise Interruption()
+
+
+@pytest.mark.parametrize("simulation_engine", [AGENTS, ARRAY, COMPILED, PARALLEL])
+def test_resumed_game_matches_the_uninterrupted_one(make_conf, tmp_path, simulation_engine):
+    conf = make_conf(number_of_agents=200, initial_distribution_of_strategies=[180, 20, 0, 0, 0], noise=0.05,
+                     number_of_game_rounds=20, checkpoint_interval=3, use_network_structure=True,
+                     nearest_neighbors=4, probability_of_rewiring=0.2, simulation_engine=simulation_engine,
+                     number_of_processors=2)
+    _, uninterrupted = AgentGame(np.random.default_rng(5), conf).run_population_game()
+    checkpoint = InterruptingCheckpoint(str(tmp_path), "test", 2)
+    with pytest.raises(Interruption):
+        AgentGame(np.random.default_rng(5), conf).run_population_game(checkpoint, 0)
+    game = checkpoint.load_game(0)
+    assert game.tick == 6
+    _, resumed = game.resume_population_game(checkpoint, 0)
+    assert np.array_equal(np.array(resumed), np.array(uninterrupted))
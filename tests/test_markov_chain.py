@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+from pyabm.common.base.game import AgentGame
+from pyabm.common.base.markov_chain import BEPMarkovChain
+from pyabm.common.constants import ALL_IN_ONE_TICK, ASYNCHRONOUS_RANDOM_INDEPENDENT
+
+NUMBER_OF_SIMULATIONS = 3000
+
+
+@pytest.mark.parametrize("update_strategies_mode", [ASYNCHRONOUS_RANDOM_INDEPENDENT, ALL_IN_ONE_TICK])
+def test_transient_matches_the_simulations(make_conf, update_strategies_mode):
+    conf = make_conf(number_of_agents=4, number_of_channels=3, initial_distribution_of_strategies=[3, 1, 0],
+                     matrix_payoffs=[[1, 0, 0], [0, 2, 0], [0, 0, 3]], number_of_trials=1, noise=0.1,
+                     update_strategies_mode=update_strategies_mode, use_network_structure=False,
+                     simulation_engine="array", number_of_game_rounds=3)
+    chain = BEPMarkovChain(conf)
+    state_distributions = chain.get_transient_distributions(chain.get_initial_distribution(), 3, 1)
+    assert np.allclose(state_distributions.sum(axis=1), 1)
+    simulations = np.array([AgentGame(np.random.default_rng(seed), conf).run_population_game()[1]
+                            for seed in range(NUMBER_OF_SIMULATIONS)])
+    tolerance = 5 * simulations.std(axis=0) / np.sqrt(NUMBER_OF_SIMULATIONS) + 1e-9
+    assert np.all(np.abs(simulations.mean(axis=0) - chain.get_mean_distributions(state_distributions)) <= tolerance)
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from pyabm.common.base.network import get_population_network
+from pyabm.common.base.network_generators import get_network_edges, is_connected
+from pyabm.common.constants import BARABASI_ALBERT, ERDOS_RENYI, SMALL_WORLD
+
+N_OF_NODES = 5000
+NEAREST_NEIGHBORS = 4
+
+
+@pytest.mark.parametrize("network_algorithm", [BARABASI_ALBERT, SMALL_WORLD, ERDOS_RENYI])
+def test_native_generators_give_simple_graphs(network_algorithm):
+    sources, targets = get_network_edges(N_OF_NODES, network_algorithm, NEAREST_NEIGHBORS, 0.3, 0.005,
+                                         np.random.default_rng(2))
+    assert np.all(sources != targets)
+    keys = np.minimum(sources, targets) * N_OF_NODES + np.maximum(sources, targets)
+    assert len(np.unique(keys)) == len(keys)
+    assert sources.min() >= 0 and max(sources.max(), targets.max()) < N_OF_NODES
+    if network_algorithm == BARABASI_ALBERT:
+        assert len(keys) == N_OF_NODES - 1
+    elif network_algorithm == SMALL_WORLD:
+        assert len(keys) == N_OF_NODES * NEAREST_NEIGHBORS // 2
+        assert is_connected(N_OF_NODES, sources, targets)
+
+
+@pytest.mark.parametrize("network_algorithm", [BARABASI_ALBERT, SMALL_WORLD, ERDOS_RENYI])
+def test_coloring_is_proper(network_algorithm):
+    rng = np.random.default_rng(3)
+    network = get_population_network(N_OF_NODES, network_algorithm, NEAREST_NEIGHBORS, 0.3, 0.005, rng)
+    colors = network.get_coloring(rng)
+    sources, targets = network.get_edges()
+    assert np.all(colors[sources] != colors[targets])
+    assert np.array_equal(np.unique(colors), np.arange(colors.max() + 1))
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from pyabm.common.base.game import AgentGame
+from pyabm.common.base.revision import get_bep_revision_probabilities, get_bep_strategies
+from pyabm.common.constants import AGENTS, ARRAY
+
+PAYOFF_MATRIX = [[1, 0, 0, 2], [0, 2, 1, 0], [1, 1, 1, 1], [0, 0, 3, 0]]
+NUMBER_OF_SAMPLES = 20000
+
+
+def assert_frequencies(strategies, probabilities):
+    """Asserts that the strategies were drawn following the given probabilities, up to five standard deviations."""
+    frequencies = np.bincount(strategies, minlength=len(probabilities)) / len(strategies)
+    tolerance = 5 * np.sqrt(probabilities * (1 - probabilities) / len(strategies)) + 1e-9
+    assert np.all(np.abs(frequencies - probabilities) <= tolerance)
+
+
+@pytest.mark.parametrize("number_of_trials", [1, 3])
+def test_bep_revision_probabilities_match_monte_carlo(number_of_trials):
+    rng = np.random.default_rng(0)
+    payoff_matrix = np.array(PAYOFF_MATRIX, dtype=float)
+    distribution = np.array([0.4, 0.3, 0.2, 0.1])
+    noise = 0.1
+    opponents = rng.choice(4, p=distribution, size=(NUMBER_OF_SAMPLES, 4, number_of_trials))
+    strategies = get_bep_strategies(payoff_matrix, opponents, rng)
+    noisy = rng.random(NUMBER_OF_SAMPLES) < noise
+    strategies[noisy] = rng.integers(0, 4, size=np.count_nonzero(noisy))
+    assert_frequencies(strategies,
+                       get_bep_revision_probabilities(payoff_matrix, distribution, number_of_trials, noise))
+
+
+@pytest.mark.parametrize("simulation_engine", [AGENTS, ARRAY])
+def test_payoff_bound_pruning_keeps_the_protocol(make_conf, simulation_engine):
+    conf = make_conf(number_of_agents=1001, number_of_channels=4,
+                     initial_distribution_of_strategies=[401, 300, 200, 100], matrix_payoffs=PAYOFF_MATRIX,
+                     number_of_trials=2, noise=0.0, use_network_structure=False, simulation_engine=simulation_engine,
+                     payoff_bound_pruning=True)
+    game = AgentGame(np.random.default_rng(1), conf)
+    # The opponents of the agent 0 are drawn among the rest, whose strategies do not change along its revisions.
+    opponents = game.agents.get_strategies()[1:]
+    strategies = []
+    for sample in range(NUMBER_OF_SAMPLES):
+        game.agents.update_strategy(0, game)
+        strategies.append(game.agents.get_strategies()[0])
+    assert_frequencies(np.array(strategies), get_bep_revision_probabilities(
+        game.payoff_matrix, np.bincount(opponents, minlength=4) / len(opponents), 2, 0.0))